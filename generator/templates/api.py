@@ -71,6 +71,7 @@ class {{ name }}sAPI(object):
                     {{ qp['name'] }}{% if qp['optional'] %}=None{% endif %},
                    {% endfor -%}
             headers={},
+            fields=None,
              **request_parameters):
 
         """List {{ object_type }}s.
@@ -95,6 +96,9 @@ class {{ name }}sAPI(object):
             {{ qp['name'] }} ({{ qp['type']}}): {{ qp['description']}}
             {% endfor -%}
             headers(dict): Additional headers to be passed.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -112,7 +116,8 @@ class {{ name }}sAPI(object):
         {% endfor -%}
         {% for qp in query_parameters -%}
         check_type({{ qp['name'] }}, {{ qp['type'] }}{% if qp['optional'] %}, optional=True{% endif %})
-        {% endfor %}
+        {% endfor -%}
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -141,7 +146,9 @@ class {{ name }}sAPI(object):
         # Update headers
         for k, v in headers.items():
             self._session.headers[k] = v
-        items = self._session.get_items(request_url, params=params)
+        items = self._session.get_items(
+            request_url, params=params, fields=fields
+        )
 
         # Remove headers
         for k, v in headers.items():
@@ -36,6 +36,11 @@ from ._metadata import (
     __version__,
 )
 from .api import WebexAPI
+from .broadcast import Broadcast, BroadcastResult
+from .cache import EntityCache, SQLiteCache, TTLCache
+from .commands import CommandMatch, CommandRouter
+from .enrichment import EnrichedEvent, WebhookEnricher
+from .events_consumer import EventsConsumer
 from .exceptions import (
     AccessTokenError,
     ApiError,
@@ -46,6 +51,8 @@ from .exceptions import (
     webexpythonsdkException,
     webexpythonsdkWarning,
 )
+from .membership_index import MembershipIndex
+from .message_sync import MessageSync, SQLiteWatermarkStore
 from .models.dictionary import dict_data_factory
 from .models.immutable import (
     AccessToken,
@@ -74,7 +81,11 @@ from .models.immutable import (
     WebhookEvent,
 )
 from .models.simple import simple_data_factory, SimpleDataModel
-from .utils import WebexDateTime
+from .outbound import MessageCoalescer, OutboundQueue, SQLiteOutboundStore
+from .reconcile import MembershipReconciler, WebhookReconciler
+from .utils import BoundedSet, InternPool, TokenBucket, WebexDateTime
+from .websocket_events import WebSocket, WebSocketEventClient
+from .webhook_receiver import WebhookReceiver
 
 
 # Initialize Package Logging
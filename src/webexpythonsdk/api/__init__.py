@@ -30,7 +30,7 @@ from webexpythonsdk.environment import WEBEX_ACCESS_TOKEN
 from webexpythonsdk.exceptions import AccessTokenError
 from webexpythonsdk.models.immutable import immutable_data_factory
 from webexpythonsdk.restsession import RestSession
-from webexpythonsdk.utils import check_type
+from webexpythonsdk.utils import check_type, InternPool
 from .access_tokens import AccessTokensAPI
 from .admin_audit_events import AdminAuditEventsAPI
 from .attachment_actions import AttachmentActionsAPI
@@ -82,6 +82,8 @@ class WebexAPI(object):
         be_geo_id=None,
         caller=None,
         disable_ssl_verify=False,
+        intern_pool=None,
+        cache=None,
     ):
         """Create a new WebexAPI object.
 
@@ -135,6 +137,13 @@ class WebexAPI(object):
             disable_ssl_verify(bool): Optional boolean flag to disable ssl
                 verification. Defaults to False. If set to True, the requests
                 session won't verify ssl certs anymore.
+            intern_pool(InternPool): Optional pool used to deduplicate the
+                identifier strings (IDs, e-mail addresses, etc.) repeated
+                across the returned data objects.  Reduces the memory held by
+                large result sets.
+            cache(TTLCache, SQLiteCache): Optional cache for the responses to
+                single-object GET requests (like `people.get()`).  A
+                SQLiteCache may be shared by many processes on a host.
 
         Returns:
             WebexAPI: A new WebexAPI object.
@@ -157,6 +166,7 @@ class WebexAPI(object):
         check_type(be_geo_id, str, optional=True)
         check_type(caller, str, optional=True)
         check_type(disable_ssl_verify, bool, optional=True)
+        check_type(intern_pool, InternPool, optional=True)
 
         access_token = access_token or WEBEX_ACCESS_TOKEN
 
@@ -203,6 +213,8 @@ class WebexAPI(object):
             be_geo_id=be_geo_id,
             caller=caller,
             disable_ssl_verify=disable_ssl_verify,
+            intern_pool=intern_pool,
+            cache=cache,
         )
 
         # API wrappers
@@ -247,6 +259,11 @@ class WebexAPI(object):
         """The access token used for API calls to the Webex service."""
         return self._session.access_token
 
+    @property
+    def session(self):
+        """The RestSession used for API calls to the Webex service."""
+        return self._session
+
     @property
     def base_url(self):
         """The base URL prefixed to the individual API endpoint suffixes."""
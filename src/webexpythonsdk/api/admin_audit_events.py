@@ -65,6 +65,7 @@ class AdminAuditEventsAPI(object):
         actorId=None,
         max=100,
         offset=0,
+        fields=None,
         **request_parameters,
     ):
         """List Organizations.
@@ -89,6 +90,9 @@ class AdminAuditEventsAPI(object):
             max(int): Limit the maximum number of events in the response. The
                 maximum value is 200.
             offset(int): Offset from the first result that you want to fetch.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -106,6 +110,7 @@ class AdminAuditEventsAPI(object):
         check_type(actorId, str, optional=True)
         check_type(max, int)
         check_type(offset, int)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -121,7 +126,9 @@ class AdminAuditEventsAPI(object):
             params["from"] = params.pop("_from")
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield AdminAuditEvent objects created from the returned JSON objects
         for item in items:
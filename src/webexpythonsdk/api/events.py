@@ -21,17 +21,170 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
 from ..generator_containers import generator_container
 from ..restsession import RestSession
 from ..utils import (
+    BoundedSet,
     check_type,
     dict_from_items_with_values,
+    object_json_data,
+    WebexDateTime,
+    ZuluTimeZone,
 )
 
 
+logger = logging.getLogger(__name__)
+
+
 API_ENDPOINT = "events"
 OBJECT_TYPE = "event"
 
+DEFAULT_STREAM_OVERLAP = 60
+DEFAULT_STREAM_MIN_INTERVAL = 1
+DEFAULT_STREAM_MAX_INTERVAL = 60
+DEFAULT_STREAM_DEDUP_SIZE = 100000
+
+
+class EventPoller(object):
+    """The polling engine of `EventsAPI.stream()` and the EventsConsumer.
+
+    Each poll lists the events that occurred since the poller's watermark
+    (the creation time of the latest event accepted), less an overlap
+    window, so that events that become visible late are not missed.  The
+    events re-returned by the overlapping windows are dropped by ID, using
+    a bounded set of recently accepted event IDs; and the events that
+    occurred before the poller's `start` are dropped.
+
+    The polling interval adapts to the traffic: it is reset to
+    `min_interval` when a poll returns new events, and doubled (up to
+    `max_interval`) when it does not.
+
+    """
+
+    def __init__(
+        self,
+        events_api,
+        filters=None,
+        start=None,
+        watermark=None,
+        overlap=DEFAULT_STREAM_OVERLAP,
+        min_interval=DEFAULT_STREAM_MIN_INTERVAL,
+        max_interval=DEFAULT_STREAM_MAX_INTERVAL,
+        dedup_size=DEFAULT_STREAM_DEDUP_SIZE,
+    ):
+        """Init a new EventPoller.
+
+        Args:
+            events_api(EventsAPI): The EventsAPI used to list the events.
+            filters(dict): The `list()` parameters of each poll (resource,
+                type, actorId, etc.).
+            start(str): Only poll the events that occurred at or after this
+                date and time, in ISO8601 format (yyyy-MM-dd'T'HH:mm:ss.SSSZ).
+                Defaults to now; unless a `watermark` is provided.
+            watermark(str): The watermark to resume polling from (saved by
+                an earlier poller), in ISO8601 format.  The events within
+                the overlap window before it are polled again.
+            overlap(int, float): The overlap between consecutive polling
+                windows, in seconds.
+            min_interval(int, float): The minimum polling interval, in
+                seconds.
+            max_interval(int, float): The maximum polling interval, in
+                seconds.
+            dedup_size(int): The number of recently accepted event IDs
+                remembered to drop duplicates.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(filters, dict, optional=True)
+        check_type(start, str, optional=True)
+        check_type(watermark, str, optional=True)
+        check_type(overlap, (int, float))
+        check_type(min_interval, (int, float))
+        check_type(max_interval, (int, float))
+        check_type(dedup_size, int)
+
+        super(EventPoller, self).__init__()
+
+        if start is None and watermark is None:
+            start = str(WebexDateTime.now(ZuluTimeZone()))
+
+        self._events_api = events_api
+        self.filters = filters or {}
+        self.start = start
+        self.watermark = watermark or start
+        self.overlap = overlap
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.seen = BoundedSet(dedup_size)
+
+    def fetch(self, watermark=None):
+        """List the events of a polling window, oldest first.
+
+        Args:
+            watermark(str): The watermark the window starts from (less the
+                overlap).  Defaults to the poller's watermark.
+
+        Returns:
+            list: The Event objects of the window that occurred at or after
+            the poller's `start`; including any events already accepted.
+
+        Raises:
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        watermark = WebexDateTime.strptime(watermark or self.watermark)
+        window_start = watermark - timedelta(seconds=self.overlap)
+        events = list(
+            self._events_api.list(_from=str(window_start), **self.filters)
+        )
+        if self.start:
+            events = [
+                event
+                for event in events
+                if (object_json_data(event).get("created") or self.start)
+                >= self.start
+            ]
+        events.sort(key=lambda e: object_json_data(e).get("created") or "")
+        return events
+
+    def new_events(self, events):
+        """The events (list) that have not been accepted yet, in order."""
+        new_events, ids = [], set()
+        for event in events:
+            if event.id not in self.seen and event.id not in ids:
+                ids.add(event.id)
+                new_events.append(event)
+        return new_events
+
+    def accept(self, events):
+        """Accept (processed) events; advancing the watermark past them.
+
+        Args:
+            events(list): The events, oldest first.
+
+        """
+        for event in events:
+            self.seen.add(event.id)
+        if events:
+            created = object_json_data(events[-1]).get("created")
+            if created and created > self.watermark:
+                self.watermark = created
+
+    def adapt(self, new_events):
+        """Adapt the polling interval to the number of new events polled."""
+        if new_events:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+
 
 class EventsAPI(object):
     """Webex Events API.
@@ -68,6 +221,7 @@ class EventsAPI(object):
         _from=None,
         to=None,
         max=None,
+        fields=None,
         **request_parameters,
     ):
         """List events.
@@ -101,6 +255,9 @@ class EventsAPI(object):
                 date and time, in ISO8601 format (yyyy-MM-dd'T'HH:mm:ss.SSSZ).
             max(int): Limit the maximum number of items returned from the Webex
                 service per request.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -119,6 +276,7 @@ class EventsAPI(object):
         check_type(_from, str, optional=True)
         check_type(to, str, optional=True)
         check_type(max, int, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -134,7 +292,9 @@ class EventsAPI(object):
             params["from"] = params.pop("_from")
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield event objects created from the returned items JSON objects
         for item in items:
@@ -161,3 +321,108 @@ class EventsAPI(object):
 
         # Return a room object created from the response JSON data
         return self._object_factory(OBJECT_TYPE, json_data)
+
+    def stream(
+        self,
+        resource=None,
+        type=None,
+        actorId=None,
+        start=None,
+        overlap=DEFAULT_STREAM_OVERLAP,
+        min_interval=DEFAULT_STREAM_MIN_INTERVAL,
+        max_interval=DEFAULT_STREAM_MAX_INTERVAL,
+        dedup_size=DEFAULT_STREAM_DEDUP_SIZE,
+    ):
+        """Stream events, as they occur, by polling the Events API.
+
+        An infinite generator yielding new events, oldest first.  Each poll
+        lists the events that occurred since the latest event yielded, less
+        an `overlap` window (so that events that become visible late are not
+        missed); the events re-returned by overlapping windows are dropped,
+        using a bounded set of recently yielded event IDs.
+
+        The polling interval adapts to the traffic: it is reset to
+        `min_interval` when a poll returns new events, and doubled (up to
+        `max_interval`) when it does not; so polling a quiet organization
+        costs little, while bursts are delivered promptly.  The next poll is
+        made in the background while the caller processes the events of the
+        current one.  Errors raised by a poll are logged, and the poll
+        retried after the (doubled) interval.
+
+        Args:
+            resource(str): Limit results to a specific resource type.
+            type(str): Limit results to a specific event type.
+            actorId(str): Limit results to events performed by this person,
+                by ID.
+            start(str): Stream the events that occurred after this date and
+                time, in ISO8601 format (yyyy-MM-dd'T'HH:mm:ss.SSSZ).
+                Defaults to now.
+            overlap(int, float): The overlap between consecutive polling
+                windows, in seconds.
+            min_interval(int, float): The minimum polling interval, in
+                seconds.
+            max_interval(int, float): The maximum polling interval, in
+                seconds.
+            dedup_size(int): The number of recently yielded event IDs
+                remembered to drop duplicates.
+
+        Returns:
+            generator: A generator yielding the new events.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(resource, str, optional=True)
+        check_type(type, str, optional=True)
+        check_type(actorId, str, optional=True)
+        check_type(start, str, optional=True)
+        check_type(overlap, (int, float))
+        check_type(min_interval, (int, float))
+        check_type(max_interval, (int, float))
+        check_type(dedup_size, int)
+
+        return self._stream(
+            EventPoller(
+                self,
+                dict_from_items_with_values(
+                    resource=resource, type=type, actorId=actorId
+                ),
+                start=start,
+                overlap=overlap,
+                min_interval=min_interval,
+                max_interval=max_interval,
+                dedup_size=dedup_size,
+            )
+        )
+
+    def _stream(self, poller):
+        stopped = threading.Event()
+
+        def poll(watermark, delay):
+            if stopped.wait(delay):
+                return []
+            return poller.fetch(watermark)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(poll, poller.watermark, 0)
+            while True:
+                try:
+                    events = future.result()
+                except Exception:
+                    logger.exception("Error polling events; will retry.")
+                    events = []
+
+                new_events = poller.new_events(events)
+                poller.accept(new_events)
+                poller.adapt(new_events)
+
+                # Poll again while the caller processes these events
+                future = executor.submit(
+                    poll, poller.watermark, poller.interval
+                )
+                yield from new_events
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
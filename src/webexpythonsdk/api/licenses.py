@@ -60,7 +60,7 @@ class LicensesAPI(object):
         self._object_factory = object_factory
 
     @generator_container
-    def list(self, orgId=None, **request_parameters):
+    def list(self, orgId=None, fields=None, **request_parameters):
         """List all licenses for a given organization.
 
         If no orgId is specified, the default is the organization of the
@@ -68,6 +68,9 @@ class LicensesAPI(object):
 
         Args:
             orgId(str): Specify the organization, by ID.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -81,6 +84,7 @@ class LicensesAPI(object):
 
         """
         check_type(orgId, str, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -88,7 +92,9 @@ class LicensesAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield license objects created from the returned JSON objects
         for item in items:
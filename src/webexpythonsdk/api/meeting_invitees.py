@@ -21,10 +21,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ..config import DEFAULT_MAX_WORKERS
+from ..exceptions import ApiError
 from ..generator_containers import generator_container
 from ..restsession import RestSession
 from ..utils import (
     check_type,
+    chunked,
     dict_from_items_with_values,
 )
 
@@ -32,6 +38,23 @@ from ..utils import (
 API_ENDPOINT = "meetingInvitees"
 OBJECT_TYPE = "meetingInvitee"
 
+# The maximum number of invitees accepted by a bulk insert request
+MAX_BULK_INVITEES = 100
+
+
+BulkInviteeResult = namedtuple(
+    "BulkInviteeResult", ["meetingId", "item", "invitee", "error"]
+)
+BulkInviteeResult.__doc__ = """The result of inserting an invitee in bulk.
+
+Attributes:
+    meetingId(str): The ID of the meeting.
+    item(dict): The invitee, as provided.
+    invitee(MeetingInvitee): The created invitee (None if it failed).
+    error(ApiError): The error that prevented the invitee from being
+        inserted (None if it succeeded).
+"""
+
 
 class MeetingInviteesAPI(object):
     """Webex MeetingInvitees API.
@@ -67,6 +90,7 @@ class MeetingInviteesAPI(object):
         hostEmail=None,
         panelist=None,
         headers=None,
+        fields=None,
         **request_parameters,
     ):
         """List meetingInvitees.
@@ -92,6 +116,9 @@ class MeetingInviteesAPI(object):
             panelist (bool): Filter invitees or attendees based on their
                 panelist status.
             headers(dict): Additional headers to be passed.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -109,6 +136,7 @@ class MeetingInviteesAPI(object):
         check_type(hostEmail, str, optional=True)
         check_type(panelist, bool, optional=True)
         check_type(headers, dict, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         headers = headers or {}
 
@@ -125,7 +153,9 @@ class MeetingInviteesAPI(object):
         # Update headers
         for k, v in headers.items():
             self._session.headers[k] = v
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Remove headers
         for k in headers.keys():
@@ -296,45 +326,161 @@ class MeetingInviteesAPI(object):
         # Return a membership object created from the response JSON data
         return self._object_factory(OBJECT_TYPE, json_data)
 
+    def _bulk_insert_chunk(
+        self, meetingId, hostEmail, items, request_parameters
+    ):
+        """Insert a chunk of invitees; returning their BulkInviteeResults."""
+        post_data = dict_from_items_with_values(
+            request_parameters,
+            meetingId=meetingId,
+            items=items,
+            hostEmail=hostEmail,
+        )
+
+        try:
+            json_data = self._session.put(
+                API_ENDPOINT + "/bulkInsert", json=post_data
+            )
+        except ApiError as e:
+            return [BulkInviteeResult(meetingId, i, None, e) for i in items]
+
+        invitees = [
+            self._object_factory(OBJECT_TYPE, itm)
+            for itm in json_data.get("items", [])
+        ]
+        if len(invitees) == len(items):
+            created = invitees
+        else:
+            # Match the created invitees to the items by email address
+            by_email = {(i.email or "").lower(): i for i in invitees}
+            created = [
+                by_email.get((item.get("email") or "").lower())
+                for item in items
+            ]
+        return [
+            BulkInviteeResult(meetingId, item, invitee, None)
+            for item, invitee in zip(items, created)
+        ]
+
+    def bulk_insert(
+        self,
+        items_by_meeting,
+        hostEmail=None,
+        chunk_size=MAX_BULK_INVITEES,
+        max_workers=DEFAULT_MAX_WORKERS,
+        **request_parameters,
+    ):
+        """Insert invitees into many meetings, in concurrent chunks.
+
+        The invitees of each meeting are read incrementally and sent in
+        chunks of (up to) `chunk_size` invitees, with at most `max_workers`
+        requests in flight; so the invitee lists may be generators, and very
+        large lists do not have to be built in memory first.
+
+        Args:
+            items_by_meeting(dict): The invitees (iterable) to be inserted
+                into each meeting, by meeting ID.  Each invitee is a dict
+                with email as the required key and displayName, coHost,
+                sendEmail and panelist as optional properties.
+            hostEmail(str): Email of the meetings' host.
+            chunk_size(int): The maximum number of invitees per request.
+            max_workers(int): The maximum number of concurrent requests.
+            **request_parameters: Additional request parameters (provides
+                support for parameters that may be added in the future).
+
+        Returns:
+            list: A BulkInviteeResult for each invitee, in order.  The
+            invitees of a chunk that was rejected by the Webex cloud carry
+            the error.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `chunk_size` is not between 1 and 100.
+
+        """
+        check_type(items_by_meeting, dict)
+        check_type(hostEmail, str, optional=True)
+        check_type(chunk_size, int)
+        check_type(max_workers, int)
+
+        if not 0 < chunk_size <= MAX_BULK_INVITEES:
+            raise ValueError(
+                "`chunk_size` must be between 1 and {}.".format(
+                    MAX_BULK_INVITEES
+                )
+            )
+
+        chunks = (
+            (meetingId, chunk)
+            for meetingId, items in items_by_meeting.items()
+            for chunk in chunked(items, chunk_size)
+        )
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = set()
+            for meetingId, chunk in chunks:
+                # Don't read further ahead than the requests in flight
+                if len(in_flight) >= max_workers:
+                    _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = executor.submit(
+                    self._bulk_insert_chunk,
+                    meetingId,
+                    hostEmail,
+                    chunk,
+                    request_parameters,
+                )
+                futures.append(future)
+                in_flight.add(future)
+
+        return [result for f in futures for result in f.result()]
+
     def bulk(
-        self, meetingId, hostEmail=None, items=None, **request_parameters
+        self,
+        meetingId,
+        hostEmail=None,
+        items=None,
+        chunk_size=MAX_BULK_INVITEES,
+        max_workers=DEFAULT_MAX_WORKERS,
+        **request_parameters,
     ):
         """Bulk insert meeting invitees
 
+        The insertion is made when this method is called.  Large invitee
+        lists are split in chunks of (up to) `chunk_size` invitees, which
+        are sent concurrently; see `bulk_insert()`.
+
         Args:
           meetingId(str): Id of the meeting the invitees should be added
             to.
           hostEmail(str): Email of the meeting host.
-          items(list): List of invitees. Each invitee is a dict with email as
-            the required key and displayName, coHost, sendEmail and panelist as
-            optional properties.
+          items(iterable): List (or other iterable) of invitees. Each invitee
+            is a dict with email as the required key and displayName,
+            coHost, sendEmail and panelist as optional properties.
+          chunk_size(int): The maximum number of invitees per request.
+          max_workers(int): The maximum number of concurrent requests.
           **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
         Returns:
-          GeneratorContainer: A GeneratorContainer which, when iterated,
-            yields the meetingInvitees returned by the Webex query.
+          list: The created meetingInvitees.
 
         Raises:
           TypeError: If the parameter types are incorrect.
           ApiError: If the Webex cloud returns an error.
         """
         check_type(meetingId, str)
-        check_type(hostEmail, str, optional=True)
-        check_type(items, list, optional=True)
 
-        post_data = dict_from_items_with_values(
-            request_parameters,
-            meetingId=meetingId,
-            items=items,
+        results = self.bulk_insert(
+            {meetingId: items or []},
             hostEmail=hostEmail,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            **request_parameters,
         )
 
-        # API request
-        json_data = self._session.put(
-            API_ENDPOINT + "/bulkInsert", json=post_data
-        )
+        for result in results:
+            if result.error is not None:
+                raise result.error
 
-        # Return an object created from the response JSON data
-        for itm in json_data["items"]:
-            yield self._object_factory(OBJECT_TYPE, itm)
+        return [r.invitee for r in results if r.invitee is not None]
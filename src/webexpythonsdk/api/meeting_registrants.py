@@ -21,17 +21,48 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import csv
+import json
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ..config import DEFAULT_MAX_WORKERS
+from ..exceptions import ApiError
 from ..generator_containers import generator_container
 from ..restsession import RestSession
 from ..utils import (
     check_type,
+    chunked,
     dict_from_items_with_values,
+    TokenBucket,
 )
 
 
 API_ENDPOINT = "meetings/{meetingId}/registrants"
 OBJECT_TYPE = "meetingRegistrant"
 
+# The maximum number of registrants accepted by a batch register request
+MAX_BULK_REGISTRANTS = 100
+
+# Response codes indicating the batch register endpoint is not available
+_BATCH_UNAVAILABLE_RESPONSE_CODES = (404, 405)
+
+
+RegistrantImportResult = namedtuple(
+    "RegistrantImportResult", ["row", "email", "registrantId", "error"]
+)
+RegistrantImportResult.__doc__ = """The result of importing a registrant.
+
+Attributes:
+    row(int): The (zero-based) index of the input record.
+    email(str): The registrant's email.
+    registrantId(str): The ID of the registrant (None if it failed).
+    error(str): The error that prevented the registration (None if it
+        succeeded).
+"""
+
 
 class MeetingRegistrantsAPI(object):
     """Webex MeetingRegistrants API.
@@ -70,6 +101,7 @@ class MeetingRegistrantsAPI(object):
         registrationTimeFrom=None,
         registrationTimeTo=None,
         headers=None,
+        fields=None,
         **request_parameters,
     ):
         """List meetingRegistrants.
@@ -102,6 +134,9 @@ class MeetingRegistrantsAPI(object):
                 meeting before the specified date and time (exclusive) in any
                 ISO 8601 compliant format.
             headers(dict): Additional headers to be passed.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -122,6 +157,7 @@ class MeetingRegistrantsAPI(object):
         check_type(registrationTimeFrom, str, optional=True)
         check_type(registrationTimeTo, str, optional=True)
         check_type(headers, dict, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         headers = headers or {}
 
@@ -143,7 +179,9 @@ class MeetingRegistrantsAPI(object):
         # Update headers
         for k, v in headers.items():
             self._session.headers[k] = v
-        items = self._session.get_items(request_url, params=params)
+        items = self._session.get_items(
+            request_url, params=params, fields=fields
+        )
 
         # Remove headers
         for k in headers.keys():
@@ -294,3 +332,196 @@ class MeetingRegistrantsAPI(object):
 
         # API request
         self._session.delete(request_url + "/" + meetingRegistrantId)
+
+    def _register_chunk(self, meetingId, rows, state):
+        """Register a chunk of (row, record) pairs."""
+        request_url = API_ENDPOINT.format(meetingId=meetingId)
+
+        if state["batch"]:
+            if state["rate_limiter"] is not None:
+                state["rate_limiter"].acquire()
+            try:
+                json_data = self._session.post(
+                    request_url + "/bulkInsert",
+                    json={"items": [record for _, record in rows]},
+                )
+            except ApiError as e:
+                if e.status_code not in _BATCH_UNAVAILABLE_RESPONSE_CODES:
+                    return [
+                        RegistrantImportResult(
+                            row, record.get("email"), None, str(e)
+                        )
+                        for row, record in rows
+                    ]
+                # Fall back to registering the registrants one at a time
+                state["batch"] = False
+            else:
+                registrants = json_data.get("items", [])
+                if len(registrants) != len(rows):
+                    by_email = {
+                        (r.get("email") or "").lower(): r for r in registrants
+                    }
+                    registrants = [
+                        by_email.get((record.get("email") or "").lower(), {})
+                        for _, record in rows
+                    ]
+                return [
+                    RegistrantImportResult(
+                        row,
+                        record.get("email"),
+                        registrant.get("id"),
+                        None if registrant.get("id") else "Not registered",
+                    )
+                    for (row, record), registrant in zip(rows, registrants)
+                ]
+
+        results = []
+        for row, record in rows:
+            if state["rate_limiter"] is not None:
+                state["rate_limiter"].acquire()
+            try:
+                json_data = self._session.post(request_url, json=record)
+            except ApiError as e:
+                results.append(
+                    RegistrantImportResult(
+                        row, record.get("email"), None, str(e)
+                    )
+                )
+            else:
+                results.append(
+                    RegistrantImportResult(
+                        row, record.get("email"), json_data.get("id"), None
+                    )
+                )
+        return results
+
+    def bulk_import(
+        self,
+        meetingId,
+        records,
+        journal_path=None,
+        results_path=None,
+        batch=True,
+        chunk_size=MAX_BULK_REGISTRANTS,
+        rate=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Register many registrants for a meeting.
+
+        The records are read incrementally (for example, from a
+        `csv.DictReader`) and registered in chunks, using the batch register
+        endpoint, with at most `max_workers` requests in flight.  If the
+        batch endpoint is not available, or `batch` is False, the
+        registrants are registered with concurrent single-registrant
+        requests.
+
+        When a journal path is provided, the outcome of each record is
+        journaled to it; running the import again with the same records and
+        journal resumes it, skipping the records that were registered.
+
+        Args:
+            meetingId(str): Unique identifier for the meeting.
+            records(iterable): The registrants; dictionaries with the
+                `create()` arguments (firstName, lastName, email, etc.) as
+                keys.  Keys with empty values are ignored.
+            journal_path(str): The path of the progress journal.
+            results_path(str): The path of a CSV file to be written with the
+                row, email, registrantId and error of each record.
+            batch(bool): Use the batch register endpoint.
+            chunk_size(int): The maximum number of registrants per batch
+                request.
+            rate(int, float): The maximum number of requests per second.
+            max_workers(int): The maximum number of concurrent requests.
+
+        Returns:
+            list: A RegistrantImportResult for each record, by row.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `chunk_size` is not between 1 and 100.
+
+        """
+        check_type(meetingId, str)
+        check_type(journal_path, str, optional=True)
+        check_type(results_path, str, optional=True)
+        check_type(batch, bool)
+        check_type(chunk_size, int)
+        check_type(rate, (int, float), optional=True)
+        check_type(max_workers, int)
+
+        if not 0 < chunk_size <= MAX_BULK_REGISTRANTS:
+            raise ValueError(
+                "`chunk_size` must be between 1 and {}.".format(
+                    MAX_BULK_REGISTRANTS
+                )
+            )
+
+        # Resume from the journal
+        completed = {}
+        if journal_path and os.path.exists(journal_path):
+            with open(journal_path) as journal_file:
+                for line in journal_file:
+                    try:
+                        result = RegistrantImportResult(**json.loads(line))
+                    except (TypeError, ValueError):
+                        # A partially written last line
+                        continue
+                    if result.registrantId:
+                        completed[result.row] = result
+
+        state = {
+            "batch": batch,
+            "rate_limiter": TokenBucket(rate) if rate else None,
+        }
+        journal_lock = threading.Lock()
+        journal = None
+        if journal_path:
+            journal = open(journal_path, "a")
+            # Terminate any partially written last line
+            journal.write("\n")
+
+        def register(rows):
+            results = self._register_chunk(meetingId, rows, state)
+            if journal is not None:
+                with journal_lock:
+                    for result in results:
+                        journal.write(json.dumps(result._asdict()) + "\n")
+                    journal.flush()
+                    os.fsync(journal.fileno())
+            return results
+
+        pending = (
+            (row, {k: v for k, v in record.items() if v not in (None, "")})
+            for row, record in enumerate(records)
+            if row not in completed
+        )
+
+        results = list(completed.values())
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = []
+                in_flight = set()
+                for rows in chunked(pending, chunk_size):
+                    # Don't read further ahead than the requests in flight
+                    if len(in_flight) >= max_workers:
+                        _, in_flight = wait(
+                            in_flight, return_when=FIRST_COMPLETED
+                        )
+                    future = executor.submit(register, rows)
+                    futures.append(future)
+                    in_flight.add(future)
+            for future in futures:
+                results.extend(future.result())
+        finally:
+            if journal is not None:
+                journal.close()
+
+        results.sort(key=lambda result: result.row)
+
+        if results_path:
+            with open(results_path, "w", newline="") as results_file:
+                writer = csv.writer(results_file)
+                writer.writerow(RegistrantImportResult._fields)
+                writer.writerows(results)
+
+        return results
@@ -69,6 +69,7 @@ class MeetingTemplatesAPI(object):
         hostEmail=None,
         siteUrl=None,
         headers=None,
+        fields=None,
         **request_parameters,
     ):
         """List meetingTemplates.
@@ -97,6 +98,9 @@ class MeetingTemplatesAPI(object):
                 admin-level scope).
             siteUrl (bool): URL of the Webex site from which we are listing.
             headers(dict): Additional headers to be passed.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -116,6 +120,7 @@ class MeetingTemplatesAPI(object):
         check_type(hostEmail, bool, optional=True)
         check_type(siteUrl, bool, optional=True)
         check_type(headers, dict, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         headers = headers or {}
 
@@ -134,7 +139,9 @@ class MeetingTemplatesAPI(object):
         # Update headers
         for k, v in headers.items():
             self._session.headers[k] = v
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Remove headers
         for k in headers.keys():
@@ -77,6 +77,7 @@ class MeetingsAPI(object):
         siteUrl=None,
         integrationTag=None,
         headers=None,
+        fields=None,
         **request_parameters,
     ):
         """List meetings.
@@ -114,6 +115,9 @@ class MeetingsAPI(object):
             siteUrl (str): URL of the webex site.
             integrationTag (str): External tag set by integrations.
             headers(dict): Additional headers to be passed.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -141,6 +145,7 @@ class MeetingsAPI(object):
         check_type(siteUrl, str, optional=True)
         check_type(integrationTag, str, optional=True)
         check_type(headers, dict, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         headers = headers if headers is not None else {}
 
@@ -172,7 +177,9 @@ class MeetingsAPI(object):
         # Update headers
         for k, v in headers.items():
             self._session.headers[k] = v
-        items = self._session.get_items(request_url, params=params)
+        items = self._session.get_items(
+            request_url, params=params, fields=fields
+        )
 
         # Remove headers
         for k in headers.keys():
@@ -66,6 +66,7 @@ class MembershipsAPI(object):
         personId=None,
         personEmail=None,
         max=None,
+        fields=None,
         **request_parameters,
     ):
         """List room memberships.
@@ -96,6 +97,9 @@ class MembershipsAPI(object):
                 email address.
             max(int): Limit the maximum number of items returned from the Webex
                 service per request.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -112,6 +116,7 @@ class MembershipsAPI(object):
         check_type(personId, str, optional=True)
         check_type(personEmail, str, optional=True)
         check_type(max, int, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -122,7 +127,9 @@ class MembershipsAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield membership objects created from the returned items JSON objects
         for item in items:
@@ -21,17 +21,26 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from requests_toolbelt import MultipartEncoder
+import io
+import os
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
 
 from webexpythonsdk.models.cards import AdaptiveCard
+from ..config import DEFAULT_MAX_WORKERS
 from ..generator_containers import generator_container
 from ..restsession import RestSession
 from ..utils import (
+    BufferReader,
     check_type,
     dict_from_items_with_values,
     is_local_file,
     is_web_url,
     make_attachment,
+    open_file_data,
     open_local_file,
 )
 
@@ -40,6 +49,91 @@ API_ENDPOINT = "messages"
 OBJECT_TYPE = "message"
 
 
+DownloadResult = namedtuple("DownloadResult", ["url", "path", "error"])
+DownloadResult.__doc__ = """The result of downloading a message file.
+
+Attributes:
+    url(str): The URL of the file.
+    path(str): The path of the downloaded file (None if it failed).
+    error(Exception): The error that prevented the file from being
+        downloaded (None if it succeeded).
+"""
+
+CreateResult = namedtuple("CreateResult", ["params", "message", "error"])
+CreateResult.__doc__ = """The result of posting one of many messages.
+
+Attributes:
+    params(dict): The `create()` arguments of the message.
+    message(Message): The created message (None if it failed).
+    error(Exception): The error that prevented the message from being
+        posted (None if it succeeded).
+"""
+
+
+class _MultipartBody(object):
+    """A multipart/form-data message body, that can be sent again.
+
+    Rewinding the body (`seek(0)`) rewinds its file and encodes the body
+    again, with the same boundary; so that the RestSession can send it again
+    after a rate limit.
+
+    """
+
+    def __init__(self, fields, progress=None):
+        super(_MultipartBody, self).__init__()
+        self._fields = fields
+        self._progress = progress
+        self._boundary = uuid.uuid4().hex
+        file_object = fields["files"].file_object
+        try:
+            self._file_position = file_object.tell()
+        except (AttributeError, OSError):
+            # Not seekable (a pipe, for example); it can only be sent once
+            self._file_position = None
+        self._encode()
+
+    def _encode(self):
+        encoder = MultipartEncoder(self._fields, boundary=self._boundary)
+        callback = None
+        if self._progress is not None:
+            progress = self._progress
+
+            def callback(monitor):
+                progress(monitor.bytes_read, monitor.len)
+
+        self._monitor = MultipartEncoderMonitor(encoder, callback)
+
+    @property
+    def content_type(self):
+        """The Content-Type of the body (str)."""
+        return self._monitor.content_type
+
+    @property
+    def len(self):
+        """The length of the body, in bytes (int)."""
+        return self._monitor.len
+
+    def read(self, size=-1):
+        """Read (at most) `size` bytes of the body."""
+        return self._monitor.read(size)
+
+    def tell(self):
+        """The number of bytes of the body read."""
+        return self._monitor.bytes_read
+
+    def seekable(self):
+        """Whether the body can be rewound (and sent again)."""
+        return self._file_position is not None
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Rewind the body; only `seek(0)` is supported."""
+        if not self.seekable() or (offset, whence) != (0, io.SEEK_SET):
+            raise io.UnsupportedOperation("The body can only be rewound.")
+        self._fields["files"].file_object.seek(self._file_position)
+        self._encode()
+        return 0
+
+
 class MessagesAPI(object):
     """Webex Messages API.
 
@@ -73,6 +167,7 @@ class MessagesAPI(object):
         before=None,
         beforeMessage=None,
         max=50,
+        fields=None,
         **request_parameters,
     ):
         """Lists messages in a room.
@@ -102,6 +197,9 @@ class MessagesAPI(object):
                 by ID.
             max(int): Limit the maximum number of items returned from the Webex
                 service per request.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -120,6 +218,7 @@ class MessagesAPI(object):
         check_type(before, str, optional=True)
         check_type(beforeMessage, str, optional=True)
         check_type(max, int, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -132,7 +231,9 @@ class MessagesAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield message objects created from the returned items JSON objects
         for item in items:
@@ -144,6 +245,7 @@ class MessagesAPI(object):
         personId=None,
         personEmail=None,
         parentId=None,
+        fields=None,
         **request_parameters,
     ):
         """List all messages in a 1:1 (direct) room.
@@ -168,6 +270,9 @@ class MessagesAPI(object):
             personEmail(str): List messages in a 1:1 room, by person
                 email.
             parentId(str): List messages with a parent, by ID.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -183,6 +288,7 @@ class MessagesAPI(object):
         check_type(personId, str, optional=True)
         check_type(personEmail, str, optional=True)
         check_type(parentId, str, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -195,6 +301,7 @@ class MessagesAPI(object):
         items = self._session.get_items(
             API_ENDPOINT + "/direct",
             params=params,
+            fields=fields,
         )
 
         # Yield message objects created from the returned items JSON objects
@@ -211,6 +318,7 @@ class MessagesAPI(object):
         markdown=None,
         files=None,
         attachments=None,
+        progress=None,
         **request_parameters,
     ):
         """Post a message to a room.
@@ -219,6 +327,12 @@ class MessagesAPI(object):
         for future expansion, but currently only one file may be included with
         the message.
 
+        Besides a public URL or the path of a local file, the file may be
+        provided as data in memory (bytes, bytearray, memoryview or mmap) or
+        as a readable binary file-like object; optionally in a
+        (file name, data) or (file name, data, content type) tuple.  The data
+        is streamed to Webex without being copied.
+
         Args:
             roomId(str): The room ID.
             toPersonId(str): The ID of the recipient when sending a
@@ -229,12 +343,15 @@ class MessagesAPI(object):
                 specified this parameter may be optionally used to provide
                 alternate text for UI clients that do not support rich text.
             markdown(str): The message, in markdown format.
-            files(list): A list of public URL(s) or local path(s) to files to
-                be posted into the room. Only one file is allowed per message.
+            files(list): A list of public URL(s), local path(s) or data (see
+                above) of files to be posted into the room. Only one file is
+                allowed per message.
             attachments(list): Content attachments to attach to the message.
                 See the Cards Guide for more information.
             parentId(str): The parent message to reply to. This will
                 start or reply to a thread.
+            progress(callable): Called with the number of bytes sent and the
+                total number of bytes, as a file is uploaded.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -246,7 +363,8 @@ class MessagesAPI(object):
             ApiError: If the Webex cloud returns an error.
             ValueError: If the files parameter is a list of length > 1, or if
                 the string in the list (the only element in the list) does not
-                contain a valid URL or path to a local file.
+                contain a valid URL or path to a local file, or if the file
+                data is not a supported type.
 
         """
         check_type(roomId, str, optional=True)
@@ -268,7 +386,6 @@ class MessagesAPI(object):
                     "only one file may be included with the "
                     "message."
                 )
-            check_type(files[0], str)
         else:
             files = None
 
@@ -293,27 +410,35 @@ class MessagesAPI(object):
         )
 
         # API request
-        if not files or is_web_url(files[0]):
+        if not files or (isinstance(files[0], str) and is_web_url(files[0])):
             # Standard JSON post
             json_data = self._session.post(API_ENDPOINT, json=post_data)
 
-        elif is_local_file(files[0]):
+        else:
+            if isinstance(files[0], str):
+                if not is_local_file(files[0]):
+                    raise ValueError(
+                        "The `files` parameter does not contain a vaild "
+                        "URL or path to a local file."
+                    )
+                post_data["files"] = open_local_file(files[0])
+            else:
+                post_data["files"] = open_file_data(files[0])
+
             # Multipart MIME post
             try:
-                post_data["files"] = open_local_file(files[0])
-                multipart_data = MultipartEncoder(post_data)
+                multipart_data = _MultipartBody(post_data, progress)
                 headers = {"Content-type": multipart_data.content_type}
                 json_data = self._session.post(
                     API_ENDPOINT, headers=headers, data=multipart_data
                 )
             finally:
-                post_data["files"].file_object.close()
-
-        else:
-            raise ValueError(
-                "The `files` parameter does not contain a vaild "
-                "URL or path to a local file."
-            )
+                file_object = post_data["files"].file_object
+                if isinstance(files[0], str) or isinstance(
+                    file_object, BufferReader
+                ):
+                    # Only close the files (and readers) opened here
+                    file_object.close()
 
         # Return a message object created from the response JSON data
         return self._object_factory(OBJECT_TYPE, json_data)
@@ -394,3 +519,155 @@ class MessagesAPI(object):
 
     # Add edit() as an alias to the update() method for backward compatibility
     edit = update
+
+    def get_file_info(self, url):
+        """Get the name, size and content type of a message file.
+
+        Makes a HEAD request, so the file itself is not downloaded.
+
+        Args:
+            url(str): One of the content URLs of a message's `files`.
+
+        Returns:
+            FileInfo: The file's metadata.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        return self._session.file_info(url)
+
+    def download_file(self, url, path=None, directory=None, resume=True):
+        """Download a message file, streaming it to disk.
+
+        See `RestSession.download()`; interrupted downloads are resumed.
+
+        Args:
+            url(str): One of the content URLs of a message's `files`.
+            path(str): The path to write the file to.  Defaults to the file's
+                name in `directory`.
+            directory(str): The directory to write the file to, when `path`
+                is not provided.  Defaults to the current directory.
+            resume(bool): Resume a partial download, if possible.
+
+        Returns:
+            str: The path of the downloaded file.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the Webex cloud returns an error.
+            IOError: If the download is incomplete.
+
+        """
+        return self._session.download(
+            url, path=path, directory=directory, resume=resume
+        )
+
+    def download_files(
+        self,
+        files,
+        directory=None,
+        resume=True,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Download many message files, concurrently.
+
+        The files are written to `directory` under their own names; files
+        with the same name are given unique names (deterministically, in
+        order, so that a re-run resumes the same partial downloads).
+
+        Args:
+            files(Message, list): A message, whose `files` are downloaded,
+                or a list of content URLs.
+            directory(str): The directory to write the files to.  Defaults
+                to the current directory.
+            resume(bool): Resume partial downloads, if possible.
+            max_workers(int): The maximum number of concurrent downloads.
+
+        Returns:
+            list: A DownloadResult for each file, in order.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(directory, str, optional=True)
+        check_type(max_workers, int)
+
+        urls = list(getattr(files, "files", files) or [])
+        directory = directory or os.curdir
+
+        def get_info(url):
+            try:
+                return self._session.file_info(url), None
+            except Exception as e:
+                return None, e
+
+        def download(url, path, info):
+            try:
+                path = self._session.download(
+                    url, path=path, resume=resume, info=info
+                )
+            except Exception as e:
+                return DownloadResult(url, None, e)
+            return DownloadResult(url, path, None)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            infos = list(executor.map(get_info, urls))
+
+            # Reserve a unique path for each file, in order
+            paths, used = [], set()
+            for url, (info, _) in zip(urls, infos):
+                name = (info and info.name) or os.path.basename(
+                    url.rstrip("/")
+                )
+                root, extension = os.path.splitext(name)
+                candidate, number = name, 1
+                while candidate in used:
+                    candidate = "{} ({}){}".format(root, number, extension)
+                    number += 1
+                used.add(candidate)
+                paths.append(os.path.join(directory, candidate))
+
+            futures = [
+                None if error else executor.submit(download, url, path, info)
+                for url, path, (info, error) in zip(urls, paths, infos)
+            ]
+            return [
+                DownloadResult(url, None, error)
+                if future is None
+                else future.result()
+                for url, future, (_, error) in zip(urls, futures, infos)
+            ]
+
+    def create_many(self, messages, max_workers=DEFAULT_MAX_WORKERS):
+        """Post many messages, concurrently.
+
+        For example, to post generated reports (as in-memory data) to many
+        rooms, with a bounded number of concurrent uploads.
+
+        Args:
+            messages(iterable): The `create()` arguments (dict) of each
+                message.  Note that file-like objects cannot be shared
+                between messages; bytes-like data can.
+            max_workers(int): The maximum number of concurrent requests.
+
+        Returns:
+            list: A CreateResult for each message, in order.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(max_workers, int)
+
+        def create(params):
+            try:
+                message = self.create(**params)
+            except Exception as e:
+                return CreateResult(params, None, e)
+            return CreateResult(params, message, None)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(create, messages))
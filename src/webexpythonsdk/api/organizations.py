@@ -57,10 +57,13 @@ class OrganizationsAPI(object):
         self._object_factory = object_factory
 
     @generator_container
-    def list(self, **request_parameters):
+    def list(self, fields=None, **request_parameters):
         """List Organizations.
 
         Args:
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -73,9 +76,11 @@ class OrganizationsAPI(object):
             ApiError: If the Webex cloud returns an error.
 
         """
+        check_type(fields, (list, tuple), optional=True)
+
         # API request - get items
         items = self._session.get_items(
-            API_ENDPOINT, params=request_parameters
+            API_ENDPOINT, params=request_parameters, fields=fields
         )
 
         # Yield organization objects created from the returned JSON objects
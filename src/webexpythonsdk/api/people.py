@@ -21,6 +21,9 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import DEFAULT_MAX_WORKERS
 from ..generator_containers import generator_container
 from ..restsession import RestSession
 from ..utils import (
@@ -32,6 +35,9 @@ from ..utils import (
 API_ENDPOINT = "people"
 OBJECT_TYPE = "person"
 
+# The maximum number of person IDs accepted by the `id` list parameter
+MAX_IDS_PER_LIST_REQUEST = 85
+
 
 class PeopleAPI(object):
     """Webex People API.
@@ -67,6 +73,7 @@ class PeopleAPI(object):
         id=None,
         orgId=None,
         max=None,
+        fields=None,
         **request_parameters,
     ):
         """List people in your organization.
@@ -100,6 +107,9 @@ class PeopleAPI(object):
             orgId(str): The organization ID.
             max(int): Limit the maximum number of items returned from the Webex
                 service per request.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -117,6 +127,7 @@ class PeopleAPI(object):
         check_type(displayName, str, optional=True)
         check_type(orgId, str, optional=True)
         check_type(max, int, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -128,7 +139,9 @@ class PeopleAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield person objects created from the returned items JSON objects
         for item in items:
@@ -277,6 +290,65 @@ class PeopleAPI(object):
         # Return a person object created from the response JSON data
         return self._object_factory(OBJECT_TYPE, json_data)
 
+    def get_many(self, ids, cache=None, max_workers=DEFAULT_MAX_WORKERS):
+        """Get the details of many people, by ID, with few requests.
+
+        The IDs are deduplicated and looked up with `list()` requests of up
+        to 85 IDs each (the maximum accepted by the Webex People API), which
+        are made concurrently.
+
+        Args:
+            ids(iterable): The IDs of the people to be retrieved (not a
+                single ID string).
+            cache(TTLCache): Optional cache of Person objects, by person ID
+                (for example, the `people` cache of an EntityCache).  People
+                found in the cache are not requested, and the people
+                retrieved are added to the cache.
+            max_workers(int): The maximum number of concurrent requests.
+
+        Returns:
+            dict: The Person objects, by person ID.  The IDs of people that
+            were not found (or are not visible to you) map to None.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        check_type(max_workers, int)
+        if isinstance(ids, str):
+            # Iterating a single ID would look up each of its characters
+            raise TypeError(
+                "`ids` must be an iterable of person IDs, not a single ID."
+            )
+
+        people = dict.fromkeys(ids)
+        for personId in people:
+            check_type(personId, str)
+
+        if cache is not None:
+            for personId in people:
+                people[personId] = cache.get(personId)
+
+        missing = [personId for personId, p in people.items() if p is None]
+        chunks = [
+            missing[i : i + MAX_IDS_PER_LIST_REQUEST]
+            for i in range(0, len(missing), MAX_IDS_PER_LIST_REQUEST)
+        ]
+
+        def list_chunk(chunk):
+            return list(self.list(id=",".join(chunk), max=len(chunk)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for found in executor.map(list_chunk, chunks):
+                for person in found:
+                    if person.id in people:
+                        people[person.id] = person
+                        if cache is not None:
+                            cache.set(person.id, person)
+
+        return people
+
     def update(
         self,
         personId,
@@ -21,15 +21,83 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from webexpythonsdk.config import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    DEFAULT_MAX_WORKERS,
+)
+from webexpythonsdk.exceptions import ApiError
+
 from webexpythonsdk.generator_containers import generator_container
 
-from webexpythonsdk.utils import check_type, dict_from_items_with_values
+from webexpythonsdk.utils import (
+    check_type,
+    dict_from_items_with_values,
+    WebexDateTime,
+    ZuluTimeZone,
+)
 
-from webexpythonsdk.restsession import RestSession
+from webexpythonsdk.restsession import FileInfo, RestSession
 
 API_ENDPOINT = "recordings"
 OBJECT_TYPE = "recording"
 
+# The longest time range accepted by a list recordings request
+MAX_LIST_WINDOW = timedelta(days=30)
+
+# The name of the manifest written to an archive directory
+ARCHIVE_MANIFEST_NAME = "manifest.jsonl"
+
+# Response codes returned when a temporary download link has expired
+_EXPIRED_LINK_RESPONSE_CODES = (401, 403, 404, 410)
+
+# The number of times an expired download link is refreshed
+_MAX_LINK_REFRESHES = 2
+
+# Temporary download links are pre-signed; don't send them the access token
+_NO_AUTHORIZATION = {"headers": {"Authorization": None}}
+
+ARCHIVE_DOWNLOADED = "downloaded"
+ARCHIVE_SKIPPED = "skipped"
+ARCHIVE_FAILED = "failed"
+
+
+ArchiveResult = namedtuple(
+    "ArchiveResult", ["recordingId", "path", "size", "status", "error"]
+)
+ArchiveResult.__doc__ = """The result of archiving a recording.
+
+Attributes:
+    recordingId(str): The ID of the recording.
+    path(str): The path of the archived file (None if it failed).
+    size(int): The size of the archived file, in bytes.
+    status(str): "downloaded", "skipped" (archived by a previous run) or
+        "failed".
+    error(str): The error that prevented the download (None if it
+        succeeded).
+"""
+
+
+def _webex_time(dt):
+    """Format a (timezone-aware) datetime as a Webex date-time string."""
+    return str(WebexDateTime.fromtimestamp(dt.timestamp(), ZuluTimeZone()))
+
+
+def _archive_name(recording):
+    """The (file system safe) name of a recording's archived file."""
+    topic = re.sub(r"[^\w.-]+", "_", recording.topic or "").strip("._")
+    extension = (recording.format or "mp4").lower()
+    if topic:
+        return "{}_{}.{}".format(topic[:100], recording.id, extension)
+    return "{}.{}".format(recording.id, extension)
+
 
 class RecordingsAPI(object):
     """Webex Recordings API.
@@ -68,6 +136,7 @@ class RecordingsAPI(object):
         topic=None,
         format=None,
         serviceType=None,
+        fields=None,
         **request_parameters,
     ):
         """Lists recordings.
@@ -111,6 +180,9 @@ class RecordingsAPI(object):
                     EventCenter,
                     SupportCenter,
                     TrainingCenter
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -128,10 +200,11 @@ class RecordingsAPI(object):
         check_type(meetingId, str, optional=True)
         check_type(hostEmail, str, optional=True)
         check_type(siteUrl, str, optional=True)
-        check_type(integrationTag, str)
+        check_type(integrationTag, str, optional=True)
         check_type(topic, str, optional=True)
         check_type(format, str, optional=True)
         check_type(serviceType, str, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -147,7 +220,12 @@ class RecordingsAPI(object):
             serviceType=serviceType,
         )
 
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        if _from:
+            params["from"] = params.pop("_from")
+
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         for item in items:
             yield self._object_factory(OBJECT_TYPE, item)
@@ -207,3 +285,244 @@ class RecordingsAPI(object):
         )
 
         self._session.get(API_ENDPOINT + "/" + recordingId, params=params)
+
+    def list_sharded(
+        self,
+        _from,
+        to,
+        siteUrls=None,
+        window=MAX_LIST_WINDOW,
+        max_workers=DEFAULT_MAX_WORKERS,
+        **request_parameters,
+    ):
+        """List the recordings of a time range, concurrently.
+
+        A list recordings request covers at most 30 days, of a single Webex
+        site.  The time range is split into windows of at most `window`,
+        and each window of each site is listed concurrently.  Recordings
+        listed by more than one request are only returned once.
+
+        Args:
+            _from(datetime): List recordings which occurred after this
+                (timezone-aware) date and time.
+            to(datetime): List recordings which occurred before this
+                (timezone-aware) date and time.
+            siteUrls(list): URLs of the Webex sites to list recordings from.
+                Defaults to the user's preferred site.
+            window(timedelta): The time range covered by each request.
+            max_workers(int): The maximum number of concurrent requests.
+            **request_parameters: Additional `list()` parameters (hostEmail,
+                topic, format, etc.).
+
+        Returns:
+            list: The recordings, in the order they were listed.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `_from` or `to` is a naive datetime, or `window`
+                is not between zero and 30 days.
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        check_type(_from, datetime)
+        check_type(to, datetime)
+        check_type(siteUrls, (list, tuple), optional=True)
+        check_type(window, timedelta)
+        check_type(max_workers, int)
+
+        if _from.utcoffset() is None or to.utcoffset() is None:
+            raise ValueError("`_from` and `to` must be timezone-aware.")
+        if not timedelta(0) < window <= MAX_LIST_WINDOW:
+            raise ValueError("`window` must be between zero and 30 days.")
+
+        windows = []
+        start = _from
+        while start < to:
+            end = min(start + window, to)
+            windows.append((_webex_time(start), _webex_time(end)))
+            start = end
+
+        shards = [
+            (siteUrl, start, end)
+            for siteUrl in (siteUrls or [None])
+            for start, end in windows
+        ]
+
+        def list_shard(shard):
+            siteUrl, start, end = shard
+            return list(
+                self.list(
+                    _from=start, to=end, siteUrl=siteUrl, **request_parameters
+                )
+            )
+
+        recordings, seen = [], set()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for items in executor.map(list_shard, shards):
+                for recording in items:
+                    if recording.id not in seen:
+                        seen.add(recording.id)
+                        recordings.append(recording)
+        return recordings
+
+    def _download(self, recording, path, chunk_size):
+        """Download a recording, refreshing its expired download links."""
+        refreshes = 0
+        while True:
+            # The temporary download links are only returned by `get()`; so
+            # the (expired) cached details are evicted before each request
+            self._session._evict_cached(API_ENDPOINT + "/" + recording.id)
+            details = self.get(recording.id, siteUrl=recording.siteUrl)
+            links = details.temporaryDirectDownloadLinks or {}
+            url = links.get("recordingDownloadLink")
+            if not url:
+                raise ValueError(
+                    "Recording {} has no download link.".format(recording.id)
+                )
+            try:
+                info = self._session.file_info(url, **_NO_AUTHORIZATION)
+                if info.size is None:
+                    # Verify the download against the recording's size
+                    info = info._replace(size=details.sizeBytes)
+                return self._session.download(
+                    url,
+                    path=path,
+                    chunk_size=chunk_size,
+                    info=info,
+                    **_NO_AUTHORIZATION,
+                )
+            except ApiError as e:
+                if (
+                    e.status_code not in _EXPIRED_LINK_RESPONSE_CODES
+                    or refreshes >= _MAX_LINK_REFRESHES
+                ):
+                    raise
+                refreshes += 1
+
+    def archive(
+        self,
+        directory,
+        _from,
+        to,
+        siteUrls=None,
+        manifest_path=None,
+        window=MAX_LIST_WINDOW,
+        chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        **request_parameters,
+    ):
+        """Download the recordings of a time range to a directory.
+
+        The recordings are listed with `list_sharded()` and downloaded
+        concurrently, streamed to disk in chunks, using the temporary
+        download link of each recording.  The links are retrieved just
+        before each download, and refreshed if they expire.  Each download
+        is verified against the size of the file.
+
+        The outcome of each download is recorded in a manifest; running the
+        archive again, with the same directory and manifest, skips the
+        recordings that were downloaded (if their files are still complete)
+        and resumes partial downloads.
+
+        Args:
+            directory(str): The directory to write the recordings to.  It is
+                created if it doesn't exist.
+            _from(datetime): Archive recordings which occurred after this
+                (timezone-aware) date and time.
+            to(datetime): Archive recordings which occurred before this
+                (timezone-aware) date and time.
+            siteUrls(list): URLs of the Webex sites to archive recordings
+                from.  Defaults to the user's preferred site.
+            manifest_path(str): The path of the manifest.  Defaults to
+                "manifest.jsonl" in `directory`.
+            window(timedelta): The time range covered by each list request.
+            chunk_size(int): The size of the chunks downloaded, in bytes.
+            max_workers(int): The maximum number of concurrent requests.
+            **request_parameters: Additional `list()` parameters (hostEmail,
+                topic, format, etc.).
+
+        Returns:
+            list: An ArchiveResult for each recording, in the order they
+            were listed.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `_from` or `to` is a naive datetime, or `window`
+                is not between zero and 30 days.
+            ApiError: If the Webex cloud returns an error while listing the
+                recordings.
+
+        """
+        check_type(directory, str)
+        check_type(manifest_path, str, optional=True)
+        check_type(chunk_size, int)
+        check_type(max_workers, int)
+
+        os.makedirs(directory, exist_ok=True)
+        if manifest_path is None:
+            manifest_path = os.path.join(directory, ARCHIVE_MANIFEST_NAME)
+
+        # Resume from the manifest
+        completed = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest_file:
+                for line in manifest_file:
+                    try:
+                        result = ArchiveResult(**json.loads(line))
+                    except (TypeError, ValueError):
+                        # A partially written last line
+                        continue
+                    if result.status == ARCHIVE_DOWNLOADED:
+                        completed[result.recordingId] = result
+                    else:
+                        completed.pop(result.recordingId, None)
+
+        recordings = self.list_sharded(
+            _from,
+            to,
+            siteUrls=siteUrls,
+            window=window,
+            max_workers=max_workers,
+            **request_parameters,
+        )
+
+        manifest_lock = threading.Lock()
+        manifest = open(manifest_path, "a")
+        # Terminate any partially written last line
+        manifest.write("\n")
+
+        def archive_recording(recording):
+            previous = completed.get(recording.id)
+            if (
+                previous is not None
+                and os.path.exists(previous.path)
+                and os.path.getsize(previous.path) == previous.size
+            ):
+                return previous._replace(status=ARCHIVE_SKIPPED)
+
+            path = os.path.join(directory, _archive_name(recording))
+            try:
+                path = self._download(recording, path, chunk_size)
+            except Exception as e:
+                result = ArchiveResult(
+                    recording.id, None, None, ARCHIVE_FAILED, str(e)
+                )
+            else:
+                result = ArchiveResult(
+                    recording.id,
+                    path,
+                    os.path.getsize(path),
+                    ARCHIVE_DOWNLOADED,
+                    None,
+                )
+            with manifest_lock:
+                manifest.write(json.dumps(result._asdict()) + "\n")
+                manifest.flush()
+                os.fsync(manifest.fileno())
+            return result
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(archive_recording, recordings))
+        finally:
+            manifest.close()
@@ -60,10 +60,13 @@ class RolesAPI(object):
         self._object_factory = object_factory
 
     @generator_container
-    def list(self, **request_parameters):
+    def list(self, fields=None, **request_parameters):
         """List all roles.
 
         Args:
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -76,9 +79,11 @@ class RolesAPI(object):
             ApiError: If the Webex cloud returns an error.
 
         """
+        check_type(fields, (list, tuple), optional=True)
+
         # API request - get items
         items = self._session.get_items(
-            API_ENDPOINT, params=request_parameters
+            API_ENDPOINT, params=request_parameters, fields=fields
         )
 
         # Yield role objects created from the returned JSON objects
@@ -60,7 +60,7 @@ class RoomTabsAPI(object):
         self._object_factory = object_factory
 
     @generator_container
-    def list(self, roomId, **request_parameters):
+    def list(self, roomId, fields=None, **request_parameters):
         """Lists all Room Tabs of a room.
 
         This method supports Webex's implementation of RFC5988 Web
@@ -75,6 +75,9 @@ class RoomTabsAPI(object):
 
         Args:
             roomId(str): List Room Tabs associated with a room, by ID.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -88,6 +91,7 @@ class RoomTabsAPI(object):
 
         """
         check_type(roomId, str)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -95,7 +99,9 @@ class RoomTabsAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield room objects created from the returned items JSON objects
         for item in items:
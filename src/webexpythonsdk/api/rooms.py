@@ -66,6 +66,7 @@ class RoomsAPI(object):
         type=None,
         sortBy=None,
         max=100,
+        fields=None,
         **request_parameters,
     ):
         """List rooms.
@@ -93,6 +94,9 @@ class RoomsAPI(object):
                 (`created`).
             max(int): Limit the maximum number of items returned from the Webex
                 service per request.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -109,6 +113,7 @@ class RoomsAPI(object):
         check_type(type, str, optional=True)
         check_type(sortBy, str, optional=True)
         check_type(max, int, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -119,7 +124,9 @@ class RoomsAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield room objects created from the returned items JSON objects
         for item in items:
@@ -60,7 +60,7 @@ class TeamMembershipsAPI(object):
         self._object_factory = object_factory
 
     @generator_container
-    def list(self, teamId, max=100, **request_parameters):
+    def list(self, teamId, max=100, fields=None, **request_parameters):
         """List team memberships for a team, by ID.
 
         This method supports Webex's implementation of RFC5988 Web
@@ -77,6 +77,9 @@ class TeamMembershipsAPI(object):
             teamId(str): List team memberships for a team, by ID.
             max(int): Limit the maximum number of items returned from the Webex
                 service per request.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -91,6 +94,7 @@ class TeamMembershipsAPI(object):
         """
         check_type(teamId, str)
         check_type(max, int, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -99,7 +103,9 @@ class TeamMembershipsAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield team membership objects created from the returned items JSON
         # objects
@@ -60,7 +60,7 @@ class WebhooksAPI(object):
         self._object_factory = object_factory
 
     @generator_container
-    def list(self, max=100, **request_parameters):
+    def list(self, max=100, fields=None, **request_parameters):
         """List all of the authenticated user's webhooks.
 
         This method supports Webex's implementation of RFC5988 Web
@@ -76,6 +76,9 @@ class WebhooksAPI(object):
         Args:
             max(int): Limit the maximum number of items returned from the Webex
                 service per request.
+            fields(list): Only keep these top-level fields of each
+                returned item; all other fields are dropped before the
+                data objects are created.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -89,6 +92,7 @@ class WebhooksAPI(object):
 
         """
         check_type(max, int, optional=True)
+        check_type(fields, (list, tuple), optional=True)
 
         params = dict_from_items_with_values(
             request_parameters,
@@ -96,7 +100,9 @@ class WebhooksAPI(object):
         )
 
         # API request - get items
-        items = self._session.get_items(API_ENDPOINT, params=params)
+        items = self._session.get_items(
+            API_ENDPOINT, params=params, fields=fields
+        )
 
         # Yield webhook objects created from the returned items JSON objects
         for item in items:
@@ -0,0 +1,293 @@
+"""Broadcast a message to many Webex rooms or people.
+
+Classes:
+    Broadcast: Posts a message (optionally personalized) to many recipients,
+        with paced concurrency and a resumable checkpoint journal.
+    BroadcastResult: The result of posting a broadcast to one recipient.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .config import DEFAULT_MAX_WORKERS
+from .exceptions import ApiError, RateLimitError
+from .utils import check_type, TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BROADCAST_RATE = 5
+
+RECIPIENT_TYPES = ("roomId", "toPersonId", "toPersonEmail")
+
+# Broadcast result statuses
+SENT = "sent"
+FAILED = "failed"
+SKIPPED = "skipped"
+UNKNOWN = "unknown"
+
+_SENDING = "sending"
+
+
+BroadcastResult = namedtuple(
+    "BroadcastResult", ["recipient", "status", "messageId", "error"]
+)
+BroadcastResult.__doc__ = """The result of posting a broadcast to a recipient.
+
+Attributes:
+    recipient(str): The room ID, person ID or email address.
+    status(str): "sent", "failed" (rejected by Webex), "skipped" (sent by
+        a previous run) or "unknown" (the request failed with a server or
+        connection error, or a previous run was interrupted while posting to
+        the recipient; so the message may or may not have been posted).
+    messageId(str): The ID of the posted message, if it was posted.
+    error(str): The error that prevented the message from being posted.
+"""
+
+
+class Broadcast(object):
+    """Post a message to many rooms or people.
+
+    The messages are posted with `MessagesAPI.create()`, from a bounded pool
+    of threads, paced by a token bucket so that the broadcast stays under
+    the rate limit instead of triggering storms of 429 responses.  If a
+    request is rate-limited anyway (and the session does not wait on rate
+    limits itself), all of the workers pause for the Retry-After period and
+    the request is retried.
+
+    When a checkpoint path is provided, the progress of the broadcast is
+    journaled to it, so that a broadcast interrupted by a crash can be
+    resumed by running it again: recipients that were sent the message are
+    skipped, and recipients whose outcome is unknown (the process stopped
+    while posting to them, or the request failed with a server or connection
+    error) are not re-sent unless requested; so no recipient is sent the
+    message twice.  Only the recipients Webex rejected are re-sent.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        text=None,
+        markdown=None,
+        attachments=None,
+        files=None,
+        render=None,
+        recipient_type="roomId",
+        checkpoint_path=None,
+        rate=DEFAULT_BROADCAST_RATE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        resend_unknown=False,
+    ):
+        """Init a new Broadcast.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to post the messages.
+            text(str): The message, in plain text.
+            markdown(str): The message, in markdown format.
+            attachments(list): Content attachments (for example, an
+                AdaptiveCard) to attach to the message.
+            files(list): A public URL, or local path, of a file to be posted
+                with the message (see `MessagesAPI.create()`).  Prefer a
+                public URL for large files: Webex fetches a URL once per
+                message, while a local file is uploaded with every message
+                (the API provides no way to reuse an uploaded file).
+            render(callable): Optional function called with each recipient,
+                returning a dictionary of `MessagesAPI.create()` arguments
+                (for example, a personalized `markdown`) that override the
+                broadcast's.
+            recipient_type(str): How recipients are identified: "roomId",
+                "toPersonId" or "toPersonEmail".
+            checkpoint_path(str): The path of the checkpoint journal.
+            rate(int, float): The maximum number of messages posted per
+                second.
+            max_workers(int): The maximum number of concurrent requests.
+            resend_unknown(bool): Whether to re-send the message to
+                recipients whose outcome is unknown when resuming.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `recipient_type` is not a supported value.
+
+        """
+        check_type(text, str, optional=True)
+        check_type(markdown, str, optional=True)
+        check_type(attachments, list, optional=True)
+        check_type(files, list, optional=True)
+        check_type(recipient_type, str)
+        check_type(checkpoint_path, str, optional=True)
+        check_type(rate, (int, float))
+        check_type(max_workers, int)
+        check_type(resend_unknown, bool)
+
+        if recipient_type not in RECIPIENT_TYPES:
+            raise ValueError(
+                "`recipient_type` must be one of: {}.".format(
+                    ", ".join(RECIPIENT_TYPES)
+                )
+            )
+
+        super(Broadcast, self).__init__()
+
+        self._api = api
+        self.message = {
+            "text": text,
+            "markdown": markdown,
+            "attachments": attachments,
+            "files": files,
+        }
+        self.render = render
+        self.recipient_type = recipient_type
+        self.checkpoint_path = checkpoint_path
+        self.max_workers = max_workers
+        self.resend_unknown = resend_unknown
+        self.rate_limiter = TokenBucket(rate)
+
+        self._journal_lock = threading.Lock()
+
+    def _load_checkpoint(self):
+        """The (status, message ID) of each journaled recipient."""
+        progress = {}
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as journal:
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A partially written last line
+                        continue
+                    progress[entry["recipient"]] = (
+                        entry["status"],
+                        entry.get("messageId"),
+                    )
+        return progress
+
+    def _journal(self, journal, recipient, status, messageId=None):
+        if journal is None:
+            return
+        entry = {"recipient": recipient, "status": status}
+        if messageId:
+            entry["messageId"] = messageId
+        with self._journal_lock:
+            journal.write(json.dumps(entry) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def _recipient_key(self, recipient):
+        if isinstance(recipient, str):
+            return recipient
+        return recipient[self.recipient_type]
+
+    def _post(self, recipient, journal):
+        key = self._recipient_key(recipient)
+        message = {k: v for k, v in self.message.items() if v is not None}
+        if self.render is not None:
+            message.update(self.render(recipient))
+        if message.get("attachments"):
+            # create() converts the attachments in place
+            message["attachments"] = list(message["attachments"])
+        message[self.recipient_type] = key
+
+        self._journal(journal, key, _SENDING)
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                posted = self._api.messages.create(**message)
+            except RateLimitError as e:
+                self.rate_limiter.pause(e.retry_after)
+                continue
+            except Exception as e:
+                logger.warning(
+                    "Unable to post broadcast to {}: {}".format(key, e)
+                )
+                # Webex may have posted the message before a server or
+                # connection error
+                if isinstance(e, requests.RequestException) or (
+                    isinstance(e, ApiError) and e.status_code >= 500
+                ):
+                    status = UNKNOWN
+                else:
+                    status = FAILED
+                self._journal(journal, key, status)
+                return BroadcastResult(key, status, None, str(e))
+            else:
+                self._journal(journal, key, SENT, posted.id)
+                return BroadcastResult(key, SENT, posted.id, None)
+
+    def send(self, recipients):
+        """Post the message to the recipients.
+
+        Args:
+            recipients(iterable): The recipients' room IDs, person IDs or
+                email addresses (see `recipient_type`); or dictionaries
+                containing the recipient's identifier (under the
+                `recipient_type` key) and any data used by `render`.
+
+        Returns:
+            list: A BroadcastResult for each recipient, in order.
+
+        """
+        progress = self._load_checkpoint()
+
+        results = []
+        pending = []
+        for recipient in recipients:
+            key = self._recipient_key(recipient)
+            status, messageId = progress.get(key, (None, None))
+            if status == SENT:
+                results.append(BroadcastResult(key, SKIPPED, messageId, None))
+            elif status in (_SENDING, UNKNOWN) and not self.resend_unknown:
+                results.append(BroadcastResult(key, UNKNOWN, None, None))
+            else:
+                pending.append((len(results), recipient))
+                results.append(None)
+
+        journal = None
+        if self.checkpoint_path:
+            journal = open(self.checkpoint_path, "a")
+            # Terminate a partially written last line
+            if journal.tell() > 0:
+                with open(self.checkpoint_path, "rb") as existing:
+                    existing.seek(-1, os.SEEK_END)
+                    if existing.read(1) != b"\n":
+                        journal.write("\n")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    (index, executor.submit(self._post, recipient, journal))
+                    for index, recipient in pending
+                ]
+                for index, future in futures:
+                    results[index] = future.result()
+        finally:
+            if journal is not None:
+                journal.close()
+
+        return results
@@ -0,0 +1,803 @@
+"""Caching of Webex API data.
+
+Classes:
+    TTLCache: A thread-safe, size-bounded, in-memory cache whose entries
+        expire after a time-to-live.
+    SQLiteCache: A persistent, size-bounded cache whose entries expire
+        after a time-to-live; stored in a SQLite database that may be shared
+        by many processes.
+    EntityCache: Caches people, rooms, teams and room memberships retrieved
+        through a WebexAPI object; invalidated by webhook (or Events API)
+        events.
+
+All caches in this package implement the same small interface:
+`get(key, default=None)`, `set(key, value, ttl=None)`, `delete(key)`,
+`clear()` and a `stats` property; so they can be used interchangeably
+wherever a cache may be provided.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .utils import check_type, object_json_data
+
+
+DEFAULT_CACHE_TTL = 300
+
+DEFAULT_CACHE_MAXSIZE = 10000
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 2**20
+
+DEFAULT_SQLITE_TIMEOUT = 30
+
+
+class TTLCache(object):
+    """A thread-safe, size-bounded, in-memory cache with expiring entries.
+
+    When the cache is full, the least recently used entry is evicted.
+    Expired entries are never returned; they are dropped when they are next
+    looked up (or evicted).
+
+    The cache keeps statistics on its hit rate and on the staleness of the
+    data it serves (the age of the entries at the time they were returned).
+
+    """
+
+    def __init__(
+        self,
+        maxsize=DEFAULT_CACHE_MAXSIZE,
+        ttl=DEFAULT_CACHE_TTL,
+        clock=time.monotonic,
+    ):
+        """Init a new TTLCache.
+
+        Args:
+            maxsize(int): The maximum number of entries in the cache.
+            ttl(int, float): The default time-to-live of an entry, in
+                seconds.
+            clock(callable): Function returning the current time in seconds.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `maxsize` or `ttl` is not positive.
+
+        """
+        check_type(maxsize, int)
+        check_type(ttl, (int, float))
+
+        if maxsize <= 0 or ttl <= 0:
+            raise ValueError("`maxsize` and `ttl` must be positive numbers.")
+
+        super(TTLCache, self).__init__()
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._total_hit_age = 0.0
+        self._max_hit_age = 0.0
+
+    def __len__(self):
+        """The number of entries in the cache (including expired entries)."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Whether the cache holds an unexpired entry for the key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[2] > self._clock()
+
+    def get(self, key, default=None):
+        """Get a value from the cache.
+
+        Args:
+            key: The key of the entry.
+            default: The value returned if there is no unexpired entry for
+                the key.
+
+        Returns:
+            The cached value, or `default`.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+
+            value, stored_at, expires_at = entry
+            now = self._clock()
+            if expires_at <= now:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            age = now - stored_at
+            self._hits += 1
+            self._total_hit_age += age
+            self._max_hit_age = max(self._max_hit_age, age)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Add, or replace, an entry in the cache.
+
+        Args:
+            key: The key of the entry.
+            value: The value to be cached.
+            ttl(int, float): The time-to-live of the entry, in seconds.
+                Defaults to the cache's `ttl`.
+
+        """
+        now = self._clock()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, now, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key):
+        """Remove an entry from the cache.
+
+        Returns:
+            bool: True if an entry was removed.
+
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+            self._invalidations += 1
+            return True
+
+    def delete_where(self, predicate, values=False):
+        """Remove every entry whose key matches a predicate.
+
+        Args:
+            predicate(callable): Called with each key; entries for which it
+                returns True are removed.
+            values(bool): Call the predicate with each key and value.
+
+        Returns:
+            int: The number of entries removed.
+
+        """
+        with self._lock:
+            if values:
+                keys = [
+                    key
+                    for key, (value, _, _) in self._entries.items()
+                    if predicate(key, value)
+                ]
+            else:
+                keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self._invalidations += len(keys)
+            return len(keys)
+
+    def delete_prefix(self, prefix):
+        """Remove every entry whose key starts with a prefix.
+
+        Returns:
+            int: The number of entries removed.
+
+        """
+        return self.delete_where(lambda key: key.startswith(prefix))
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self):
+        """Cache statistics (dict).
+
+        Keys:
+            size: The number of entries in the cache.
+            hits: The number of lookups answered from the cache.
+            misses: The number of lookups not answered from the cache.
+            hit_rate: The fraction of lookups answered from the cache.
+            evictions: Entries dropped because the cache was full.
+            expirations: Entries dropped because their TTL expired.
+            invalidations: Entries explicitly removed.
+            mean_hit_age: The mean age, in seconds, of the served entries.
+            max_hit_age: The maximum age, in seconds, of a served entry.
+
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "mean_hit_age": (
+                    self._total_hit_age / self._hits if self._hits else 0.0
+                ),
+                "max_hit_age": self._max_hit_age,
+            }
+
+
+class SQLiteCache(object):
+    """A persistent cache with expiring entries, stored in a SQLite database.
+
+    The database is opened in write-ahead-logging (WAL) mode, so that many
+    processes on a host (for example, the workers of a web application
+    server) can share one cache file, reading concurrently while another
+    process writes.  Each thread of each process uses its own connection.
+
+    Values must be JSON serializable.  When the total size of the stored
+    values exceeds `max_bytes`, the expired entries, and then the entries
+    closest to expiring, are evicted.  Lookups never write to the database.
+
+    The `stats` of a SQLiteCache count the lookups made by the current
+    process.
+
+    """
+
+    def __init__(
+        self,
+        path,
+        ttl=DEFAULT_CACHE_TTL,
+        max_bytes=DEFAULT_CACHE_MAX_BYTES,
+        timeout=DEFAULT_SQLITE_TIMEOUT,
+    ):
+        """Init a new SQLiteCache.
+
+        Args:
+            path(str): The path of the SQLite database file; it is created if
+                it does not exist.
+            ttl(int, float): The default time-to-live of an entry, in
+                seconds.
+            max_bytes(int): The maximum total size of the cached values, in
+                bytes.
+            timeout(int, float): How long, in seconds, to wait for another
+                process to release a lock on the database.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `ttl` or `max_bytes` is not positive.
+
+        """
+        check_type(path, str)
+        check_type(ttl, (int, float))
+        check_type(max_bytes, int)
+        check_type(timeout, (int, float))
+
+        if ttl <= 0 or max_bytes <= 0:
+            raise ValueError("`ttl` and `max_bytes` must be positive numbers.")
+
+        super(SQLiteCache, self).__init__()
+
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        with self._connection() as connection:
+            # Create the schema atomically; other processes may be, too
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "stored_at REAL NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_expires_at "
+                "ON cache (expires_at)"
+            )
+            # The total size of the values is kept up to date by triggers,
+            # so that it never takes a table scan to check it
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_meta ("
+                "name TEXT PRIMARY KEY, "
+                "value INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO cache_meta (name, value) "
+                "SELECT 'bytes', COALESCE(SUM(size), 0) FROM cache"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_insert "
+                "AFTER INSERT ON cache BEGIN "
+                "UPDATE cache_meta SET value = value + NEW.size "
+                "WHERE name = 'bytes'; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_delete "
+                "AFTER DELETE ON cache BEGIN "
+                "UPDATE cache_meta SET value = value - OLD.size "
+                "WHERE name = 'bytes'; END"
+            )
+
+    def _connection(self):
+        """The current thread's connection to the database."""
+        connection = getattr(self._local, "connection", None)
+        # Connections must not be shared with forked child processes
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def __len__(self):
+        """The number of entries in the cache (including expired entries)."""
+        return (
+            self._connection()
+            .execute("SELECT COUNT(*) FROM cache")
+            .fetchone()[0]
+        )
+
+    def __contains__(self, key):
+        """Whether the cache holds an unexpired entry for the key."""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT 1 FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    def get(self, key, default=None):
+        """Get a value from the cache.
+
+        Args:
+            key(str): The key of the entry.
+            default: The value returned if there is no unexpired entry for
+                the key.
+
+        Returns:
+            The cached value, or `default`.
+
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        with self._stats_lock:
+            if row is None:
+                self._misses += 1
+                return default
+            self._hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        """Add, or replace, an entry in the cache.
+
+        Args:
+            key(str): The key of the entry.
+            value: The (JSON serializable) value to be cached.
+            ttl(int, float): The time-to-live of the entry, in seconds.
+                Defaults to the cache's `ttl`.
+
+        """
+        encoded = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._connection() as connection:
+            # Delete, rather than replace, so the delete trigger runs
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            connection.execute(
+                "INSERT INTO cache "
+                "(key, value, size, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded), now, expires_at),
+            )
+            self._evict(connection, now)
+
+    @staticmethod
+    def _total_size(connection):
+        """The total size of the cached values, in bytes."""
+        return connection.execute(
+            "SELECT value FROM cache_meta WHERE name = 'bytes'"
+        ).fetchone()[0]
+
+    def _evict(self, connection, now):
+        """Evict entries while the cache exceeds its maximum size."""
+        if self._total_size(connection) <= self.max_bytes:
+            return
+
+        evicted = connection.execute(
+            "DELETE FROM cache WHERE expires_at <= ?", (now,)
+        ).rowcount
+        total = self._total_size(connection)
+
+        if total > self.max_bytes:
+            # Evict the entries closest to expiring, down to 90% of the limit
+            excess = total - int(self.max_bytes * 0.9)
+            keys = []
+            for key, size in connection.execute(
+                "SELECT key, size FROM cache ORDER BY expires_at"
+            ):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            connection.executemany("DELETE FROM cache WHERE key = ?", keys)
+            evicted += len(keys)
+
+        with self._stats_lock:
+            self._evictions += evicted
+
+    def delete(self, key):
+        """Remove an entry from the cache.
+
+        Returns:
+            bool: True if an entry was removed.
+
+        """
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM cache WHERE key = ?", (key,)
+            )
+        return cursor.rowcount > 0
+
+    def delete_prefix(self, prefix):
+        """Remove every entry whose key starts with a prefix.
+
+        Returns:
+            int: The number of entries removed.
+
+        """
+        # A range of the primary key; no table scan
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM cache WHERE key >= ? AND key < ?",
+                (prefix, prefix + "\U0010ffff"),
+            )
+        return cursor.rowcount
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM cache")
+
+    @property
+    def stats(self):
+        """Cache statistics (dict).
+
+        Keys:
+            size: The number of entries in the cache.
+            bytes: The total size of the cached values, in bytes.
+            hits: The number of lookups answered from the cache.
+            misses: The number of lookups not answered from the cache.
+            hit_rate: The fraction of lookups answered from the cache.
+            evictions: Entries dropped because the cache was full.
+
+        """
+        connection = self._connection()
+        size = connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        total = self._total_size(connection)
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": size,
+                "bytes": total,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+
+def event_parts(event):
+    """Return the (resource, event type, data) of a webhook or Events event.
+
+    Args:
+        event(WebhookEvent, Event, dict): A webhook event, an event returned
+            by the Events API, or the JSON data of either.
+
+    Returns:
+        tuple: The resource (str), event type (str) and resource data (dict)
+        of the event.
+
+    """
+    json_data = object_json_data(event)
+    event_type = json_data.get("event") or json_data.get("type")
+    data = json_data.get("data") or {}
+    return json_data.get("resource"), event_type, object_json_data(data)
+
+
+class EntityCache(object):
+    """Cache people, rooms, teams and room memberships.
+
+    Wraps the `people.get()`, `rooms.get()`, `teams.get()` and
+    `memberships.list()` methods of a WebexAPI object, serving repeated
+    requests from size-bounded TTL caches.  Feed the webhook events (or
+    Events API events) your application receives to `invalidate()` to evict
+    exactly the entries affected by a change, so that repeat requests are
+    avoided without serving stale data.
+
+    An entry invalidated while it is being retrieved is not cached: each
+    retrieval in progress has a generation, advanced by the invalidations
+    affecting it, and the retrieved data is only cached if its generation is
+    unchanged.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        ttl=DEFAULT_CACHE_TTL,
+        maxsize=DEFAULT_CACHE_MAXSIZE,
+    ):
+        """Init a new EntityCache.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to retrieve the data.
+            ttl(int, float): The time-to-live of the cached data, in seconds.
+            maxsize(int): The maximum number of entries in each of the people,
+                rooms, teams and memberships caches.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        super(EntityCache, self).__init__()
+
+        self._api = api
+
+        self.people = TTLCache(maxsize=maxsize, ttl=ttl)
+        """The people cache; Person objects by person ID."""
+
+        self.rooms = TTLCache(maxsize=maxsize, ttl=ttl)
+        """The rooms cache; Room objects by room ID."""
+
+        self.teams = TTLCache(maxsize=maxsize, ttl=ttl)
+        """The teams cache; Team objects by team ID."""
+
+        self.memberships = TTLCache(maxsize=maxsize, ttl=ttl)
+        """The memberships cache; lists of Membership objects by query."""
+
+        self._lock = threading.Lock()
+        # [generation, count] of the retrievals in progress, by (cache, key)
+        self._retrievals = {}
+
+    def _get_or_retrieve(self, cache_name, key, retrieve):
+        """Get a cached value; or retrieve, and cache, it."""
+        cache = getattr(self, cache_name)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        retrieval_key = (cache_name, key)
+        with self._lock:
+            retrieval = self._retrievals.setdefault(retrieval_key, [0, 0])
+            retrieval[1] += 1
+            generation = retrieval[0]
+        try:
+            value = retrieve()
+        finally:
+            with self._lock:
+                retrieval[1] -= 1
+                if not retrieval[1]:
+                    del self._retrievals[retrieval_key]
+                # Don't cache data invalidated while it was being retrieved
+                if value is not None and retrieval[0] == generation:
+                    cache.set(key, value)
+        return value
+
+    def _advance_retrievals(self, cache_name, affected=None):
+        """Advance the generation of the affected retrievals in progress.
+
+        Called before evicting the affected entries; so that the data being
+        retrieved for them is not cached.
+
+        """
+        with self._lock:
+            for (name, key), retrieval in self._retrievals.items():
+                if name == cache_name and (affected is None or affected(key)):
+                    retrieval[0] += 1
+
+    def get_person(self, personId):
+        """Get a person's details, by ID; from the cache if possible."""
+        check_type(personId, str)
+        return self._get_or_retrieve(
+            "people", personId, lambda: self._api.people.get(personId)
+        )
+
+    def get_room(self, roomId):
+        """Get a room's details, by ID; from the cache if possible."""
+        check_type(roomId, str)
+        return self._get_or_retrieve(
+            "rooms", roomId, lambda: self._api.rooms.get(roomId)
+        )
+
+    def get_team(self, teamId):
+        """Get a team's details, by ID; from the cache if possible."""
+        check_type(teamId, str)
+        return self._get_or_retrieve(
+            "teams", teamId, lambda: self._api.teams.get(teamId)
+        )
+
+    def list_memberships(self, roomId=None, personId=None, personEmail=None):
+        """List room memberships; from the cache if possible.
+
+        Args:
+            roomId(str): List memberships associated with a room, by ID.
+            personId(str): List memberships associated with a person, by ID.
+            personEmail(str): List memberships associated with a person, by
+                email address.
+
+        Returns:
+            list: The Membership objects returned by the query.
+
+        """
+        check_type(roomId, str, optional=True)
+        check_type(personId, str, optional=True)
+        check_type(personEmail, str, optional=True)
+
+        memberships = self._get_or_retrieve(
+            "memberships",
+            (roomId, personId, personEmail),
+            lambda: list(
+                self._api.memberships.list(
+                    roomId=roomId,
+                    personId=personId,
+                    personEmail=personEmail,
+                )
+            ),
+        )
+        return list(memberships)
+
+    def _invalidate_memberships(self, roomId=None, personId=None, email=None):
+        """Evict the membership lists involving a room or person."""
+
+        def affected(key):
+            key_room_id, key_person_id, key_person_email = key
+            return (
+                (roomId is not None and key_room_id == roomId)
+                or (personId is not None and key_person_id == personId)
+                or (email is not None and key_person_email == email)
+                # Unfiltered lists (the caller's own rooms) may be affected
+                or key == (None, None, None)
+            )
+
+        self._advance_retrievals("memberships", affected)
+        return self.memberships.delete_where(affected)
+
+    def _invalidate_rooms(self, roomIds):
+        """Evict the rooms, and every membership list including them."""
+        roomIds = set(roomIds)
+
+        def affected(key, memberships):
+            return (
+                key[0] in roomIds
+                or key == (None, None, None)
+                # Lists by person include the person's memberships of rooms
+                or any(m.roomId in roomIds for m in memberships)
+            )
+
+        self._advance_retrievals("rooms", lambda key: key in roomIds)
+        # The rooms of the lists being retrieved are not known yet
+        self._advance_retrievals("memberships")
+        evicted = sum(self.rooms.delete(room_id) for room_id in roomIds)
+        return evicted + self.memberships.delete_where(affected, values=True)
+
+    def invalidate(self, event):
+        """Evict the cache entries affected by an event.
+
+        Args:
+            event(WebhookEvent, Event): A webhook event, or an event returned
+                by the Events API.
+
+        Returns:
+            int: The number of cache entries evicted.
+
+        """
+        resource, event_type, data = event_parts(event)
+
+        if resource == "memberships":
+            return self._invalidate_memberships(
+                roomId=data.get("roomId"),
+                personId=data.get("personId"),
+                email=data.get("personEmail"),
+            )
+
+        elif resource == "rooms":
+            room_id = data.get("id")
+            if event_type == "deleted":
+                return self._invalidate_rooms([room_id])
+            self._advance_retrievals("rooms", lambda key: key == room_id)
+            return int(self.rooms.delete(room_id))
+
+        elif resource == "teams":
+            team_id = data.get("id")
+            self._advance_retrievals("teams", lambda key: key == team_id)
+            evicted = int(self.teams.delete(team_id))
+            if event_type == "deleted":
+                # The team's rooms go with it; including any being retrieved
+                self._advance_retrievals("rooms")
+                team_rooms = set()
+
+                def in_team(room_id, room):
+                    if room.teamId == team_id:
+                        team_rooms.add(room_id)
+                        return True
+                    return False
+
+                evicted += self.rooms.delete_where(in_team, values=True)
+                evicted += self._invalidate_rooms(team_rooms)
+            return evicted
+
+        elif resource == "people":
+            person_id = data.get("id")
+            self._advance_retrievals("people", lambda key: key == person_id)
+            return int(self.people.delete(person_id))
+
+        else:
+            return 0
+
+    def clear(self):
+        """Remove all entries from the caches."""
+        for cache_name in ("people", "rooms", "teams", "memberships"):
+            self._advance_retrievals(cache_name)
+        self.people.clear()
+        self.rooms.clear()
+        self.teams.clear()
+        self.memberships.clear()
+
+    @property
+    def stats(self):
+        """Statistics (dict) for each of the caches, by cache name."""
+        return {
+            "people": self.people.stats,
+            "rooms": self.rooms.stats,
+            "teams": self.teams.stats,
+            "memberships": self.memberships.stats,
+        }
@@ -0,0 +1,360 @@
+"""Route bot messages to command handlers.
+
+Classes:
+    CommandRouter: Dispatches messages to the handler of the command they
+        invoke.
+    CommandMatch: The command invoked by a message, and its arguments.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import html
+import logging
+import re
+import shlex
+import threading
+import time
+from collections import namedtuple
+
+from .enrichment import EnrichedEvent
+from .utils import check_type
+
+
+logger = logging.getLogger(__name__)
+
+
+# Key of the handler registered at a node of the prefix trie
+_HANDLER = object()
+
+_MENTION_PATTERN = re.compile(
+    r"<spark-mention[^>]*>(.*?)</spark-mention>", re.IGNORECASE | re.DOTALL
+)
+_GROUP_NAME_PATTERN = re.compile(r"\(\?P([<=])(\w+)")
+_CONDITION_NAME_PATTERN = re.compile(r"\(\?\(([^\W\d]\w*)\)")
+
+# Numbered group references (backreferences and conditional groups), which
+# would refer to other groups once a pattern is combined with others;
+# other escapes (including octal escapes) and character classes are skipped
+_NUMBERED_REFERENCE_PATTERN = re.compile(
+    r"\\(?:[1-7][0-7]{2}|0[0-7]{0,2})"
+    r"|\\(?P<backreference>[1-9])"
+    r"|\\."
+    r"|\[\^?\]?(?:\\.|[^\]\\])*\]"
+    r"|\(\?\((?P<condition>\d)",
+    re.DOTALL,
+)
+
+
+CommandMatch = namedtuple(
+    "CommandMatch", ["command", "text", "args", "groups"]
+)
+CommandMatch.__doc__ = """The command invoked by a message.
+
+Attributes:
+    command(str): The command (prefix or regular expression) that matched.
+    text(str): The text of the message, without leading mentions.
+    args(list): The arguments following a prefix command, split like a
+        shell command line.  Empty for regular expression commands.
+    groups(dict): The named groups matched by a regular expression
+        command.  Empty for prefix commands.
+"""
+
+
+def _words(text):
+    return text.lower().split()
+
+
+def _check_combinable(command):
+    """Check that a regular expression can be combined with others.
+
+    Raises:
+        ValueError: If the regular expression has numbered group references,
+            or can only be compiled on its own (for example, because of a
+            global inline flag such as `(?i)`).
+
+    """
+    for token in _NUMBERED_REFERENCE_PATTERN.finditer(command):
+        if token.group("backreference") or token.group("condition"):
+            raise ValueError(
+                "Command regular expressions may not use numbered group "
+                "references; use a named group, and (?P=name), instead."
+            )
+    try:
+        re.compile("(?!)|(?P<_>{})".format(command))
+    except re.error as e:
+        raise ValueError(
+            "The command regular expression cannot be combined with others "
+            "({}); use scoped inline flags, such as (?i:...), instead of "
+            "global ones.".format(e)
+        ) from None
+
+
+class CommandRouter(object):
+    """Dispatch bot messages to the handlers of the commands they invoke.
+
+    Commands are either prefixes (one or more words, matched
+    case-insensitively; the longest matching prefix wins) or regular
+    expressions (matched against the whole text, in registration order).
+    Prefixes are stored in a trie of words and all of the regular
+    expressions are compiled into a single alternation; so the cost of
+    routing a message does not grow with the number of commands.
+
+    Mentions of the bot (which lead the text of messages sent in group
+    rooms) are stripped before matching.  Handlers are called with the
+    Message and a CommandMatch; the time spent in each command's handler is
+    recorded in `stats`.
+
+    """
+
+    def __init__(self, names=None, default=None, api=None):
+        """Init a new CommandRouter.
+
+        Args:
+            names(list): Additional names (for example, the bot's display
+                name) to strip from the start of messages.  Mentions
+                found in a message's HTML are always stripped.
+            default(callable): The handler called, with the Message and a
+                CommandMatch, for messages that match no command.
+            api(WebexAPI): Used to retrieve the messages of webhook events
+                routed with `route()`.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(names, (list, tuple), optional=True)
+
+        super(CommandRouter, self).__init__()
+
+        self.names = [name.lower() for name in names or ()]
+        self.default = default
+        self._api = api
+
+        self._trie = {}
+        self._patterns = []
+        self._combined = None
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def command(self, command, handler=None, regex=False):
+        """Register a command handler.
+
+        May be used as a decorator:
+
+            @router.command("status")
+            def status(message, match):
+                ...
+
+        Args:
+            command(str): The command prefix (one or more words), or a
+                regular expression when `regex` is True.
+            handler(callable): Called with the Message and a CommandMatch.
+            regex(bool): Whether `command` is a regular expression.
+
+        Returns:
+            callable: The handler (or, if no handler is provided, a
+            decorator registering the function it decorates).
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If the command is empty, or the regular expression
+                uses numbered group references or global inline flags
+                (which cannot be combined with the other commands).
+            re.error: If the regular expression is invalid.
+
+        """
+        check_type(command, str)
+        check_type(regex, bool)
+
+        if handler is None:
+            return lambda function: self.command(command, function, regex)
+
+        if regex:
+            pattern = re.compile(command, re.IGNORECASE | re.DOTALL)
+            _check_combinable(command)
+            with self._lock:
+                self._patterns.append((command, pattern, handler))
+                self._combined = None
+        else:
+            words = _words(command)
+            if not words:
+                raise ValueError("The command must not be empty.")
+            node = self._trie
+            for word in words:
+                node = node.setdefault(word, {})
+            node[_HANDLER] = (command, handler)
+        return handler
+
+    def _compile(self):
+        """Compile the regular expression commands into one alternation."""
+        with self._lock:
+            if self._combined is None:
+                alternatives = []
+                for number, (_, pattern, _) in enumerate(self._patterns):
+                    # Named groups must be unique across the alternation
+                    source = _GROUP_NAME_PATTERN.sub(
+                        r"(?P\1_{}_\2".format(number), pattern.pattern
+                    )
+                    source = _CONDITION_NAME_PATTERN.sub(
+                        r"(?(_{}_\1)".format(number), source
+                    )
+                    alternatives.append("(?P<_{}>{})".format(number, source))
+                self._combined = re.compile(
+                    "|".join(alternatives) or "(?!)",
+                    re.IGNORECASE | re.DOTALL,
+                )
+            return self._combined
+
+    def strip_mentions(self, message):
+        """Return a message's text, without leading mentions of people."""
+        text = (message.text or "").strip()
+        mentions = [
+            html.unescape(re.sub("<[^>]+>", "", mention)).strip().lower()
+            for mention in _MENTION_PATTERN.findall(message.html or "")
+        ]
+        names = sorted(
+            set(filter(None, mentions + self.names)), key=len, reverse=True
+        )
+        stripped = True
+        while stripped:
+            stripped = False
+            for name in names:
+                following = text[len(name) : len(name) + 1]
+                if text.lower().startswith(name) and not following.isalnum():
+                    text = text[len(name) :].lstrip(" \t,:")
+                    stripped = True
+                    break
+        return text.strip()
+
+    def match(self, message):
+        """Find the command invoked by a message.
+
+        Returns:
+            tuple: The handler and the CommandMatch; or (None, None) if the
+            message matches no command.
+
+        """
+        text = self.strip_mentions(message)
+
+        # The longest matching prefix
+        words = text.split()
+        node, found, consumed = self._trie, None, 0
+        for index, word in enumerate(words):
+            node = node.get(word.lower())
+            if node is None:
+                break
+            if _HANDLER in node:
+                found, consumed = node[_HANDLER], index + 1
+        if found is not None:
+            command, handler = found
+            rest = text.split(None, consumed)[consumed:]
+            rest = rest[0] if rest else ""
+            try:
+                args = shlex.split(rest)
+            except ValueError:
+                args = rest.split()
+            return handler, CommandMatch(command, text, args, {})
+
+        match = self._compile().fullmatch(text)
+        if match is not None:
+            number = int(match.lastgroup[1:])
+            command, pattern, handler = self._patterns[number]
+            groups = pattern.fullmatch(text).groupdict()
+            return handler, CommandMatch(command, text, [], groups)
+
+        return None, None
+
+    def _message(self, message):
+        """Return the Message of a message, webhook event or enriched event.
+
+        Returns None for events that carry no message.
+
+        """
+        if isinstance(message, EnrichedEvent):
+            return message.message
+        resource = getattr(message, "resource", None)
+        if resource == "messages":
+            # A WebhookEvent; which only carries the message's ID
+            if self._api is None:
+                raise ValueError(
+                    "An `api` is required to route webhook events."
+                )
+            return self._api.messages.get(message.data.id)
+        if resource is not None:
+            # A WebhookEvent for another resource
+            return None
+        return message
+
+    def route(self, message):
+        """Dispatch a message to the handler of the command it invokes.
+
+        Args:
+            message(Message, WebhookEvent, EnrichedEvent): The message; or a
+                `messages` webhook event, whose message is retrieved first.
+
+        Returns:
+            The value returned by the handler; or None if the message
+            matches no command (and there is no default handler), or if an
+            event carries no message (for example, an EnrichedEvent whose
+            message could not be retrieved).
+
+        """
+        message = self._message(message)
+        if message is None:
+            return None
+        handler, match = self.match(message)
+        if handler is None:
+            if self.default is None:
+                return None
+            handler = self.default
+            match = CommandMatch(None, self.strip_mentions(message), [], {})
+
+        started = time.monotonic()
+        try:
+            return handler(message, match)
+        finally:
+            self._record(match.command, time.monotonic() - started)
+
+    def _record(self, command, elapsed):
+        with self._lock:
+            stats = self._stats.setdefault(
+                command, {"calls": 0, "total_time": 0.0, "max_time": 0.0}
+            )
+            stats["calls"] += 1
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+
+    @property
+    def stats(self):
+        """Dispatch statistics (dict), by command.
+
+        For each command: the number of `calls`, and the `total_time`,
+        `mean_time` and `max_time` (in seconds) spent in its handler.
+        Messages routed to the default handler are recorded under None.
+
+        """
+        with self._lock:
+            return {
+                command: dict(
+                    stats, mean_time=stats["total_time"] / stats["calls"]
+                )
+                for command, stats in self._stats.items()
+            }
@@ -28,6 +28,10 @@ DEFAULT_SINGLE_REQUEST_TIMEOUT = 60
 
 DEFAULT_WAIT_ON_RATE_LIMIT = True
 
+DEFAULT_MAX_WORKERS = 10
+
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 ACCESS_TOKEN_ENVIRONMENT_VARIABLE = "WEBEX_ACCESS_TOKEN"
 
 LEGACY_ACCESS_TOKEN_ENVIRONMENT_VARIABLES = [
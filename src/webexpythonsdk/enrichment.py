@@ -0,0 +1,203 @@
+"""Resolve the resources referenced by webhook events.
+
+Classes:
+    WebhookEnricher: Drops duplicate webhook deliveries and fetches the
+        resources referenced by each webhook event concurrently.
+    EnrichedEvent: A webhook event with its referenced resources.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import EntityCache, event_parts
+from .config import DEFAULT_MAX_WORKERS
+from .utils import BoundedSet, check_type, object_json_data
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DEDUP_SIZE = 100000
+
+
+EnrichedEvent = namedtuple(
+    "EnrichedEvent",
+    ["event", "message", "attachment_action", "person", "room"],
+)
+EnrichedEvent.__doc__ = """A webhook event with its referenced resources.
+
+Attributes:
+    event(WebhookEvent): The webhook event.
+    message(Message): The message created or updated; for `messages` events.
+    attachment_action(AttachmentAction): The action submitted; for
+        `attachmentActions` events.
+    person(Person): The person referenced by the event's `data.personId`.
+    room(Room): The room referenced by the event's `data.roomId`.
+
+Attributes that do not apply to the event are None.
+"""
+
+
+def delivery_key(webhook_event):
+    """Return a key identifying a webhook delivery, including its retries.
+
+    Webex retries a delivery with the same body; so the webhook ID, the
+    event and the ID and creation time of the resource identify it.
+
+    """
+    json_data = object_json_data(webhook_event)
+    resource, event_type, data = event_parts(json_data)
+    return (
+        json_data.get("id"),
+        resource,
+        event_type,
+        data.get("id"),
+        data.get("created"),
+    )
+
+
+class WebhookEnricher(object):
+    """Resolve the resources referenced by webhook events.
+
+    A webhook event only carries the IDs of the resources involved, so
+    handlers typically retrieve the message (or attachment action), the
+    person and the room one after another.  The enricher retrieves them all
+    concurrently, so an event is resolved in a single round trip; people and
+    rooms are retrieved through a (shared) EntityCache, and duplicate
+    deliveries of an event are dropped before anything is retrieved.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        cache=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+        dedup_size=DEFAULT_DEDUP_SIZE,
+    ):
+        """Init a new WebhookEnricher.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to retrieve resources.
+            cache(EntityCache): The cache used to retrieve people and rooms.
+                Defaults to a new EntityCache, private to the enricher.
+            max_workers(int): The maximum number of concurrent requests.
+            dedup_size(int): The number of recent deliveries remembered to
+                detect duplicates.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(cache, EntityCache, optional=True)
+        check_type(max_workers, int)
+        check_type(dedup_size, int)
+
+        super(WebhookEnricher, self).__init__()
+
+        self._api = api
+        self.cache = cache if cache is not None else EntityCache(api)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._seen = BoundedSet(dedup_size)
+        self.duplicates = 0
+        """The number of duplicate deliveries dropped."""
+
+    def _fetchers(self, webhook_event):
+        """The functions retrieving the resources an event references."""
+        resource, event_type, data = event_parts(webhook_event)
+        fetchers = {}
+        if data.get("id") and event_type != "deleted":
+            if resource == "messages":
+                fetchers["message"] = (self._api.messages.get, data["id"])
+            elif resource == "attachmentActions":
+                fetchers["attachment_action"] = (
+                    self._api.attachment_actions.get,
+                    data["id"],
+                )
+        if data.get("personId"):
+            fetchers["person"] = (self.cache.get_person, data["personId"])
+        if data.get("roomId"):
+            fetchers["room"] = (self.cache.get_room, data["roomId"])
+        return fetchers
+
+    def enrich(self, webhook_event):
+        """Retrieve the resources referenced by a webhook event.
+
+        Args:
+            webhook_event(WebhookEvent): The webhook event.
+
+        Returns:
+            EnrichedEvent: The event with its referenced resources; or None
+            if the event is a duplicate of an event already enriched.
+
+        Raises:
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        key = delivery_key(webhook_event)
+        if not self._seen.add(key):
+            self.duplicates += 1
+            logger.debug("Dropped a duplicate delivery: {}".format(key))
+            return None
+
+        futures = {
+            name: self._executor.submit(function, argument)
+            for name, (function, argument) in self._fetchers(
+                webhook_event
+            ).items()
+        }
+        try:
+            resources = {name: f.result() for name, f in futures.items()}
+        except Exception:
+            # Let a redelivery of the event be enriched
+            self._seen.discard(key)
+            raise
+
+        return EnrichedEvent(
+            event=webhook_event,
+            message=resources.get("message"),
+            attachment_action=resources.get("attachment_action"),
+            person=resources.get("person"),
+            room=resources.get("room"),
+        )
+
+    def handler(self, handler):
+        """Wrap a handler to receive enriched events.
+
+        The returned function may be registered with a WebhookReceiver (or
+        called directly with webhook events); it enriches each event and
+        calls `handler` with the EnrichedEvent, skipping duplicates.
+
+        """
+
+        def enriched_handler(webhook_event):
+            enriched_event = self.enrich(webhook_event)
+            if enriched_event is not None:
+                return handler(enriched_event)
+
+        return enriched_handler
+
+    def close(self):
+        """Shut down the enricher's worker threads."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,320 @@
+"""Change-data-capture consumer for the Webex Events API.
+
+Classes:
+    EventsConsumer: Polls the Events API and delivers each new event, once,
+        to registered handlers.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from .api.events import EventPoller
+from .utils import (
+    check_type,
+    object_json_data,
+    WebexDateTime,
+    ZuluTimeZone,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POLL_OVERLAP = 60
+
+DEFAULT_MIN_POLL_INTERVAL = 5
+
+DEFAULT_MAX_POLL_INTERVAL = 120
+
+DEFAULT_DEDUP_SIZE = 100000
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class EventsConsumer(object):
+    """Poll the Events API and deliver new events to registered handlers.
+
+    A change-data-capture alternative to webhooks, built on the polling
+    engine of `EventsAPI.stream()` (see EventPoller).  Each poll requests the
+    events that occurred since the consumer's watermark (the creation time of
+    the latest event delivered), less an overlap window, so that events that
+    become visible late are not missed.  The events re-returned by the
+    overlapping windows are dropped by ID, using a bounded set of recently
+    delivered event IDs.
+
+    New events are delivered, in chronological order and in batches, to the
+    handlers registered for their resource and type.  The watermark is only
+    advanced, and persisted, after the handlers have accepted a batch.  The
+    IDs of the delivered events that fall within the overlap window are
+    persisted with it, so that a restarted consumer does not redeliver them.
+
+    The polling interval adapts to the traffic: it is reset to
+    `min_interval` when a poll returns new events, and doubled (up to
+    `max_interval`) when it does not.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        watermark_path=None,
+        resource=None,
+        start=None,
+        overlap=DEFAULT_POLL_OVERLAP,
+        min_interval=DEFAULT_MIN_POLL_INTERVAL,
+        max_interval=DEFAULT_MAX_POLL_INTERVAL,
+        batch_size=DEFAULT_BATCH_SIZE,
+        dedup_size=DEFAULT_DEDUP_SIZE,
+    ):
+        """Init a new EventsConsumer.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to list the events.
+            watermark_path(str): The path of the file where the watermark
+                (and the IDs of the latest events delivered) is persisted.
+                The watermark is only kept in memory if this is not
+                provided.
+            resource(str): Only consume events for this resource type.
+            start(str): The date and time to start consuming events from,
+                when no watermark has been persisted, in ISO8601 format
+                (yyyy-MM-dd'T'HH:mm:ss.SSSZ).  Defaults to now.
+            overlap(int, float): The overlap between consecutive polling
+                windows, in seconds.
+            min_interval(int, float): The minimum polling interval, in
+                seconds.
+            max_interval(int, float): The maximum polling interval, in
+                seconds.
+            batch_size(int): The maximum number of events delivered to a
+                handler per call.
+            dedup_size(int): The number of recently delivered event IDs
+                remembered to drop duplicates.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(watermark_path, str, optional=True)
+        check_type(resource, str, optional=True)
+        check_type(start, str, optional=True)
+        check_type(overlap, (int, float))
+        check_type(min_interval, (int, float))
+        check_type(max_interval, (int, float))
+        check_type(batch_size, int)
+        check_type(dedup_size, int)
+
+        super(EventsConsumer, self).__init__()
+
+        self._api = api
+        self.watermark_path = watermark_path
+        self.resource = resource
+        self.batch_size = batch_size
+
+        watermark, recent = self._load_watermark()
+        self._poller = EventPoller(
+            api.events,
+            {"resource": resource},
+            start=None if watermark else start,
+            watermark=watermark,
+            overlap=overlap,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            dedup_size=dedup_size,
+        )
+        # The (created, id) of the delivered events within the overlap
+        self._recent = deque(recent)
+        for _, event_id in recent:
+            self._poller.seen.add(event_id)
+        self._handlers = []
+        self._stop = threading.Event()
+
+        self._started = time.monotonic()
+        self._polls = 0
+        self._delivered = 0
+        self._duplicates = 0
+        self._last_lag = None
+        self._max_lag = None
+
+    @property
+    def watermark(self):
+        """The creation time of the latest event delivered (str)."""
+        return self._poller.watermark
+
+    @property
+    def interval(self):
+        """The current polling interval, in seconds."""
+        return self._poller.interval
+
+    def _load_watermark(self):
+        if self.watermark_path and os.path.exists(self.watermark_path):
+            with open(self.watermark_path) as watermark_file:
+                state = json.load(watermark_file)
+            recent = [tuple(item) for item in state.get("recent", [])]
+            return state.get("watermark"), recent
+        return None, []
+
+    def _save_watermark(self):
+        # Only events within the overlap window can be polled again
+        window_start = str(
+            WebexDateTime.strptime(self.watermark)
+            - timedelta(seconds=self._poller.overlap)
+        )
+        while self._recent and self._recent[0][0] < window_start:
+            self._recent.popleft()
+
+        if self.watermark_path:
+            temp_path = self.watermark_path + ".tmp"
+            with open(temp_path, "w") as watermark_file:
+                json.dump(
+                    {
+                        "watermark": self.watermark,
+                        "recent": list(self._recent),
+                    },
+                    watermark_file,
+                )
+                watermark_file.flush()
+                os.fsync(watermark_file.fileno())
+            os.replace(temp_path, self.watermark_path)
+
+    def register(self, handler, resource=None, type=None):
+        """Register a handler for batches of events.
+
+        Args:
+            handler(callable): Called with a list of Event objects, oldest
+                first.  If a handler raises an exception, the batch (and the
+                rest of the poll) is redelivered on the next poll; so
+                handlers should be idempotent.
+            resource(str): Only deliver events for this resource type.
+            type(str): Only deliver events of this type ("created",
+                "updated" or "deleted").
+
+        Returns:
+            callable: The handler.
+
+        """
+        check_type(resource, str, optional=True)
+        check_type(type, str, optional=True)
+
+        self._handlers.append((handler, resource, type))
+        return handler
+
+    def poll_once(self):
+        """Poll the Events API once and deliver the new events.
+
+        Returns:
+            int: The number of new events delivered.
+
+        Raises:
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        self._polls += 1
+        events = self._poller.fetch()
+        new_events = self._poller.new_events(events)
+        self._duplicates += len(events) - len(new_events)
+
+        for start in range(0, len(new_events), self.batch_size):
+            batch = new_events[start : start + self.batch_size]
+            self._deliver(batch)
+
+            self._poller.accept(batch)
+            for event in batch:
+                created = object_json_data(event).get("created")
+                if created:
+                    self._recent.append((created, event.id))
+            self._save_watermark()
+
+            self._delivered += len(batch)
+            now = WebexDateTime.now(ZuluTimeZone())
+            lags = [
+                (now - e.created).total_seconds() for e in batch if e.created
+            ]
+            if lags:
+                self._last_lag = lags[-1]
+                self._max_lag = max([self._max_lag or 0.0] + lags)
+
+        self._poller.adapt(new_events)
+        return len(new_events)
+
+    def _deliver(self, batch):
+        for handler, resource, event_type in self._handlers:
+            events = [
+                event
+                for event in batch
+                if (resource is None or event.resource == resource)
+                and (event_type is None or event.type == event_type)
+            ]
+            if events:
+                handler(events)
+
+    def run(self):
+        """Poll the Events API, and deliver events, until `stop()` is called.
+
+        Errors raised while polling, or by the handlers, are logged and the
+        poll is retried after the polling interval.
+
+        """
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Error consuming events; will retry.")
+                self._poller.adapt([])
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        """Stop a running consumer (after its current poll)."""
+        self._stop.set()
+
+    @property
+    def metrics(self):
+        """Consumer metrics (dict).
+
+        Keys:
+            polls: The number of polls made.
+            delivered: The number of events delivered.
+            duplicates: The number of duplicate events dropped.
+            throughput: The mean number of events delivered per second.
+            last_lag: The end-to-end lag, in seconds, between the creation
+                and the delivery of the latest event delivered.
+            max_lag: The maximum end-to-end lag, in seconds.
+            interval: The current polling interval, in seconds.
+            watermark: The current watermark.
+
+        """
+        elapsed = time.monotonic() - self._started
+        return {
+            "polls": self._polls,
+            "delivered": self._delivered,
+            "duplicates": self._duplicates,
+            "throughput": self._delivered / elapsed if elapsed else 0.0,
+            "last_lag": self._last_lag,
+            "max_lag": self._max_lag,
+            "interval": self.interval,
+            "watermark": self.watermark,
+        }
@@ -0,0 +1,242 @@
+"""Streaming newline-delimited JSON (NDJSON) export.
+
+Classes:
+    NDJSONWriter: Writes JSON records, one per line, to a file-like sink or to
+        a series of size-rotated files.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import gzip
+import json
+import os
+
+from .utils import check_type, to_bytes
+
+
+FSYNC_POLICIES = ("never", "rotate", "checkpoint")
+
+
+class NDJSONWriter(object):
+    """Write JSON records to a newline-delimited JSON (NDJSON) sink.
+
+    Records are written as they are received; nothing is buffered beyond the
+    underlying file buffers, so memory use stays constant no matter how many
+    records are written.
+
+    The sink may be either a path or a writable binary file-like object.
+    When a path is provided, the writer can optionally rotate to a new file
+    once the current file reaches `max_bytes`.  Rotated file names are built
+    from the path; if the path contains a `{part}` format field, it is
+    formatted with the (zero-based) part number, otherwise the part number is
+    inserted before the file extension (`messages.ndjson` ->
+    `messages.00001.ndjson`).
+
+    """
+
+    def __init__(
+        self,
+        sink,
+        compress=False,
+        max_bytes=None,
+        checkpoint_every=None,
+        fsync="never",
+    ):
+        """Init a new NDJSONWriter.
+
+        Args:
+            sink(str, file): A file path, or a writable binary file-like
+                object, where the records should be written.  File-like
+                objects are not closed by the writer.
+            compress(bool): Gzip-compress the output.
+            max_bytes(int): Rotate to a new file when writing a record would
+                grow the current file past this many (uncompressed) bytes.
+                Requires `sink` to be a path.
+            checkpoint_every(int): Flush the output every `checkpoint_every`
+                records.  Compressed output is sync-flushed, so everything
+                written before a checkpoint can be read back even if the
+                process dies before the writer is closed.
+            fsync(str): When to `os.fsync()` the output file; one of "never",
+                "rotate" (when a file is completed) or "checkpoint" (at every
+                checkpoint and when a file is completed).
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `max_bytes` is provided for a file-like sink, or if
+                `fsync` is not a supported policy.
+
+        """
+        check_type(compress, bool)
+        check_type(max_bytes, int, optional=True)
+        check_type(checkpoint_every, int, optional=True)
+        check_type(fsync, str)
+
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                "`fsync` must be one of: {}".format(", ".join(FSYNC_POLICIES))
+            )
+
+        if max_bytes is not None and not isinstance(sink, str):
+            raise ValueError(
+                "File rotation (`max_bytes`) requires `sink` to be a path."
+            )
+
+        super(NDJSONWriter, self).__init__()
+
+        self._sink = sink
+        self._compress = compress
+        self._max_bytes = max_bytes
+        self._checkpoint_every = checkpoint_every
+        self._fsync = fsync
+
+        self._part = 0
+        self._raw_file = None
+        self._file = None
+        self._file_bytes = 0
+        self._since_checkpoint = 0
+
+        self.records = 0
+        """The total number of records written."""
+
+        self.bytes_written = 0
+        """The total number of (uncompressed) bytes written."""
+
+        self.paths = []
+        """The paths of the files written, when `sink` is a path."""
+
+        self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _part_path(self, part):
+        """Build the file path for a rotated file part."""
+        if "{part" in self._sink:
+            return self._sink.format(part=part)
+
+        if self._max_bytes is None:
+            return self._sink
+
+        root, ext = os.path.splitext(self._sink)
+        if ext == ".gz":
+            root, inner_ext = os.path.splitext(root)
+            ext = inner_ext + ext
+        return "{}.{:05d}{}".format(root, part, ext)
+
+    def _open(self):
+        """Open the current output file."""
+        if isinstance(self._sink, str):
+            path = self._part_path(self._part)
+            self._raw_file = open(path, "wb")
+            self.paths.append(path)
+        else:
+            self._raw_file = self._sink
+
+        if self._compress:
+            self._file = gzip.GzipFile(fileobj=self._raw_file, mode="wb")
+        else:
+            self._file = self._raw_file
+
+        self._file_bytes = 0
+
+    def _sync_raw_file(self, sync):
+        """Flush the underlying file, optionally fsync-ing it to disk."""
+        self._raw_file.flush()
+
+        if sync:
+            try:
+                os.fsync(self._raw_file.fileno())
+            except (AttributeError, OSError, ValueError):
+                # Not every file-like object is backed by a file descriptor
+                pass
+
+    def _close_file(self):
+        """Complete and close the current output file."""
+        if self._compress:
+            # Writes the gzip trailer; leaves the underlying file open
+            self._file.close()
+        self._sync_raw_file(sync=self._fsync != "never")
+        if isinstance(self._sink, str):
+            self._raw_file.close()
+
+    def checkpoint(self):
+        """Flush everything written so far to the sink."""
+        if self._compress:
+            self._file.flush(zlib_mode=gzip.zlib.Z_SYNC_FLUSH)
+        self._sync_raw_file(sync=self._fsync == "checkpoint")
+        self._since_checkpoint = 0
+
+    def write(self, record):
+        """Write a single, already JSON-encoded, record.
+
+        Args:
+            record(str, bytes): A JSON-encoded record.  It must not contain
+                line breaks.
+
+        """
+        line = to_bytes(record) + b"\n"
+
+        if (
+            self._max_bytes is not None
+            and self._file_bytes
+            and self._file_bytes + len(line) > self._max_bytes
+        ):
+            self._close_file()
+            self._part += 1
+            self._open()
+
+        self._file.write(line)
+        self._file_bytes += len(line)
+        self.bytes_written += len(line)
+        self.records += 1
+
+        if self._checkpoint_every:
+            self._since_checkpoint += 1
+            if self._since_checkpoint >= self._checkpoint_every:
+                self.checkpoint()
+
+    def write_item(self, item):
+        """Encode and write a single record.
+
+        Args:
+            item: A dictionary, a data object with a `to_dict()` method (like
+                the ImmutableData models), or an object whose attributes
+                should be encoded (like the SimpleDataModel objects).
+
+        """
+        if isinstance(item, dict):
+            data = item
+        elif hasattr(item, "to_dict"):
+            data = item.to_dict()
+        else:
+            data = vars(item)
+
+        self.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+    def close(self):
+        """Flush and close the output."""
+        if self._file is not None:
+            self._close_file()
+            self._file = None
+            self._raw_file = None
@@ -33,6 +33,8 @@ import inspect
 from itertools import islice
 import sys
 
+from .export import NDJSONWriter
+
 
 class GeneratorContainer(object):
     """Store a generator function call, making it for safe reuse.
@@ -126,6 +128,35 @@ class GeneratorContainer(object):
                 "Indexing is not supported."
             )
 
+    def export(self, sink):
+        """Write the items yielded by the container to a NDJSON sink.
+
+        Items are written one at a time as they are yielded, so memory use
+        stays constant no matter how many items are exported.  To skip
+        building data objects entirely, use `RestSession.export_items()`,
+        which writes the raw JSON of the items straight from the responses.
+
+        Args:
+            sink(NDJSONWriter, file): An NDJSONWriter, or a writable binary
+                file-like object, to which the items will be written.
+
+        Returns:
+            int: The number of items written.
+
+        """
+        writer = sink if isinstance(sink, NDJSONWriter) else NDJSONWriter(sink)
+
+        count = 0
+        try:
+            for item in self:
+                writer.write_item(item)
+                count += 1
+        finally:
+            if writer is not sink:
+                writer.close()
+
+        return count
+
 
 def generator_container(generator_function):
     """Function Decorator: Containerize calls to a generator function.
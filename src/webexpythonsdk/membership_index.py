@@ -0,0 +1,301 @@
+"""In-memory index of Webex room memberships.
+
+Classes:
+    MembershipIndex: Two-way index of room memberships (the rooms of each
+        person and the members of each room), maintained incrementally from
+        membership events.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import event_parts
+from .config import DEFAULT_MAX_WORKERS
+from .utils import (
+    check_type,
+    object_json_data,
+    WebexDateTime,
+    ZuluTimeZone,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_VERSION = 1
+
+
+class MembershipIndex(object):
+    """Two-way, in-memory index of room memberships.
+
+    The index answers "which rooms is this person in" and "who is in this
+    room" with dictionary lookups, instead of paginated `memberships.list()`
+    queries.  It is built once, listing the memberships of the rooms
+    concurrently, and then kept current by applying membership webhook
+    events or Events API events.  Snapshots of the index may be saved and
+    restored, so that an application restart does not need to re-crawl all
+    of the memberships.
+
+    The index is thread-safe.  The person and room sets it returns are
+    immutable copies.
+
+    """
+
+    def __init__(self, api):
+        """Init a new, empty, MembershipIndex.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to build the index.
+
+        """
+        super(MembershipIndex, self).__init__()
+
+        self._api = api
+        self._lock = threading.Lock()
+        self._members_by_room = {}
+        self._rooms_by_person = {}
+        self._last_event_time = None
+
+    @property
+    def last_event_time(self):
+        """The creation time (str) of the latest event that was applied."""
+        return self._last_event_time
+
+    def __len__(self):
+        """The number of memberships in the index."""
+        with self._lock:
+            return sum(len(m) for m in self._members_by_room.values())
+
+    def rooms_of(self, personId):
+        """The IDs (frozenset) of the rooms a person is a member of."""
+        with self._lock:
+            return frozenset(self._rooms_by_person.get(personId, ()))
+
+    def members_of(self, roomId):
+        """The person IDs (frozenset) of the members of a room."""
+        with self._lock:
+            return frozenset(self._members_by_room.get(roomId, ()))
+
+    def is_member(self, personId, roomId):
+        """Whether a person is a member of a room (bool)."""
+        with self._lock:
+            return personId in self._members_by_room.get(roomId, ())
+
+    def _add(self, roomId, personId):
+        self._members_by_room.setdefault(roomId, set()).add(personId)
+        self._rooms_by_person.setdefault(personId, set()).add(roomId)
+
+    def _remove(self, roomId, personId):
+        members = self._members_by_room.get(roomId)
+        if members is not None:
+            members.discard(personId)
+            if not members:
+                del self._members_by_room[roomId]
+
+        rooms = self._rooms_by_person.get(personId)
+        if rooms is not None:
+            rooms.discard(roomId)
+            if not rooms:
+                del self._rooms_by_person[personId]
+
+    def _remove_room(self, roomId):
+        for personId in self._members_by_room.pop(roomId, ()):
+            rooms = self._rooms_by_person.get(personId)
+            if rooms is not None:
+                rooms.discard(roomId)
+                if not rooms:
+                    del self._rooms_by_person[personId]
+
+    def build(self, roomIds=None, max_workers=DEFAULT_MAX_WORKERS):
+        """Build the index, replacing its contents.
+
+        The memberships of the rooms are listed concurrently, one
+        `memberships.list()` query per room.  The time the build started is
+        recorded as the `last_event_time`, so that `sync()` can later catch
+        up on the changes made during and after the build.
+
+        Args:
+            roomIds(list): The IDs of the rooms to be indexed.  Defaults to
+                all of the rooms returned by `rooms.list()`.
+            max_workers(int): The maximum number of concurrent requests.
+
+        Returns:
+            int: The number of memberships indexed.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        check_type(roomIds, (list, tuple, set, frozenset), optional=True)
+        check_type(max_workers, int)
+
+        started = str(WebexDateTime.now(ZuluTimeZone()))
+
+        if roomIds is None:
+            roomIds = [room.id for room in self._api.rooms.list()]
+
+        def list_members(roomId):
+            return roomId, [
+                membership.personId
+                for membership in self._api.memberships.list(roomId=roomId)
+            ]
+
+        members_by_room = {}
+        rooms_by_person = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for roomId, people in executor.map(list_members, roomIds):
+                members_by_room[roomId] = set(people)
+                for personId in people:
+                    rooms_by_person.setdefault(personId, set()).add(roomId)
+
+        with self._lock:
+            self._members_by_room = members_by_room
+            self._rooms_by_person = rooms_by_person
+            self._last_event_time = started
+
+        logger.debug(
+            "Indexed the memberships of {} rooms.".format(len(members_by_room))
+        )
+        return len(self)
+
+    def apply(self, event):
+        """Apply a membership or room event to the index.
+
+        Args:
+            event(WebhookEvent, Event): A webhook event, or an event returned
+                by the Events API.
+
+        Returns:
+            bool: True if the event changed the index.
+
+        """
+        resource, event_type, data = event_parts(event)
+        created = object_json_data(event).get("created")
+
+        with self._lock:
+            if created and (
+                self._last_event_time is None
+                or created > self._last_event_time
+            ):
+                self._last_event_time = created
+
+            if resource == "memberships":
+                roomId = data.get("roomId")
+                personId = data.get("personId")
+                if not roomId or not personId:
+                    return False
+                is_member = personId in self._members_by_room.get(roomId, ())
+                if event_type == "created" and not is_member:
+                    self._add(roomId, personId)
+                    return True
+                elif event_type == "deleted" and is_member:
+                    self._remove(roomId, personId)
+                    return True
+
+            elif resource == "rooms" and event_type == "deleted":
+                if data.get("id") in self._members_by_room:
+                    self._remove_room(data["id"])
+                    return True
+
+        return False
+
+    def apply_events(self, events):
+        """Apply events, in chronological order, to the index.
+
+        Args:
+            events(iterable): Webhook events or Events API events.
+
+        Returns:
+            int: The number of events that changed the index.
+
+        """
+        events = sorted(
+            events, key=lambda e: object_json_data(e).get("created") or ""
+        )
+        return sum(self.apply(event) for event in events)
+
+    def sync(self):
+        """Apply the membership events that occurred since the last event.
+
+        Requires the index to have been built, or to have applied at least
+        one event (see `last_event_time`), and an access token that may read
+        the organization's events (compliance officer).
+
+        Returns:
+            int: The number of events that changed the index.
+
+        Raises:
+            ValueError: If the index has not been built, or has not applied
+                any events, yet.
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        if self._last_event_time is None:
+            raise ValueError(
+                "The index has not been built, or applied any events, yet."
+            )
+
+        return self.apply_events(
+            self._api.events.list(
+                resource="memberships", _from=self._last_event_time
+            )
+        )
+
+    def snapshot(self, fp):
+        """Save a JSON snapshot of the index to a text file-like object."""
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "lastEventTime": self._last_event_time,
+                "rooms": {
+                    roomId: sorted(members)
+                    for roomId, members in self._members_by_room.items()
+                },
+            }
+        json.dump(data, fp, separators=(",", ":"))
+
+    def restore(self, fp):
+        """Restore the index from a snapshot, replacing its contents.
+
+        Raises:
+            ValueError: If the snapshot is not in the expected format.
+
+        """
+        data = json.load(fp)
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported membership index snapshot.")
+
+        members_by_room = {}
+        rooms_by_person = {}
+        for roomId, people in data["rooms"].items():
+            members_by_room[roomId] = set(people)
+            for personId in people:
+                rooms_by_person.setdefault(personId, set()).add(roomId)
+
+        with self._lock:
+            self._members_by_room = members_by_room
+            self._rooms_by_person = rooms_by_person
+            self._last_event_time = data.get("lastEventTime")
@@ -0,0 +1,267 @@
+"""Incremental synchronization of the messages in Webex rooms.
+
+Classes:
+    SQLiteWatermarkStore: Persists the per-room sync watermarks in a local
+        SQLite database.
+    MessageSync: Retrieves only the messages posted to rooms since their
+        last synchronization.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+import sqlite3
+import threading
+from concurrent.futures import as_completed, ThreadPoolExecutor
+
+from .config import DEFAULT_MAX_WORKERS
+from .utils import check_type, object_json_data
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SYNC_PAGE_SIZE = 50
+
+
+class SQLiteWatermarkStore(object):
+    """Persist the per-room message sync watermarks in a SQLite database.
+
+    A watermark is the ID and creation time of the latest message that has
+    been synchronized from a room.  The store may be shared between threads.
+
+    """
+
+    def __init__(self, path=":memory:"):
+        """Init a new SQLiteWatermarkStore.
+
+        Args:
+            path(str): The path of the SQLite database file; it is created if
+                it does not exist.  Defaults to a (non-persistent) in-memory
+                database.
+
+        """
+        check_type(path, str)
+
+        super(SQLiteWatermarkStore, self).__init__()
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS message_watermarks ("
+                "room_id TEXT PRIMARY KEY, "
+                "message_id TEXT NOT NULL, "
+                "created TEXT NOT NULL)"
+            )
+
+    def get(self, roomId):
+        """Get the watermark of a room.
+
+        Returns:
+            tuple: The (message ID, created) watermark of the room, or None if
+            the room has not been synchronized.
+
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT message_id, created FROM message_watermarks "
+                "WHERE room_id = ?",
+                (roomId,),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, roomId, messageId, created):
+        """Set the watermark of a room."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO message_watermarks "
+                "(room_id, message_id, created) VALUES (?, ?, ?)",
+                (roomId, messageId, created),
+            )
+
+    def delete(self, roomId):
+        """Forget the watermark of a room."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM message_watermarks WHERE room_id = ?", (roomId,)
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def _seen(message, watermark):
+    """Whether a message is at, or before, a room's watermark."""
+    last_id, last_created = watermark
+    created = object_json_data(message).get("created")
+    return message.id == last_id or bool(created and created < last_created)
+
+
+class MessageSync(object):
+    """Retrieve only the messages posted to rooms since they were last synced.
+
+    Webex lists the messages of a room newest first.  For each room, the
+    sync engine lists the messages until it reaches the room's watermark
+    (the latest message it has already seen) and stops paginating there.
+    Each room is first probed for its latest message; so polling a room
+    that has no new messages costs a single request, for one message.
+    The rooms are synchronized concurrently, and the new messages of each
+    room are returned in chronological order.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        store=None,
+        page_size=DEFAULT_SYNC_PAGE_SIZE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        backfill=False,
+    ):
+        """Init a new MessageSync.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to list the messages.
+            store(SQLiteWatermarkStore): The watermark store.  Defaults to
+                a new in-memory store.
+            page_size(int): The number of messages requested per page.
+            max_workers(int): The maximum number of rooms synchronized
+                concurrently.
+            backfill(bool): Whether the first sync of a room returns all of
+                the room's messages.  By default, the first sync only records
+                the room's latest message as its watermark.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(store, SQLiteWatermarkStore, optional=True)
+        check_type(page_size, int)
+        check_type(max_workers, int)
+        check_type(backfill, bool)
+
+        super(MessageSync, self).__init__()
+
+        self._api = api
+        self.store = store if store is not None else SQLiteWatermarkStore()
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.backfill = backfill
+
+    def fetch_new(self, roomId):
+        """Retrieve the messages posted to a room since its watermark.
+
+        The room's watermark is not updated; see `commit()`.
+
+        Args:
+            roomId(str): The ID of the room.
+
+        Returns:
+            list: The new Message objects, oldest first.
+
+        Raises:
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        check_type(roomId, str)
+
+        watermark = self.store.get(roomId)
+        if watermark is None and not self.backfill:
+            # Only the first page (of one message) is requested
+            latest = next(
+                iter(self._api.messages.list(roomId=roomId, max=1)), None
+            )
+            if latest is not None:
+                self.commit(roomId, [latest])
+            return []
+
+        if watermark is not None:
+            # Probe with a single message; an idle room costs one request
+            latest = next(
+                iter(self._api.messages.list(roomId=roomId, max=1)), None
+            )
+            if latest is None or _seen(latest, watermark):
+                return []
+
+        new_messages = []
+        for message in self._api.messages.list(
+            roomId=roomId, max=self.page_size
+        ):
+            if watermark is not None and _seen(message, watermark):
+                break
+            new_messages.append(message)
+
+        new_messages.reverse()
+        logger.debug(
+            "{} new messages in room {}.".format(len(new_messages), roomId)
+        )
+        return new_messages
+
+    def commit(self, roomId, messages):
+        """Advance a room's watermark past messages that were processed.
+
+        Args:
+            roomId(str): The ID of the room.
+            messages(list): The room's processed messages, oldest first.
+
+        """
+        if messages:
+            latest = messages[-1]
+            self.store.set(
+                roomId, latest.id, object_json_data(latest).get("created")
+            )
+
+    def sync(self, roomIds):
+        """Synchronize rooms, yielding their new messages.
+
+        The rooms are synchronized concurrently.  The messages of each room
+        are yielded in chronological order, as soon as the room has been
+        synchronized; a room's watermark is only advanced once all of its new
+        messages have been yielded, so messages are re-delivered if the
+        consumer stops before it has processed them.
+
+        Args:
+            roomIds(iterable): The IDs of the rooms to be synchronized.
+
+        Yields:
+            Message: The new messages.
+
+        Raises:
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch_new, roomId): roomId
+                for roomId in roomIds
+            }
+            try:
+                for future in as_completed(futures):
+                    messages = future.result()
+                    for message in messages:
+                        yield message
+                    self.commit(futures[future], messages)
+            finally:
+                for future in futures:
+                    future.cancel()
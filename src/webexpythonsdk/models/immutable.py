@@ -97,8 +97,12 @@ class ImmutableData(object):
                 requested.
 
         """
-        if item in list(self._json_data.keys()):
-            item_data = self._json_data[item]
+        # Read the JSON data through __dict__; objects being unpickled, or
+        # otherwise created without __init__(), do not have it yet and looking
+        # it up as an attribute would recurse back into __getattr__().
+        json_data = self.__dict__.get("_json_data")
+        if json_data is not None and item in json_data:
+            item_data = json_data[item]
             if isinstance(item_data, dict):
                 return ImmutableData(item_data)
             else:
@@ -110,6 +114,10 @@ class ImmutableData(object):
                 )
             )
 
+    def __reduce__(self):
+        """Pickle the object as a call to its class with its JSON data."""
+        return self.__class__, (self._json_data,)
+
     def __str__(self):
         """A human-readable string representation of this object."""
         class_str = self.__class__.__name__
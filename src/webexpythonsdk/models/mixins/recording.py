@@ -96,6 +96,17 @@ class RecordingBasicPropertiesMixin(object):
         """The playback link for recording."""
         return self._json_data.get("playbackUrl")
 
+    @property
+    def temporaryDirectDownloadLinks(self):
+        """Temporary direct download links for the recording.
+
+        A dictionary with the `recordingDownloadLink`, `audioDownloadLink`
+        and `transcriptDownloadLink` of the recording, and their
+        `expiration` date and time.  Only returned when getting a recording
+        by ID.
+        """
+        return self._json_data.get("temporaryDirectDownloadLinks")
+
     @property
     def password(self):
         """The recording's password."""
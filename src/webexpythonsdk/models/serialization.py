@@ -0,0 +1,240 @@
+"""Compact binary serialization for batches of Webex data objects.
+
+Functions:
+    pack_models: Serialize a batch of data objects to bytes.
+    unpack_models: Deserialize a batch of data objects from bytes.
+    write_models: Serialize data objects to a binary file-like object.
+    read_models: Incrementally deserialize data objects from a binary
+        file-like object.
+
+The format is a short header followed by length-prefixed records.  Each
+distinct data model class is named once, in a type-definition record, and
+later referenced by a one-byte type index; each object record carries the
+compact (UTF-8) JSON encoding of the object's data.  Batches of data objects
+can therefore be shipped between processes, or spilled to disk, without the
+per-object overhead of pickling the objects and their class references.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import json
+import struct
+from collections import OrderedDict
+
+from .immutable import ImmutableData, immutable_data_models
+from .simple import SimpleDataModel
+
+
+MAGIC = b"WXDM"
+VERSION = 1
+
+# Record tags
+_TYPE_RECORD = 0
+_OBJECT_RECORD = 1
+
+# Model kinds
+_IMMUTABLE = 0
+_SIMPLE = 1
+_DICT = 2
+
+_HEADER = struct.Struct(">4sB")
+_TYPE_HEADER = struct.Struct(">BBBH")
+_OBJECT_HEADER = struct.Struct(">BBI")
+
+_MAX_TYPES = 256
+
+
+def _model_classes():
+    """Map the known data model class names to their classes."""
+    classes = {
+        cls.__name__: cls
+        for cls in immutable_data_models.values()
+        if isinstance(cls, type)
+    }
+    classes[ImmutableData.__name__] = ImmutableData
+    classes[SimpleDataModel.__name__] = SimpleDataModel
+    return classes
+
+
+def _describe(obj):
+    """Return the (kind, class name, JSON data) of a data object."""
+    if isinstance(obj, ImmutableData):
+        return _IMMUTABLE, obj.__class__.__name__, obj._json_data
+    elif isinstance(obj, SimpleDataModel):
+        return _SIMPLE, obj.__class__.__name__, vars(obj)
+    elif isinstance(obj, dict):
+        return _DICT, "dict", obj
+    else:
+        raise TypeError(
+            "Unable to serialize {!r}; expecting an ImmutableData, "
+            "SimpleDataModel or dict object.".format(obj)
+        )
+
+
+def write_models(models, fp):
+    """Serialize data objects to a binary file-like object.
+
+    Args:
+        models(iterable): The data objects to be serialized.  ImmutableData
+            models, SimpleDataModel objects and dictionaries (as returned by
+            the `dict_data_factory`) are supported.
+        fp(file): A writable binary file-like object.
+
+    Returns:
+        int: The number of objects written.
+
+    Raises:
+        TypeError: If one of the objects is not a supported data object.
+        ValueError: If the objects are of more than 256 distinct classes.
+
+    """
+    fp.write(_HEADER.pack(MAGIC, VERSION))
+
+    type_ids = {}
+    count = 0
+    for obj in models:
+        kind, name, data = _describe(obj)
+
+        type_id = type_ids.get((kind, name))
+        if type_id is None:
+            if len(type_ids) >= _MAX_TYPES:
+                raise ValueError(
+                    "A batch may contain at most {} distinct data model "
+                    "classes.".format(_MAX_TYPES)
+                )
+            type_id = len(type_ids)
+            type_ids[(kind, name)] = type_id
+            encoded_name = name.encode("utf-8")
+            fp.write(
+                _TYPE_HEADER.pack(
+                    _TYPE_RECORD, type_id, kind, len(encoded_name)
+                )
+            )
+            fp.write(encoded_name)
+
+        payload = json.dumps(
+            data, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        fp.write(_OBJECT_HEADER.pack(_OBJECT_RECORD, type_id, len(payload)))
+        fp.write(payload)
+        count += 1
+
+    return count
+
+
+def _read_exactly(fp, size):
+    """Read exactly `size` bytes from a file-like object."""
+    data = fp.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of serialized data.")
+    return data
+
+
+def read_models(fp):
+    """Incrementally deserialize data objects from a binary file-like object.
+
+    Data model classes that are not part of this package are deserialized
+    as their base class (ImmutableData or SimpleDataModel).
+
+    Args:
+        fp(file): A readable binary file-like object positioned at the start
+            of data written by `write_models()`.
+
+    Yields:
+        The deserialized data objects, in the order they were written.
+
+    Raises:
+        ValueError: If the data is not in the expected format.
+
+    """
+    magic, version = _HEADER.unpack(_read_exactly(fp, _HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Unsupported serialized data format.")
+
+    classes = _model_classes()
+    types = {}
+    while True:
+        tag = fp.read(1)
+        if not tag:
+            return
+
+        if tag[0] == _TYPE_RECORD:
+            _, type_id, kind, name_length = _TYPE_HEADER.unpack(
+                tag + _read_exactly(fp, _TYPE_HEADER.size - 1)
+            )
+            name = _read_exactly(fp, name_length).decode("utf-8")
+            if kind == _IMMUTABLE:
+                factory = classes.get(name, ImmutableData)
+            elif kind == _SIMPLE:
+                factory = classes.get(name, SimpleDataModel)
+            else:
+                factory = None
+            types[type_id] = factory
+
+        elif tag[0] == _OBJECT_RECORD:
+            _, type_id, length = _OBJECT_HEADER.unpack(
+                tag + _read_exactly(fp, _OBJECT_HEADER.size - 1)
+            )
+            if type_id not in types:
+                raise ValueError("Undefined data model type in record.")
+            data = json.loads(
+                _read_exactly(fp, length), object_hook=OrderedDict
+            )
+            factory = types[type_id]
+            yield data if factory is None else factory(data)
+
+        else:
+            raise ValueError("Unknown record tag {}.".format(tag[0]))
+
+
+def pack_models(models):
+    """Serialize a batch of data objects to bytes.
+
+    Args:
+        models(iterable): The data objects to be serialized.
+
+    Returns:
+        bytes: The serialized data objects.
+
+    Raises:
+        TypeError: If one of the objects is not a supported data object.
+
+    """
+    buffer = io.BytesIO()
+    write_models(models, buffer)
+    return buffer.getvalue()
+
+
+def unpack_models(data):
+    """Deserialize a batch of data objects from bytes.
+
+    Args:
+        data(bytes): Data produced by `pack_models()`.
+
+    Returns:
+        list: The deserialized data objects.
+
+    Raises:
+        ValueError: If the data is not in the expected format.
+
+    """
+    return list(read_models(io.BytesIO(data)))
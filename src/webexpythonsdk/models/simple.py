@@ -50,6 +50,10 @@ class SimpleDataModel(object):
         for attribute, value in json_dict(json_data).items():
             setattr(self, attribute, value)
 
+    def __reduce__(self):
+        """Pickle the object as a call to its class with its attributes."""
+        return self.__class__, (dict(self.__dict__),)
+
     def __str__(self):
         """A human-readable string representation of this object."""
         return json.dumps(self.__dict__, ensure_ascii=False, indent=4)
@@ -0,0 +1,803 @@
+"""Deliver outbound messages from a durable queue.
+
+Classes:
+    SQLiteOutboundStore: Persists the outbound queue in a SQLite database.
+    OutboundQueue: Queues message creates, updates and deletes, and delivers
+        them from a pool of worker threads; preserving the order of the
+        changes made to each room.
+    OutboundJob: A queued change.
+    MessageCoalescer: Merges the small messages posted to a room in quick
+        succession into fewer, larger messages.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import deque, namedtuple, OrderedDict
+
+import requests
+
+from .config import DEFAULT_MAX_WORKERS
+from .exceptions import ApiError, RateLimitError
+from .models.cards import AdaptiveCard
+from .utils import check_type, make_attachment, TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_OUTBOUND_RATE = 5
+
+DEFAULT_MAX_RETRIES = 3
+
+DEFAULT_RETRY_DELAY = 1.0
+
+DEFAULT_LATENCY_SAMPLES = 10000
+
+DEFAULT_COALESCE_WINDOW = 1.0
+
+# The maximum size of a message's text or markdown, in bytes
+MAX_MESSAGE_SIZE = 7439
+
+_SEPARATORS = {"text": "\n", "markdown": "\n\n"}
+
+# Outbound job actions; the MessagesAPI methods making the changes
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+
+OutboundJob = namedtuple(
+    "OutboundJob", ["id", "key", "action", "params", "enqueued"]
+)
+OutboundJob.__doc__ = """A queued message change.
+
+Attributes:
+    id(int): The ID of the job, assigned by the store in queue order.
+    key(str): The room (or person) whose changes are delivered in order.
+    action(str): "create", "update" or "delete".
+    params(dict): The arguments of the MessagesAPI method.
+    enqueued(float): When the job was queued (seconds since the epoch).
+"""
+
+
+class SQLiteOutboundStore(object):
+    """Persist an outbound queue in a SQLite database.
+
+    Jobs stay in the store until they are delivered, so the jobs that were
+    pending when a process stopped are delivered when it restarts.  Jobs
+    that could not be delivered are kept, marked failed.
+
+    Any object with the same methods may be used as an OutboundQueue store.
+    The store may be shared between threads.
+
+    """
+
+    def __init__(self, path=":memory:"):
+        """Init a new SQLiteOutboundStore.
+
+        Args:
+            path(str): The path of the SQLite database file; it is created if
+                it does not exist.  Defaults to a (non-persistent) in-memory
+                database.
+
+        """
+        check_type(path, str)
+
+        super(SQLiteOutboundStore, self).__init__()
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS outbound_jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "key TEXT NOT NULL, "
+                "action TEXT NOT NULL, "
+                "params TEXT NOT NULL, "
+                "enqueued REAL NOT NULL, "
+                "error TEXT)"
+            )
+
+    def put(self, key, action, params, enqueued):
+        """Add a job to the store.
+
+        Returns:
+            OutboundJob: The stored job.
+
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO outbound_jobs (key, action, params, enqueued) "
+                "VALUES (?, ?, ?, ?)",
+                (key, action, json.dumps(params), enqueued),
+            )
+        return OutboundJob(cursor.lastrowid, key, action, params, enqueued)
+
+    def _jobs(self, condition):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, key, action, params, enqueued FROM outbound_jobs "
+                "WHERE error IS {} ORDER BY id".format(condition)
+            ).fetchall()
+        return [
+            OutboundJob(id, key, action, json.loads(params), enqueued)
+            for id, key, action, params, enqueued in rows
+        ]
+
+    def pending(self):
+        """The jobs waiting to be delivered (list), in queue order."""
+        return self._jobs("NULL")
+
+    def failed(self):
+        """The jobs that could not be delivered (list), in queue order."""
+        return self._jobs("NOT NULL")
+
+    def remove(self, id):
+        """Remove a (delivered) job from the store."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM outbound_jobs WHERE id = ?", (id,)
+            )
+
+    def fail(self, id, error):
+        """Mark a job as failed."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE outbound_jobs SET error = ? WHERE id = ?",
+                (error, id),
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def _retryable(error):
+    """Whether a failed request may succeed if retried (bool)."""
+    return isinstance(error, requests.RequestException) or (
+        isinstance(error, ApiError) and error.status_code >= 500
+    )
+
+
+def _percentile(ordered, percent):
+    """The nearest-rank percentile of an ordered list of numbers."""
+    if not ordered:
+        return 0.0
+    index = math.ceil(percent / 100.0 * len(ordered)) - 1
+    return ordered[max(index, 0)]
+
+
+class OutboundQueue(object):
+    """Queue message changes and deliver them from a pool of workers.
+
+    `create()`, `update()` and `delete()` take the same arguments as the
+    MessagesAPI methods, but only persist the change to the store and
+    return; so handlers are not blocked when Webex is slow or rate limits
+    the bot, and queued changes survive a restart of the process.
+
+    Worker threads deliver the changes, paced by a token bucket.  The
+    changes made to a room (or sent to a person) are delivered one at a
+    time, in the order they were queued; different rooms are served
+    concurrently.  Rate-limited requests are retried after the Retry-After
+    period, and requests that fail with a server or connection error are
+    retried with exponential backoff (note that a message may then be
+    posted twice, if Webex posted it before the error).  Changes that still
+    cannot be delivered are marked failed in the store.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        store=None,
+        rate=DEFAULT_OUTBOUND_RATE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_retries=DEFAULT_MAX_RETRIES,
+        retry_delay=DEFAULT_RETRY_DELAY,
+    ):
+        """Init a new OutboundQueue.
+
+        Jobs left pending in the store (by a previous process) are queued,
+        and their delivery started.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to deliver the changes.
+            store(SQLiteOutboundStore): The store persisting the queue.
+                Defaults to a (non-persistent) in-memory SQLite store.
+            rate(int, float): The maximum number of requests per second.
+            max_workers(int): The number of worker threads.
+            max_retries(int): The number of times a request that failed with
+                a server or connection error is retried.
+            retry_delay(int, float): The delay, in seconds, before the first
+                retry; doubled for each subsequent retry.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(rate, (int, float))
+        check_type(max_workers, int)
+        check_type(max_retries, int)
+        check_type(retry_delay, (int, float))
+
+        super(OutboundQueue, self).__init__()
+
+        self._api = api
+        self.store = store if store is not None else SQLiteOutboundStore()
+        self.rate_limiter = TokenBucket(rate)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._condition = threading.Condition()
+        self._lanes = OrderedDict()
+        self._busy = set()
+        self._workers = []
+        self._stopping = False
+
+        self._latencies = deque(maxlen=DEFAULT_LATENCY_SAMPLES)
+        self._counts = {"delivered": 0, "failed": 0, "retries": 0}
+
+        recovered = self.store.pending()
+        for job in recovered:
+            self._lanes.setdefault(job.key, deque()).append(job)
+        if recovered:
+            logger.info(
+                "Recovered {} pending outbound jobs.".format(len(recovered))
+            )
+            self.start()
+
+    def start(self):
+        """Start the worker threads (if they are not already running)."""
+        with self._condition:
+            if self._workers:
+                return
+            self._stopping = False
+            for number in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._work,
+                    name="OutboundQueue-{}".format(number),
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def flush(self, timeout=None):
+        """Wait until all of the queued jobs have been processed.
+
+        Returns:
+            bool: False if the timeout expired first.
+
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._lanes and not self._busy, timeout
+            )
+
+    def stop(self, drain=True, timeout=None):
+        """Stop the worker threads.
+
+        Args:
+            drain(bool): Wait for the queued jobs to be delivered first.
+                Otherwise, the jobs that have not been started stay in the
+                store, to be delivered when the queue is next created.
+            timeout(int, float): The maximum time to wait for the queue to
+                drain, in seconds.
+
+        """
+        if drain:
+            self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            workers, self._workers = self._workers, []
+            self._condition.notify_all()
+        for worker in workers:
+            worker.join()
+
+    def _enqueue(self, key, action, params):
+        params = {k: v for k, v in params.items() if v is not None}
+        job = self.store.put(key, action, params, time.time())
+        with self._condition:
+            self._lanes.setdefault(key, deque()).append(job)
+            self._condition.notify()
+        self.start()
+        return job
+
+    def create(
+        self,
+        roomId=None,
+        parentId=None,
+        toPersonId=None,
+        toPersonEmail=None,
+        text=None,
+        markdown=None,
+        files=None,
+        attachments=None,
+        **request_parameters,
+    ):
+        """Queue a message to be posted; see `MessagesAPI.create()`.
+
+        As the message is persisted, its `files` must be local file paths or
+        URLs (not file objects).  AdaptiveCard attachments are converted to
+        attachment dictionaries.
+
+        Returns:
+            OutboundJob: The queued job.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If no recipient is provided.
+
+        """
+        check_type(files, list, optional=True)
+        check_type(attachments, list, optional=True)
+
+        key = roomId or toPersonId or toPersonEmail
+        if not key:
+            raise ValueError(
+                "One of `roomId`, `toPersonId` or `toPersonEmail` is required."
+            )
+        for file in files or []:
+            check_type(file, str)
+        if attachments:
+            for attachment in attachments:
+                check_type(attachment, (dict, AdaptiveCard))
+            attachments = [
+                make_attachment(attachment)
+                if isinstance(attachment, AdaptiveCard)
+                else attachment
+                for attachment in attachments
+            ]
+        params = dict(
+            request_parameters,
+            roomId=roomId,
+            parentId=parentId,
+            toPersonId=toPersonId,
+            toPersonEmail=toPersonEmail,
+            text=text,
+            markdown=markdown,
+            files=files,
+            attachments=attachments,
+        )
+        return self._enqueue(key, CREATE, params)
+
+    def update(self, messageId, roomId, text=None, markdown=None):
+        """Queue a message edit; see `MessagesAPI.update()`.
+
+        Returns:
+            OutboundJob: The queued job.
+
+        """
+        check_type(messageId, str)
+        check_type(roomId, str)
+        params = {
+            "messageId": messageId,
+            "roomId": roomId,
+            "text": text,
+            "markdown": markdown,
+        }
+        return self._enqueue(roomId, UPDATE, params)
+
+    def delete(self, messageId, roomId=None):
+        """Queue a message deletion; see `MessagesAPI.delete()`.
+
+        Args:
+            messageId(str): The ID of the message to be deleted.
+            roomId(str): The room of the message; orders the deletion after
+                the other changes queued for the room.
+
+        Returns:
+            OutboundJob: The queued job.
+
+        """
+        check_type(messageId, str)
+        check_type(roomId, str, optional=True)
+        return self._enqueue(
+            roomId or messageId, DELETE, {"messageId": messageId}
+        )
+
+    def _next_job(self):
+        """Take the next job of a room that has no job in progress."""
+        key = next((k for k in self._lanes if k not in self._busy), None)
+        if key is None:
+            return None
+        lane = self._lanes[key]
+        job = lane.popleft()
+        if lane:
+            # Serve the other rooms before this one's next job
+            self._lanes.move_to_end(key)
+        else:
+            del self._lanes[key]
+        self._busy.add(key)
+        return job
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopping:
+                        return
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._condition.wait()
+            try:
+                self._deliver(job)
+            finally:
+                with self._condition:
+                    self._busy.discard(job.key)
+                    self._condition.notify_all()
+
+    def _deliver(self, job):
+        method = getattr(self._api.messages, job.action)
+        retries = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                method(**job.params)
+            except RateLimitError as e:
+                self.rate_limiter.pause(e.retry_after)
+                continue
+            except Exception as e:
+                if _retryable(e) and retries < self.max_retries:
+                    time.sleep(self.retry_delay * 2**retries)
+                    retries += 1
+                    with self._condition:
+                        self._counts["retries"] += 1
+                    continue
+                logger.warning(
+                    "Unable to {} message for {}: {}".format(
+                        job.action, job.key, e
+                    )
+                )
+                self.store.fail(job.id, str(e))
+                with self._condition:
+                    self._counts["failed"] += 1
+                return
+            else:
+                self.store.remove(job.id)
+                with self._condition:
+                    self._counts["delivered"] += 1
+                    self._latencies.append(time.time() - job.enqueued)
+                return
+
+    @property
+    def metrics(self):
+        """Queue metrics (dict).
+
+        Keys:
+            pending: The number of jobs waiting to be delivered.
+            in_progress: The number of jobs being delivered.
+            delivered: The number of jobs delivered.
+            failed: The number of jobs that could not be delivered.
+            retries: The number of retried requests.
+            latency_p50, latency_p90, latency_p99: Percentiles of the
+                delivery latency (from queueing to delivery), in seconds,
+                over the most recently delivered jobs.
+
+        """
+        with self._condition:
+            metrics = dict(self._counts)
+            metrics["pending"] = sum(
+                len(lane) for lane in self._lanes.values()
+            )
+            metrics["in_progress"] = len(self._busy)
+            latencies = sorted(self._latencies)
+        for percent in (50, 90, 99):
+            metrics["latency_p{}".format(percent)] = _percentile(
+                latencies, percent
+            )
+        return metrics
+
+
+class MessageCoalescer(object):
+    """Merge the small messages posted to a room into fewer messages.
+
+    Text and markdown messages posted with `create()` are buffered per room
+    (or person) for up to `window` seconds, and then posted as a single
+    message; the parts are joined with line breaks, in order.  A buffer is
+    flushed early when the next part would take the merged message over
+    `max_size` bytes, or when the next message cannot be merged (it has a
+    different format, files, attachments or a parent), and on `close()`.
+
+    The merged messages are posted with the `create()` method of the
+    target: `api.messages`, or an OutboundQueue.  They are posted without
+    holding the coalescer's lock, so posting to one recipient never delays
+    buffering messages for another.  Posts that fail with a connection or
+    server error are retried, rate-limited posts are retried after the
+    Retry-After delay, and messages that cannot be posted are kept in
+    `failed`.
+
+    """
+
+    def __init__(
+        self,
+        target,
+        window=DEFAULT_COALESCE_WINDOW,
+        max_size=MAX_MESSAGE_SIZE,
+        max_retries=DEFAULT_MAX_RETRIES,
+        retry_delay=DEFAULT_RETRY_DELAY,
+    ):
+        """Init a new MessageCoalescer.
+
+        Args:
+            target(MessagesAPI, OutboundQueue): Posts the merged messages.
+            window(int, float): How long, in seconds, messages are buffered
+                before they are posted.
+            max_size(int): The maximum size of a merged message, in bytes.
+            max_retries(int): The number of times a post that failed with a
+                connection or server (5xx) error is retried.
+            retry_delay(int, float): The delay, in seconds, before the first
+                retry; doubled for each subsequent retry.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(window, (int, float))
+        check_type(max_size, int)
+        check_type(max_retries, int)
+        check_type(retry_delay, (int, float))
+
+        super(MessageCoalescer, self).__init__()
+
+        self._target = target
+        self.window = window
+        self.max_size = max_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._condition = threading.Condition(threading.RLock())
+        self._buffers = OrderedDict()
+        self._outgoing = {}
+        self._sending = set()
+        self._failed = []
+        self._timer = None
+        self._closed = False
+        self._counts = {"messages": 0, "requests": 0}
+
+    def create(
+        self,
+        roomId=None,
+        toPersonId=None,
+        toPersonEmail=None,
+        text=None,
+        markdown=None,
+        **request_parameters,
+    ):
+        """Buffer a message to be posted; see `MessagesAPI.create()`.
+
+        Messages with other arguments than a recipient and a `text` or
+        `markdown` (for example, `files`) are posted immediately, after the
+        recipient's buffered messages.
+
+        Raises:
+            ValueError: If no recipient is provided, or the coalescer is
+                closed.
+
+        """
+        recipients = {
+            "roomId": roomId,
+            "toPersonId": toPersonId,
+            "toPersonEmail": toPersonEmail,
+        }
+        field = next((f for f, v in recipients.items() if v), None)
+        if field is None:
+            raise ValueError(
+                "One of `roomId`, `toPersonId` or `toPersonEmail` is required."
+            )
+        key = (field, recipients[field])
+        request_parameters = {
+            k: v for k, v in request_parameters.items() if v is not None
+        }
+
+        with self._condition:
+            if self._closed:
+                raise ValueError("The coalescer is closed.")
+            self._counts["messages"] += 1
+
+            message_format = "markdown" if markdown is not None else "text"
+            content = markdown if markdown is not None else text
+            size = len((content or "").encode("utf-8"))
+            separator = _SEPARATORS[message_format]
+            if request_parameters or content is None or size > self.max_size:
+                # Cannot be merged; post it after the buffered messages
+                self._flush(key)
+                self._queue(
+                    key, dict(request_parameters, text=text, markdown=markdown)
+                )
+            else:
+                buffer = self._buffers.get(key)
+                if buffer is not None and (
+                    buffer["format"] != message_format
+                    or buffer["size"] + len(separator) + size > self.max_size
+                ):
+                    self._flush(key)
+                    buffer = None
+                if buffer is None:
+                    buffer = {
+                        "format": message_format,
+                        "parts": [],
+                        "size": -len(separator),
+                        "deadline": time.monotonic() + self.window,
+                    }
+                    self._buffers[key] = buffer
+                    self._condition.notify()
+                buffer["parts"].append(content)
+                buffer["size"] += len(separator) + size
+                self._start_timer()
+
+        # Post any flushed messages, without holding the lock
+        self._send([key])
+
+    def _post(self, key, message):
+        field, recipient = key
+        message = {k: v for k, v in message.items() if v is not None}
+        message[field] = recipient
+        retries = 0
+        while True:
+            try:
+                self._target.create(**message)
+            except RateLimitError as e:
+                time.sleep(e.retry_after)
+                continue
+            except Exception as e:
+                if _retryable(e) and retries < self.max_retries:
+                    time.sleep(self.retry_delay * 2**retries)
+                    retries += 1
+                    continue
+                logger.warning(
+                    "Unable to post coalesced message to {}: {}".format(
+                        recipient, e
+                    )
+                )
+                with self._condition:
+                    self._failed.append((message, e))
+                return
+            else:
+                return
+
+    def _send(self, keys):
+        """Post the outgoing messages of recipients, without the lock.
+
+        Only one thread posts the messages of a recipient at a time, in
+        order; other threads only queue them.
+
+        """
+        for key in keys:
+            with self._condition:
+                if key in self._sending:
+                    continue
+                self._sending.add(key)
+            while True:
+                with self._condition:
+                    outgoing = self._outgoing.get(key)
+                    if not outgoing:
+                        self._outgoing.pop(key, None)
+                        self._sending.discard(key)
+                        self._condition.notify_all()
+                        break
+                    message = outgoing.popleft()
+                self._post(key, message)
+
+    def _queue(self, key, message):
+        """Queue a message to be posted (with the lock held)."""
+        self._counts["requests"] += 1
+        self._outgoing.setdefault(key, deque()).append(message)
+
+    def _flush(self, key):
+        """Queue a recipient's buffered messages (with the lock held)."""
+        buffer = self._buffers.pop(key, None)
+        if buffer is not None:
+            content = _SEPARATORS[buffer["format"]].join(buffer["parts"])
+            self._queue(key, {buffer["format"]: content})
+
+    def flush(self):
+        """Post all of the buffered messages now."""
+        with self._condition:
+            keys = list(self._buffers)
+            for key in keys:
+                self._flush(key)
+        self._send(keys)
+
+    def _start_timer(self):
+        if self._timer is None:
+            self._timer = threading.Thread(
+                target=self._run_timer, name="MessageCoalescer", daemon=True
+            )
+            self._timer.start()
+
+    def _run_timer(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                keys = [
+                    key
+                    for key, buffer in self._buffers.items()
+                    if buffer["deadline"] <= now
+                ]
+                for key in keys:
+                    self._flush(key)
+                if not keys:
+                    deadlines = [b["deadline"] for b in self._buffers.values()]
+                    timeout = min(deadlines) - now if deadlines else None
+                    self._condition.wait(timeout)
+                    continue
+            self._send(keys)
+
+    def close(self):
+        """Post all of the buffered messages and stop the timer."""
+        with self._condition:
+            self._closed = True
+            keys = list(self._buffers)
+            for key in keys:
+                self._flush(key)
+            timer, self._timer = self._timer, None
+            self._condition.notify_all()
+        if timer is not None:
+            timer.join()
+        self._send(keys)
+        with self._condition:
+            # Wait for the messages being posted by other threads
+            self._condition.wait_for(lambda: not self._sending)
+
+    @property
+    def failed(self):
+        """The messages that could not be posted (list).
+
+        A list of `(message, error)` tuples, where `message` is a dictionary
+        of the `create()` arguments of the (merged) message.
+
+        """
+        with self._condition:
+            return list(self._failed)
+
+    @property
+    def metrics(self):
+        """Coalescing metrics (dict).
+
+        Keys:
+            messages: The number of messages posted to the coalescer.
+            requests: The number of messages posted to the target.
+            requests_saved: The number of requests saved by coalescing.
+            buffered: The number of recipients with buffered messages.
+            failed: The number of messages that could not be posted.
+
+        """
+        with self._condition:
+            return {
+                "messages": self._counts["messages"],
+                "requests": self._counts["requests"],
+                "requests_saved": self._counts["messages"]
+                - self._counts["requests"]
+                - sum(len(b["parts"]) for b in self._buffers.values()),
+                "buffered": len(self._buffers),
+                "failed": len(self._failed),
+            }
@@ -0,0 +1,470 @@
+"""Reconcile Webex resources with a declared, desired state.
+
+Classes:
+    MembershipReconciler: Makes the memberships of rooms (or teams) match
+        the desired rosters, with the minimal set of changes.
+    WebhookReconciler: Makes the webhooks of many accounts (tokens) match
+        the desired webhook specifications, with the minimal set of changes.
+    ReconcileOperation: A change planned by a reconciler.
+    ReconcileResult: The outcome of applying a planned change.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import DEFAULT_MAX_WORKERS
+from .exceptions import ApiError
+from .utils import check_type
+
+
+logger = logging.getLogger(__name__)
+
+
+CONFLICT_RESPONSE_CODE = 409
+
+# Reconcile operation actions
+ADD = "add"
+REMOVE = "remove"
+UPDATE = "update"
+
+# Reconcile result statuses
+PLANNED = "planned"
+APPLIED = "applied"
+CONFLICT = "conflict"
+FAILED = "failed"
+
+
+ReconcileOperation = namedtuple(
+    "ReconcileOperation", ["action", "targetId", "member", "objectId", "data"]
+)
+ReconcileOperation.__doc__ = """A change planned by a reconciler.
+
+Attributes:
+    action(str): "add", "remove" or "update".
+    targetId(str): The ID of the room, team, etc. (or the key of the
+        account) that is changed.
+    member(str): The person ID or email address of the affected member (or
+        the name of the affected webhook).
+    objectId(str): The ID of the object to be removed or updated.
+    data(dict): The attributes of the object to be created or updated.
+"""
+
+ReconcileResult = namedtuple(
+    "ReconcileResult", ["operation", "status", "error"]
+)
+ReconcileResult.__doc__ = """The outcome of a planned change.
+
+Attributes:
+    operation(ReconcileOperation): The change.
+    status(str): "planned" (dry run), "applied", "conflict" (the change had
+        already been made; a success) or "failed".
+    error(Exception): The error that caused the change to fail.
+"""
+
+
+def _member_key(member):
+    """Normalize a person ID or email address for comparisons."""
+    return member.lower() if "@" in member else member
+
+
+class MembershipReconciler(object):
+    """Make the memberships of rooms, or teams, match the desired rosters.
+
+    The current memberships of the rooms (or teams) are listed concurrently
+    and compared with the desired rosters, to plan the minimal set of member
+    additions, removals and moderator updates; which are then applied
+    concurrently.  Members may be identified by person ID or by email
+    address.  Additions that fail because the person is already a member
+    (409 Conflict) are counted as successes.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        teams=False,
+        protected=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """Init a new MembershipReconciler.
+
+        Args:
+            api(WebexAPI): The WebexAPI object used to make the changes.
+            teams(bool): Reconcile team memberships (`team_memberships`)
+                instead of room memberships (`memberships`).
+            protected(list): Person IDs or email addresses of members that
+                are never removed (for example, your bot's own account).
+            max_workers(int): The maximum number of concurrent requests.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(teams, bool)
+        check_type(protected, (list, tuple, set, frozenset), optional=True)
+        check_type(max_workers, int)
+
+        super(MembershipReconciler, self).__init__()
+
+        self._api = api
+        self.teams = teams
+        self.protected = frozenset(_member_key(m) for m in protected or ())
+        self.max_workers = max_workers
+
+        if teams:
+            self._memberships = api.team_memberships
+            self._target_field = "teamId"
+        else:
+            self._memberships = api.memberships
+            self._target_field = "roomId"
+
+    def _list_current(self, targetId):
+        kwargs = {self._target_field: targetId}
+        return targetId, list(self._memberships.list(**kwargs))
+
+    def _plan_target(self, targetId, desired, current):
+        """Plan the changes that make a target's members match its roster."""
+        if not isinstance(desired, dict):
+            # A plain roster; moderator flags are left unchanged
+            desired = dict.fromkeys(desired)
+        desired = {_member_key(m): (m, flag) for m, flag in desired.items()}
+
+        operations = []
+        for membership in current:
+            keys = {membership.personId}
+            if membership.personEmail:
+                keys.add(membership.personEmail.lower())
+            matches = keys.intersection(desired)
+            if not matches:
+                if keys.isdisjoint(self.protected):
+                    operations.append(
+                        ReconcileOperation(
+                            REMOVE,
+                            targetId,
+                            membership.personEmail or membership.personId,
+                            membership.id,
+                            None,
+                        )
+                    )
+                continue
+
+            member, isModerator = desired.pop(matches.pop())
+            for key in matches:
+                desired.pop(key, None)
+            if (
+                isModerator is not None
+                and bool(membership.isModerator) != isModerator
+            ):
+                operations.append(
+                    ReconcileOperation(
+                        UPDATE,
+                        targetId,
+                        member,
+                        membership.id,
+                        {"isModerator": isModerator},
+                    )
+                )
+
+        for member, isModerator in desired.values():
+            data = {"personEmail" if "@" in member else "personId": member}
+            if isModerator:
+                data["isModerator"] = True
+            operations.append(
+                ReconcileOperation(ADD, targetId, member, None, data)
+            )
+
+        return operations
+
+    def plan(self, desired):
+        """Plan the changes that make the memberships match the rosters.
+
+        Args:
+            desired(dict): The desired roster of each room (or team), by ID.
+                A roster is either a list (or set) of person IDs and email
+                addresses, or a dictionary mapping them to the desired
+                moderator flag (True, False, or None to leave the flag
+                unchanged).
+
+        Returns:
+            list: The ReconcileOperation objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        check_type(desired, dict)
+
+        operations = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for targetId, current in executor.map(self._list_current, desired):
+                operations.extend(
+                    self._plan_target(targetId, desired[targetId], current)
+                )
+        return operations
+
+    def _apply_operation(self, operation):
+        try:
+            if operation.action == ADD:
+                kwargs = dict(operation.data)
+                kwargs[self._target_field] = operation.targetId
+                self._memberships.create(**kwargs)
+            elif operation.action == UPDATE:
+                self._memberships.update(operation.objectId, **operation.data)
+            else:
+                self._memberships.delete(operation.objectId)
+        except ApiError as e:
+            if e.status_code == CONFLICT_RESPONSE_CODE:
+                return ReconcileResult(operation, CONFLICT, None)
+            logger.warning(
+                "Unable to {} member {} of {}: {}".format(
+                    operation.action, operation.member, operation.targetId, e
+                )
+            )
+            return ReconcileResult(operation, FAILED, e)
+        return ReconcileResult(operation, APPLIED, None)
+
+    def apply(self, operations):
+        """Apply planned changes, concurrently.
+
+        Returns:
+            list: A ReconcileResult for each operation, in order.
+
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._apply_operation, operations))
+
+    def reconcile(self, desired, dry_run=False):
+        """Make the memberships match the desired rosters.
+
+        Args:
+            desired(dict): The desired roster of each room (or team), by ID;
+                see `plan()`.
+            dry_run(bool): Only plan the changes; do not apply them.
+
+        Returns:
+            list: A ReconcileResult for each planned change.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the Webex cloud returns an error while listing the
+                current memberships.
+
+        """
+        check_type(dry_run, bool)
+
+        operations = self.plan(desired)
+        if dry_run:
+            return [ReconcileResult(op, PLANNED, None) for op in operations]
+        return self.apply(operations)
+
+
+# Webhook attributes that can only be changed by re-creating the webhook
+WEBHOOK_IDENTITY_FIELDS = ("resource", "event", "filter")
+
+WEBHOOK_ACTIVE = "active"
+
+
+class WebhookReconciler(object):
+    """Make the webhooks of many accounts match the desired specifications.
+
+    The webhooks of each account (each access token, wrapped in its own
+    WebexAPI object) are listed concurrently and compared, by name, with the
+    desired webhook specifications, to plan the minimal set of changes:
+
+    * Missing webhooks are created.
+    * Webhooks with a different target URL, or that Webex has disabled
+      (`status == "inactive"`), are updated; which also reactivates them.
+    * Webhooks with a different resource, event or filter (which cannot be
+      updated) are deleted and re-created.
+    * Webhooks that are not specified (and duplicates) are deleted, unless
+      `prune` is False.
+
+    The changes are then applied concurrently.  Note that webhook secrets
+    are not returned by Webex, so a changed secret is only applied when the
+    webhook is otherwise created or updated.
+
+    """
+
+    def __init__(self, apis, prune=True, max_workers=DEFAULT_MAX_WORKERS):
+        """Init a new WebhookReconciler.
+
+        Args:
+            apis(dict): The WebexAPI object of each account, by a key of your
+                choice (for example, the org or bot name).
+            prune(bool): Delete the webhooks that are not specified.
+            max_workers(int): The maximum number of concurrent requests.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(apis, dict)
+        check_type(prune, bool)
+        check_type(max_workers, int)
+
+        super(WebhookReconciler, self).__init__()
+
+        self.apis = apis
+        self.prune = prune
+        self.max_workers = max_workers
+
+    def _list_current(self, key):
+        return key, list(self.apis[key].webhooks.list())
+
+    def _plan_account(self, key, specs, current):
+        """Plan the changes that make an account's webhooks match specs."""
+        specs = {spec["name"]: spec for spec in specs}
+        operations = []
+        matched = set()
+
+        for webhook in current:
+            spec = specs.get(webhook.name)
+            if spec is None or webhook.name in matched:
+                if self.prune:
+                    operations.append(
+                        ReconcileOperation(
+                            REMOVE, key, webhook.name, webhook.id, None
+                        )
+                    )
+                continue
+            matched.add(webhook.name)
+
+            if any(
+                getattr(webhook, field) != spec.get(field)
+                for field in WEBHOOK_IDENTITY_FIELDS
+            ):
+                operations.append(
+                    ReconcileOperation(
+                        REMOVE, key, webhook.name, webhook.id, None
+                    )
+                )
+                operations.append(
+                    ReconcileOperation(ADD, key, webhook.name, None, spec)
+                )
+            elif (
+                webhook.targetUrl != spec["targetUrl"]
+                or webhook.status != WEBHOOK_ACTIVE
+            ):
+                data = {
+                    "name": spec["name"],
+                    "targetUrl": spec["targetUrl"],
+                    "status": WEBHOOK_ACTIVE,
+                }
+                if spec.get("secret"):
+                    data["secret"] = spec["secret"]
+                operations.append(
+                    ReconcileOperation(
+                        UPDATE, key, webhook.name, webhook.id, data
+                    )
+                )
+
+        for name, spec in specs.items():
+            if name not in matched:
+                operations.append(
+                    ReconcileOperation(ADD, key, name, None, spec)
+                )
+
+        return operations
+
+    def plan(self, desired):
+        """Plan the changes that make the webhooks match the specifications.
+
+        Args:
+            desired(dict): The desired webhooks of each account, by the
+                account's key in `apis`.  Each webhook is specified by a
+                dictionary with the `name`, `targetUrl`, `resource` and
+                `event` of the webhook, and optionally its `filter` and
+                `secret`.  Webhooks are identified by name.
+
+        Returns:
+            list: The ReconcileOperation objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            KeyError: If an account is not in `apis`.
+            ApiError: If the Webex cloud returns an error.
+
+        """
+        check_type(desired, dict)
+
+        operations = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for key, current in executor.map(self._list_current, desired):
+                operations.extend(
+                    self._plan_account(key, desired[key], current)
+                )
+        return operations
+
+    def _apply_operation(self, operation):
+        webhooks = self.apis[operation.targetId].webhooks
+        try:
+            if operation.action == ADD:
+                webhooks.create(**operation.data)
+            elif operation.action == UPDATE:
+                webhooks.update(operation.objectId, **operation.data)
+            else:
+                webhooks.delete(operation.objectId)
+        except ApiError as e:
+            logger.warning(
+                "Unable to {} webhook {} of {}: {}".format(
+                    operation.action, operation.member, operation.targetId, e
+                )
+            )
+            return ReconcileResult(operation, FAILED, e)
+        return ReconcileResult(operation, APPLIED, None)
+
+    def apply(self, operations):
+        """Apply planned changes, concurrently.
+
+        Returns:
+            list: A ReconcileResult for each operation, in order.
+
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._apply_operation, operations))
+
+    def reconcile(self, desired, dry_run=False):
+        """Make the webhooks match the desired specifications.
+
+        Args:
+            desired(dict): The desired webhooks of each account; see
+                `plan()`.
+            dry_run(bool): Only plan the changes; do not apply them.
+
+        Returns:
+            list: A ReconcileResult for each planned change.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If the Webex cloud returns an error while listing the
+                current webhooks.
+
+        """
+        check_type(dry_run, bool)
+
+        operations = self.plan(desired)
+        if dry_run:
+            return [ReconcileResult(op, PLANNED, None) for op in operations]
+        return self.apply(operations)
@@ -21,25 +21,39 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import hashlib
 import json
 import logging
+import os
 import platform
+import re
 import sys
 import time
 import urllib
 import urllib.parse
 import warnings
+from collections import namedtuple
 
 import requests
 
 from ._metadata import __title__, __version__
-from .config import DEFAULT_SINGLE_REQUEST_TIMEOUT, DEFAULT_WAIT_ON_RATE_LIMIT
+from .cache import SQLiteCache, TTLCache
+from .config import (
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    DEFAULT_SINGLE_REQUEST_TIMEOUT,
+    DEFAULT_WAIT_ON_RATE_LIMIT,
+)
 from .exceptions import MalformedResponse, RateLimitError, RateLimitWarning
+from .export import NDJSONWriter
 from .response_codes import EXPECTED_RESPONSE_CODE
 from .utils import (
     check_response_code,
     check_type,
     extract_and_parse_json,
+    extract_raw_items,
+    InternPool,
+    parse_json,
+    project_fields,
     validate_base_url,
 )
 
@@ -47,7 +61,41 @@ from .utils import (
 logger = logging.getLogger(__name__)
 
 
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+
+
+FileInfo = namedtuple("FileInfo", ["name", "size", "contentType", "ranges"])
+FileInfo.__doc__ = """The metadata of a file, from the headers of its URL.
+
+Attributes:
+    name(str): The file name, or None if it was not provided.
+    size(int): The size of the file in bytes, or None if it was not
+        provided.
+    contentType(str): The content (MIME) type of the file.
+    ranges(bool): Whether the server accepts (byte) range requests; so that
+        an interrupted download can be resumed.
+"""
+
+
 # Helper Functions
+def _file_name(content_disposition):
+    """Extract the file name from a Content-Disposition header."""
+    match = re.search(
+        r"filename\*\s*=\s*[\w-]+'[\w-]*'([^;]+)", content_disposition or ""
+    )
+    if match:
+        name = urllib.parse.unquote(match.group(1).strip())
+    else:
+        match = re.search(
+            r'filename\s*=\s*(?:"([^"]*)"|([^;]+))', content_disposition or ""
+        )
+        if not match:
+            return None
+        name = (match.group(1) or match.group(2)).strip()
+    # Never let a server-provided name escape the download directory
+    return os.path.basename(name.replace("\\", "/")) or None
+
+
 def _fix_next_url(next_url, params):
     """Remove max=null parameter from URL and ensure critical parameters are preserved.
 
@@ -216,6 +264,8 @@ class RestSession(object):
         be_geo_id=None,
         caller=None,
         disable_ssl_verify=False,
+        intern_pool=None,
+        cache=None,
     ):
         """Initialize a new RestSession object.
 
@@ -239,6 +289,11 @@ class RestSession(object):
             disable_ssl_verify(bool): Optional boolean flag to disable ssl
                 verification. Defaults to False. If set to true, the requests
                 session won't verify ssl certs anymore.
+            intern_pool(InternPool): Optional pool used to deduplicate the
+                keys and identifier values of the JSON data returned by GET
+                requests made through this session.
+            cache(TTLCache, SQLiteCache): Optional cache for the responses to
+                single-object GET requests (see the `cache` property).
 
         Raises:
             TypeError: If the parameter types are incorrect.
@@ -250,6 +305,8 @@ class RestSession(object):
         check_type(wait_on_rate_limit, bool)
         check_type(proxies, dict, optional=True)
         check_type(disable_ssl_verify, bool, optional=True)
+        check_type(intern_pool, InternPool, optional=True)
+        check_type(cache, (TTLCache, SQLiteCache), optional=True)
 
         super(RestSession, self).__init__()
 
@@ -258,6 +315,13 @@ class RestSession(object):
         self._access_token = str(access_token)
         self._single_request_timeout = single_request_timeout
         self._wait_on_rate_limit = wait_on_rate_limit
+        self._intern_pool = intern_pool
+        self._cache = cache
+
+        # Cache keys are scoped to the access token (identity)
+        self._cache_scope = hashlib.sha256(
+            access_token.encode("utf-8")
+        ).hexdigest()[:16]
 
         # Initialize a new session
         self._req_session = requests.session()
@@ -319,6 +383,60 @@ class RestSession(object):
         check_type(value, bool)
         self._wait_on_rate_limit = value
 
+    @property
+    def intern_pool(self):
+        """The InternPool used to parse GET responses (or None).
+
+        When set, the JSON object keys and identifier values (IDs, e-mail
+        addresses, etc.) of the data returned by GET requests are deduplicated
+        through the pool, which greatly reduces the memory held by large
+        result sets.
+
+        """
+        return self._intern_pool
+
+    @intern_pool.setter
+    def intern_pool(self, value):
+        """Set the InternPool used to parse GET responses."""
+        check_type(value, InternPool, optional=True)
+        self._intern_pool = value
+
+    @property
+    def cache(self):
+        """The cache of GET responses (or None).
+
+        A TTLCache, or a SQLiteCache shared by the worker processes of a
+        host.
+
+        When set, the responses to GET requests made through the `get()`
+        method (single-object retrievals, like `people.get()`) are served
+        from the cache until they expire.  The cached responses of an object
+        are evicted when it is updated or deleted through this session.
+        Paginated list requests are never cached.
+
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, value):
+        """Set the cache of GET responses."""
+        check_type(value, (TTLCache, SQLiteCache), optional=True)
+        self._cache = value
+
+    def _cache_key(self, url, params=None):
+        """The cache key of a GET request."""
+        key = "{} {}".format(self._cache_scope, self.abs_url(url))
+        if params:
+            key += "?" + urllib.parse.urlencode(sorted(params.items()))
+        return key
+
+    def _evict_cached(self, url):
+        """Evict the cached responses for a URL, with any query parameters."""
+        if self.cache is not None:
+            key = self._cache_key(url)
+            self.cache.delete(key)
+            self.cache.delete_prefix(key + "?")
+
     @property
     def headers(self):
         """The HTTP headers used for requests in this session."""
@@ -371,7 +489,9 @@ class RestSession(object):
             url(str): The URL of the API endpoint to be called.
             erc(int): The expected response code that should be returned by the
                 Webex API endpoint to indicate success.
-            **kwargs: Passed on to the requests package.
+            **kwargs: Passed on to the requests package.  A file-like
+                `data` body is rewound to be sent again after a rate limit;
+                if it is not `seekable()`, the RateLimitError is raised.
 
         Raises:
             ApiError: If anything other than the expected response code is
@@ -384,6 +504,13 @@ class RestSession(object):
         # Update request kwargs with session defaults
         kwargs.setdefault("timeout", self.single_request_timeout)
 
+        # A streamed request body must be rewound to be sent again
+        data = kwargs.get("data")
+        streamed = hasattr(data, "read")
+        position = None
+        if streamed and getattr(data, "seekable", lambda: False)():
+            position = data.tell()
+
         while True:
             # Make the HTTP request to the API endpoint
             response = self._req_session.request(method, abs_url, **kwargs)
@@ -394,9 +521,13 @@ class RestSession(object):
             except RateLimitError as e:
                 # Catch rate-limit errors
                 # Wait and retry if automatic rate-limit handling is enabled
-                if self.wait_on_rate_limit:
+                if self.wait_on_rate_limit and (
+                    position is not None or not streamed
+                ):
                     warnings.warn(RateLimitWarning(response), stacklevel=1)
                     time.sleep(e.retry_after)
+                    if position is not None:
+                        data.seek(position)
                     continue
                 else:
                     # Re-raise the RateLimitError
@@ -425,11 +556,22 @@ class RestSession(object):
         # Expected response code
         erc = kwargs.pop("erc", EXPECTED_RESPONSE_CODE["GET"])
 
-        response = self.request("GET", url, erc, params=params, **kwargs)
-        return extract_and_parse_json(response)
+        if self.cache is None or kwargs:
+            response = self.request("GET", url, erc, params=params, **kwargs)
+            return extract_and_parse_json(
+                response, intern_pool=self.intern_pool
+            )
 
-    def get_pages(self, url, params=None, **kwargs):
-        """Return a generator that GETs and yields pages of data.
+        key = self._cache_key(url, params)
+        text = self.cache.get(key)
+        if text is None:
+            response = self.request("GET", url, erc, params=params)
+            text = response.text
+            self.cache.set(key, text)
+        return parse_json(text, intern_pool=self.intern_pool)
+
+    def _get_page_responses(self, url, params=None, **kwargs):
+        """Return a generator that GETs and yields pages of responses.
 
         Provides native support for RFC5988 Web Linking.
 
@@ -455,7 +597,7 @@ class RestSession(object):
         response = self.request("GET", url, erc, params=params, **kwargs)
 
         while True:
-            yield extract_and_parse_json(response)
+            yield response
 
             if response.links.get("next"):
                 next_url = response.links.get("next").get("url")
@@ -474,7 +616,36 @@ class RestSession(object):
             else:
                 break
 
-    def get_items(self, url, params=None, **kwargs):
+    def get_pages(self, url, params=None, intern_pool=None, **kwargs):
+        """Return a generator that GETs and yields pages of data.
+
+        Provides native support for RFC5988 Web Linking.
+
+        Args:
+            url(str): The URL of the API endpoint.
+            params(dict): The parameters for the HTTP GET request.
+            intern_pool(InternPool): An InternPool to use for parsing the
+                pages of this iteration, instead of the session's pool.
+            **kwargs:
+                erc(int): The expected (success) response code for the request.
+                others: Passed on to the requests package.
+
+        Raises:
+            ApiError: If anything other than the expected response code is
+                returned by the Webex API endpoint.
+
+        """
+        check_type(intern_pool, InternPool, optional=True)
+
+        if intern_pool is None:
+            intern_pool = self.intern_pool
+
+        for response in self._get_page_responses(url, params, **kwargs):
+            yield extract_and_parse_json(response, intern_pool=intern_pool)
+
+    def get_items(
+        self, url, params=None, fields=None, intern_pool=None, **kwargs
+    ):
         """Return a generator that GETs and yields individual JSON `items`.
 
         Yields individual `items` from Webex"s top-level {"items": [...]}
@@ -482,9 +653,18 @@ class RestSession(object):
         generator will request additional pages as needed until all items have
         been returned.
 
+        When `fields` are provided, each item is projected down to those
+        fields as soon as its page is decoded; the rest of the item's data is
+        released with the page, so the memory held by the yielded items scales
+        with the fields kept rather than with the full payloads.
+
         Args:
             url(str): The URL of the API endpoint.
             params(dict): The parameters for the HTTP GET request.
+            fields(list): The top-level item fields to keep; all other fields
+                are dropped.  Fields missing from an item are omitted.
+            intern_pool(InternPool): An InternPool to use for parsing the
+                items of this iteration, instead of the session's pool.
             **kwargs:
                 erc(int): The expected (success) response code for the request.
                 others: Passed on to the requests package.
@@ -496,8 +676,12 @@ class RestSession(object):
                 top-level dictionary with an "items" key.
 
         """
+        check_type(fields, (list, tuple), optional=True)
+
         # Get generator for pages of JSON data
-        pages = self.get_pages(url, params=params, **kwargs)
+        pages = self.get_pages(
+            url, params=params, intern_pool=intern_pool, **kwargs
+        )
 
         for json_page in pages:
             assert isinstance(json_page, dict)
@@ -512,10 +696,78 @@ class RestSession(object):
                 )
                 raise MalformedResponse(error_message)
 
+            elif fields:
+                for item in items:
+                    yield project_fields(item, fields)
+
             else:
                 for item in items:
                     yield item
 
+    def get_raw_items(self, url, params=None, **kwargs):
+        """Return a generator that GETs and yields the raw JSON of `items`.
+
+        Like `get_items()`, but yields the JSON text of each item as it was
+        returned by Webex, without building Python objects for the items.
+        Only one page of data is held in memory at a time.
+
+        Args:
+            url(str): The URL of the API endpoint.
+            params(dict): The parameters for the HTTP GET request.
+            **kwargs:
+                erc(int): The expected (success) response code for the request.
+                others: Passed on to the requests package.
+
+        Raises:
+            ApiError: If anything other than the expected response code is
+                returned by the Webex API endpoint.
+            MalformedResponse: If the returned response does not contain a
+                top-level dictionary with an "items" key.
+
+        """
+        for response in self._get_page_responses(url, params, **kwargs):
+            for raw_item in extract_raw_items(response):
+                yield raw_item
+
+    def export_items(self, url, sink, params=None, **kwargs):
+        """GET all `items` and write them to a newline-delimited JSON sink.
+
+        Items are streamed page by page straight from the response bodies to
+        the sink, so memory use stays constant no matter how many items are
+        exported.
+
+        Args:
+            url(str): The URL of the API endpoint.
+            sink(NDJSONWriter, file): An NDJSONWriter, or a writable binary
+                file-like object, to which the items will be written.
+            params(dict): The parameters for the HTTP GET request.
+            **kwargs:
+                erc(int): The expected (success) response code for the request.
+                others: Passed on to the requests package.
+
+        Returns:
+            int: The number of items written.
+
+        Raises:
+            ApiError: If anything other than the expected response code is
+                returned by the Webex API endpoint.
+            MalformedResponse: If the returned response does not contain a
+                top-level dictionary with an "items" key.
+
+        """
+        writer = sink if isinstance(sink, NDJSONWriter) else NDJSONWriter(sink)
+
+        count = 0
+        try:
+            for raw_item in self.get_raw_items(url, params=params, **kwargs):
+                writer.write(raw_item)
+                count += 1
+        finally:
+            if writer is not sink:
+                writer.close()
+
+        return count
+
     def post(self, url, json=None, data=None, **kwargs):
         """Sends a POST request.
 
@@ -566,6 +818,7 @@ class RestSession(object):
         response = self.request(
             "PUT", url, erc, json=json, data=data, **kwargs
         )
+        self._evict_cached(url)
         return extract_and_parse_json(response)
 
     def delete(self, url, **kwargs):
@@ -588,3 +841,134 @@ class RestSession(object):
         erc = kwargs.pop("erc", EXPECTED_RESPONSE_CODE["DELETE"])
 
         self.request("DELETE", url, erc, **kwargs)
+        self._evict_cached(url)
+
+    def file_info(self, url, **kwargs):
+        """Get the metadata of a file, with a HEAD request to its URL.
+
+        Args:
+            url(str): The URL of the file (for example, one of the content
+                URLs of a message's `files`).
+            **kwargs: Passed on to the requests package.
+
+        Returns:
+            FileInfo: The name, size and content type of the file.
+
+        Raises:
+            ApiError: If anything other than the expected response code is
+                returned by the Webex API endpoint.
+
+        """
+        check_type(url, str)
+
+        kwargs.setdefault("allow_redirects", True)
+        response = self.request(
+            "HEAD", url, EXPECTED_RESPONSE_CODE["GET"], **kwargs
+        )
+        headers = response.headers
+        size = headers.get("Content-Length")
+        return FileInfo(
+            name=_file_name(headers.get("Content-Disposition")),
+            size=int(size) if size and size.isdigit() else None,
+            contentType=headers.get("Content-Type"),
+            ranges=headers.get("Accept-Ranges", "").lower() == "bytes",
+        )
+
+    def download(
+        self,
+        url,
+        path=None,
+        directory=None,
+        chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE,
+        resume=True,
+        info=None,
+        **kwargs,
+    ):
+        """Download a file, streaming it to disk in chunks.
+
+        The file is written to `path` + ".part" and renamed once complete,
+        so only complete files ever appear at `path`.  If a partial download
+        is found and the server accepts range requests, the download resumes
+        where it stopped.  Memory use is bounded by `chunk_size`, no matter
+        the size of the file.
+
+        Args:
+            url(str): The URL of the file.
+            path(str): The path to write the file to.  Defaults to the file's
+                name (from its headers) in `directory`.
+            directory(str): The directory to write the file to, when `path`
+                is not provided.  Defaults to the current directory.
+            chunk_size(int): The size of the chunks read and written, in
+                bytes.
+            resume(bool): Resume a partial download, if possible.
+            info(FileInfo): The file's metadata, if it was already retrieved
+                with `file_info()`.
+            **kwargs: Passed on to the requests package.
+
+        Returns:
+            str: The path of the downloaded file.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ApiError: If anything other than the expected response code is
+                returned by the Webex API endpoint.
+            IOError: If the download is incomplete.
+
+        """
+        check_type(url, str)
+        check_type(path, str, optional=True)
+        check_type(directory, str, optional=True)
+        check_type(chunk_size, int)
+        check_type(resume, bool)
+        check_type(info, FileInfo, optional=True)
+
+        if info is None:
+            info = self.file_info(url, **kwargs)
+        if path is None:
+            name = info.name or os.path.basename(
+                urllib.parse.urlparse(url).path
+            )
+            path = os.path.join(directory or os.curdir, name)
+
+        partial_path = path + PARTIAL_DOWNLOAD_SUFFIX
+        offset = 0
+        if resume and info.ranges and os.path.exists(partial_path):
+            offset = os.path.getsize(partial_path)
+            if info.size is not None and offset > info.size:
+                offset = 0
+
+        if (
+            not os.path.exists(partial_path)
+            or info.size is None
+            or offset < info.size
+        ):
+            if offset:
+                headers = dict(kwargs.pop("headers", None) or {})
+                headers["Range"] = "bytes={}-".format(offset)
+                response = self.request(
+                    "GET", url, 206, headers=headers, stream=True, **kwargs
+                )
+            else:
+                response = self.request(
+                    "GET",
+                    url,
+                    EXPECTED_RESPONSE_CODE["GET"],
+                    stream=True,
+                    **kwargs,
+                )
+            try:
+                with open(partial_path, "ab" if offset else "wb") as file:
+                    for chunk in response.iter_content(chunk_size):
+                        file.write(chunk)
+            finally:
+                response.close()
+
+        size = os.path.getsize(partial_path)
+        if info.size is not None and size != info.size:
+            raise IOError(
+                "Incomplete download of {}: {} of {} bytes.".format(
+                    url, size, info.size
+                )
+            )
+        os.replace(partial_path, path)
+        return path
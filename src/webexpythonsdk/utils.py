@@ -23,10 +23,15 @@ SOFTWARE.
 
 native_str = str
 
+import io
+import itertools
 import json
 import mimetypes
 import os
+import re
 import sys
+import threading
+import time
 import urllib.parse
 import warnings
 from collections import namedtuple, OrderedDict
@@ -36,6 +41,7 @@ from datetime import datetime, timedelta, tzinfo
 from .config import WEBEX_DATETIME_FORMAT
 from .exceptions import (
     ApiError,
+    MalformedResponse,
     RateLimitError,
 )
 from .response_codes import RATE_LIMIT_RESPONSE_CODE
@@ -115,6 +121,116 @@ def open_local_file(file_path):
     )
 
 
+class BufferReader(object):
+    """A read-only, file-like view of a bytes-like object.
+
+    Reads from the buffer (bytes, bytearray, memoryview, mmap, etc.) without
+    copying it; only the chunks read are copied.  Its `len` is the number of
+    bytes left to read, as expected by the multipart encoder.
+
+    """
+
+    def __init__(self, buffer, position=0):
+        """Init a new BufferReader.
+
+        Args:
+            buffer: A bytes-like object.
+            position(int): The position to start reading from.
+
+        """
+        super(BufferReader, self).__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = position
+
+    @property
+    def len(self):
+        """The number of bytes left to read."""
+        return max(len(self._view) - self._position, 0)
+
+    def read(self, size=-1):
+        """Read (at most) `size` bytes; or all remaining bytes."""
+        if size is None or size < 0:
+            size = self.len
+        chunk = self._view[self._position : self._position + size]
+        self._position += len(chunk)
+        return chunk.tobytes()
+
+    def tell(self):
+        """The current position."""
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Change the current position."""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def close(self):
+        """Release the buffer."""
+        self._view.release()
+
+
+def open_file_data(data):
+    """Return an EncodableFile for in-memory data or a file-like object.
+
+    Args:
+        data: A bytes-like object (bytes, bytearray, memoryview, mmap, etc.),
+            a readable binary file-like object, or a (file name, data) or
+            (file name, data, content type) tuple of either.  Without a file
+            name, the name of the file object is used, if it has one.
+
+    Returns:
+        EncodableFile: The file, ready to be streamed by a multipart encoder;
+        bytes-like objects and BytesIO objects are not copied.
+
+    Raises:
+        ValueError: If `data` is not a supported type.
+
+    """
+    file_name = content_type = None
+    if isinstance(data, tuple):
+        if len(data) not in (2, 3):
+            raise ValueError(
+                "File tuples should be (file name, data) or (file name, "
+                "data, content type)."
+            )
+        file_name, data, content_type = (data + (None,))[:3]
+
+    if file_name is None:
+        file_name = os.path.basename(str(getattr(data, "name", "") or ""))
+    file_name = file_name or "file"
+    content_type = (
+        content_type or mimetypes.guess_type(file_name)[0] or "text/plain"
+    )
+
+    if hasattr(data, "getbuffer"):
+        # BytesIO; read its buffer in place, from the current position
+        file_object = BufferReader(data.getbuffer(), data.tell())
+    else:
+        try:
+            # bytes, bytearray, memoryview, mmap, etc.
+            file_object = BufferReader(data)
+        except TypeError:
+            if not hasattr(data, "read"):
+                raise ValueError(
+                    "Unsupported file data: {}".format(type(data).__name__)
+                ) from None
+            try:
+                data.fileno()
+            except (AttributeError, OSError):
+                # Neither sized nor seekable by the encoder; read it
+                file_object = BufferReader(data.read())
+            else:
+                file_object = data
+
+    return EncodableFile(
+        file_name=file_name, file_object=file_object, content_type=content_type
+    )
+
+
 def check_type(obj, acceptable_types, optional=False):
     """Object is an instance of one of the acceptable types or None.
 
@@ -176,6 +292,16 @@ def dict_from_items_with_values(*dictionaries, **items):
     return result
 
 
+def chunked(iterable, size):
+    """Yield lists of (up to) `size` items read, lazily, from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def raise_if_extra_kwargs(kwargs):
     """Raise a TypeError if kwargs is not empty."""
     if kwargs:
@@ -207,18 +333,445 @@ def check_response_code(response, expected_response_code):
         raise ApiError(response)
 
 
-def extract_and_parse_json(response):
+def extract_and_parse_json(response, intern_pool=None):
     """Extract and parse the JSON data from an requests.response object.
 
     Args:
         response(requests.response): The response object returned by a request
             using the requests package.
+        intern_pool(InternPool): Optional pool used to deduplicate the keys
+            and identifier values of the parsed JSON objects.
 
     Returns:
         The parsed JSON data as the appropriate native Python data type.
 
     """
-    return json.loads(response.text, object_hook=OrderedDict)
+    return parse_json(response.text, intern_pool=intern_pool)
+
+
+def parse_json(text, intern_pool=None):
+    """Parse JSON text (into OrderedDict objects).
+
+    Args:
+        text(str): The JSON text.
+        intern_pool(InternPool): Optional pool used to deduplicate the keys
+            and identifier values of the parsed JSON objects.
+
+    Returns:
+        The parsed JSON data as the appropriate native Python data type.
+
+    """
+    if intern_pool is None:
+        return json.loads(text, object_hook=OrderedDict)
+    else:
+        return json.loads(
+            text, object_pairs_hook=intern_pool.object_pairs_hook
+        )
+
+
+class InternPool(object):
+    """A pool of canonical strings for deduplicating parsed JSON data.
+
+    Large result sets repeat the same identifiers (room IDs, person IDs,
+    e-mail addresses, org IDs, etc.) many thousands of times, and the JSON
+    decoder creates a separate string object for every occurrence.  When an
+    InternPool is used to parse the responses, every JSON object key, and the
+    values of the identifier fields, are replaced with a single shared
+    instance of each distinct string.
+
+    Unlike `sys.intern()`, the pool is scoped to its owner (a session or a
+    single iteration) and its strings are released when the pool is cleared
+    or garbage collected.
+
+    """
+
+    DEFAULT_FIELDS = frozenset(
+        [
+            "id",
+            "actorId",
+            "appId",
+            "creatorId",
+            "email",
+            "emails",
+            "orgId",
+            "ownerId",
+            "parentId",
+            "personEmail",
+            "personId",
+            "personOrgId",
+            "roomId",
+            "roomType",
+            "teamId",
+            "toPersonEmail",
+            "toPersonId",
+        ]
+    )
+
+    def __init__(self, fields=None):
+        """Init a new InternPool.
+
+        Args:
+            fields(list): The JSON object keys whose (string, or list of
+                strings) values should be interned.  Defaults to the Webex
+                identifier fields in `InternPool.DEFAULT_FIELDS`.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(fields, (list, tuple, set, frozenset), optional=True)
+
+        super(InternPool, self).__init__()
+
+        self.fields = (
+            frozenset(fields) if fields is not None else self.DEFAULT_FIELDS
+        )
+        self._strings = {}
+
+    def __len__(self):
+        """The number of distinct strings in the pool."""
+        return len(self._strings)
+
+    def intern(self, string):
+        """Return the pool's canonical instance of a string."""
+        return self._strings.setdefault(string, string)
+
+    def object_pairs_hook(self, pairs):
+        """Build an OrderedDict from JSON key-value pairs, interning them.
+
+        Suitable for use as the `object_pairs_hook` of `json.loads()`.
+
+        """
+        strings = self._strings
+        fields = self.fields
+        result = OrderedDict()
+        for key, value in pairs:
+            key = strings.setdefault(key, key)
+            if key in fields:
+                if isinstance(value, str):
+                    value = strings.setdefault(value, value)
+                elif isinstance(value, list):
+                    value = [
+                        strings.setdefault(item, item)
+                        if isinstance(item, str)
+                        else item
+                        for item in value
+                    ]
+            result[key] = value
+        return result
+
+    def clear(self):
+        """Release all of the strings held by the pool."""
+        self._strings.clear()
+
+
+class BoundedSet(object):
+    """A set that remembers (at most) the most recently added items.
+
+    Once the set holds `maxsize` items, adding an item forgets the oldest
+    one; so the memory used to detect duplicates (for example, of event or
+    message IDs) is bounded.  The set is thread-safe.
+
+    """
+
+    def __init__(self, maxsize):
+        """Init a new BoundedSet.
+
+        Args:
+            maxsize(int): The maximum number of items remembered.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `maxsize` is not positive.
+
+        """
+        check_type(maxsize, int)
+
+        if maxsize <= 0:
+            raise ValueError("`maxsize` must be a positive number.")
+
+        super(BoundedSet, self).__init__()
+
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """The number of items in the set."""
+        return len(self._items)
+
+    def __contains__(self, item):
+        """Whether the item is in the set."""
+        return item in self._items
+
+    def add(self, item):
+        """Add an item to the set.
+
+        Returns:
+            bool: True if the item was added; False if it was already in the
+            set.
+
+        """
+        with self._lock:
+            if item in self._items:
+                return False
+            self._items[item] = None
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+            return True
+
+    def discard(self, item):
+        """Remove an item from the set, if it is present."""
+        with self._lock:
+            self._items.pop(item, None)
+
+    def clear(self):
+        """Remove all of the items from the set."""
+        with self._lock:
+            self._items.clear()
+
+
+class TokenBucket(object):
+    """A thread-safe token bucket rate limiter.
+
+    Tokens are added to the bucket at a constant `rate` (per second), up to
+    its `capacity`.  Each request acquires a token, waiting for one to become
+    available if necessary; so requests made through the bucket, from any
+    number of threads, are paced to the rate.
+
+    """
+
+    def __init__(
+        self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep
+    ):
+        """Init a new TokenBucket.
+
+        Args:
+            rate(int, float): The number of tokens added per second.
+            capacity(int): The maximum number of tokens in the bucket (the
+                size of the largest burst).  Defaults to `rate` (rounded up).
+            clock(callable): Function returning the current time in seconds.
+            sleep(callable): Function used to wait for tokens.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If `rate` or `capacity` is not positive.
+
+        """
+        check_type(rate, (int, float))
+        check_type(capacity, int, optional=True)
+
+        if capacity is None:
+            capacity = max(1, int(rate + 0.999999))
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("`rate` and `capacity` must be positive numbers.")
+
+        super(TokenBucket, self).__init__()
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = None
+
+    def _refill(self, now):
+        if self._paused_until is not None:
+            if now < self._paused_until:
+                return
+            self._updated = max(self._updated, self._paused_until)
+            self._paused_until = None
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """Take tokens from the bucket, waiting until they are available.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._paused_until is not None:
+                    wait = self._paused_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                else:
+                    wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def pause(self, seconds):
+        """Empty the bucket and stop issuing tokens for a number of seconds.
+
+        Use when the server signals that the rate limit was exceeded anyway
+        (for example, with a Retry-After header).
+
+        """
+        with self._lock:
+            until = self._clock() + seconds
+            if self._paused_until is None or until > self._paused_until:
+                self._paused_until = until
+            self._tokens = 0.0
+
+
+_json_decoder = json.JSONDecoder()
+
+
+def _skip_whitespace(text, index):
+    """Return the index of the next non-whitespace character in text."""
+    while index < len(text) and text[index] in " \t\n\r":
+        index += 1
+    return index
+
+
+# A JSON string, and the characters delimiting JSON strings, objects and
+# arrays; used to find where JSON values end, without decoding them
+_JSON_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_JSON_DELIMITER = re.compile(r'["{}\[\]]')
+_JSON_SCALAR = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+
+
+def _json_value_end(text, index):
+    """Return the index just past the JSON value starting at index.
+
+    Only the structure of the value is scanned; no Python objects are built,
+    and the contents of the value are not validated.
+
+    """
+    if text[index] == '"':
+        match = _JSON_STRING.match(text, index)
+        if match is None:
+            raise ValueError("Unterminated string")
+        return match.end()
+
+    if text[index] in "{[":
+        depth = 0
+        while True:
+            match = _JSON_DELIMITER.search(text, index)
+            if match is None:
+                raise ValueError("Unterminated object or array")
+            index = match.start()
+            if match.group() == '"':
+                index = _json_value_end(text, index)
+                continue
+            depth += 1 if match.group() in "{[" else -1
+            index += 1
+            if depth == 0:
+                return index
+
+    match = _JSON_SCALAR.match(text, index)
+    if match is None:
+        raise ValueError("Expecting value")
+    return match.end()
+
+
+def extract_raw_items(response):
+    """Extract the raw JSON text of the `items` in a requests.response object.
+
+    Scans Webex's top-level {"items": [...]} JSON object and yields the
+    JSON text of each item as it appears in the response body, so that the
+    items do not need to be re-encoded before they are written elsewhere.
+    Only the boundaries of the items are scanned; the items are not decoded
+    (or validated).  Items containing line breaks (pretty-printed responses)
+    are re-encoded as compact JSON, so every yielded item fits on a single
+    line.
+
+    Args:
+        response(requests.response): The response object returned by a request
+            using the requests package.
+
+    Yields:
+        str: The JSON text of each item.
+
+    Raises:
+        MalformedResponse: If the response body does not contain a top-level
+            JSON object with an "items" list.
+
+    """
+    text = response.text
+    index = _skip_whitespace(text, 0)
+
+    try:
+        if text[index] != "{":
+            raise ValueError("Expecting a JSON object")
+        index += 1
+
+        while True:
+            index = _skip_whitespace(text, index)
+            if text[index] == "}":
+                break
+            elif text[index] == ",":
+                index += 1
+                continue
+
+            key, index = _json_decoder.raw_decode(text, index)
+            index = _skip_whitespace(text, index)
+            if text[index] != ":":
+                raise ValueError("Expecting ':' delimiter")
+            index = _skip_whitespace(text, index + 1)
+
+            if key != "items":
+                # Skip over the value
+                index = _json_value_end(text, index)
+                continue
+
+            if text[index] != "[":
+                raise ValueError("Expecting 'items' to be a JSON array")
+            index += 1
+
+            while True:
+                index = _skip_whitespace(text, index)
+                if text[index] == "]":
+                    return
+                elif text[index] == ",":
+                    index += 1
+                    continue
+
+                end = _json_value_end(text, index)
+                raw_item = text[index:end]
+                if "\n" in raw_item or "\r" in raw_item:
+                    raw_item = json.dumps(
+                        json.loads(raw_item),
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    )
+                yield raw_item
+                index = end
+
+    except (IndexError, ValueError) as e:
+        raise MalformedResponse(
+            "Unable to parse the JSON 'items' in the response: {}".format(e)
+        ) from e
+
+    raise MalformedResponse(
+        "'items' key not found in JSON data: {!r}".format(text)
+    )
+
+
+def project_fields(json_data, fields):
+    """Project a JSON object down to the requested (top-level) fields.
+
+    Args:
+        json_data(dict): The parsed JSON object.
+        fields(list): The fields to keep.  Fields that are not present in the
+            JSON object are omitted.
+
+    Returns:
+        OrderedDict: A new dictionary containing only the requested fields.
+
+    """
+    return OrderedDict(
+        (field, json_data[field]) for field in fields if field in json_data
+    )
 
 
 def json_dict(json_data):
@@ -245,6 +798,34 @@ def json_dict(json_data):
         )
 
 
+def object_json_data(data_object):
+    """Given a data object or JSON data; return its JSON data as a dictionary.
+
+    Args:
+        data_object: An ImmutableData model, SimpleDataModel object,
+            dictionary or JSON string.
+
+    Returns:
+        A Python dictionary with the contents of the data object.
+
+    Raises:
+        TypeError: If the input object is not a data object, dictionary or
+            string.
+
+    """
+    if isinstance(data_object, (dict, str)):
+        return json_dict(data_object)
+    elif hasattr(data_object, "to_dict"):
+        return data_object.to_dict()
+    elif hasattr(data_object, "__dict__"):
+        return vars(data_object)
+    else:
+        raise TypeError(
+            "'data_object' must be a data object, dictionary or valid JSON "
+            "string; received: {!r}".format(data_object)
+        )
+
+
 def make_attachment(card):
     """Given a card, makes a card attachment by attaching the correct
      content type and content.
@@ -0,0 +1,366 @@
+"""Receive Webex webhook deliveries in WSGI and ASGI web applications.
+
+Classes:
+    WebhookReceiver: Verifies, parses and acknowledges webhook deliveries,
+        dispatching the webhook events to handlers on a bounded worker pool.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import queue
+import threading
+import time
+
+from .config import DEFAULT_MAX_WORKERS
+from .models.immutable import immutable_data_factory
+from .utils import check_type
+
+
+logger = logging.getLogger(__name__)
+
+
+SIGNATURE_HEADER = "X-Spark-Signature"
+
+DEFAULT_MAX_QUEUE_SIZE = 1000
+
+WEBHOOK_EVENT_OBJECT_TYPE = "webhook_event"
+
+
+def compute_signature(secret, body):
+    """Compute the `X-Spark-Signature` of a webhook delivery body.
+
+    Args:
+        secret(str): The secret of the webhook.
+        body(bytes): The raw body of the delivery.
+
+    Returns:
+        str: The hexadecimal HMAC-SHA1 digest of the body.
+
+    """
+    return hmac.new(secret.encode("utf-8"), body, hashlib.sha1).hexdigest()
+
+
+class WebhookReceiver(object):
+    """Receive webhook deliveries and dispatch them to handlers.
+
+    Each delivery is verified against its `X-Spark-Signature` (when the
+    receiver has the webhook secret), parsed into a WebhookEvent and queued,
+    and acknowledged immediately; so slow handlers (for example, handlers
+    that call the Webex APIs) never delay the acknowledgement and cause
+    Webex to time out the delivery.
+
+    The queued events are dispatched to the registered handlers by a bounded
+    pool of worker threads.  The queue is bounded too: when it is full, new
+    deliveries are shed (answered with 503 Service Unavailable) instead of
+    letting the backlog, and the latency of every event, grow without limit.
+
+    The receiver is a WSGI application, and its `asgi` method is an ASGI
+    application; either may be mounted on the URL targeted by your webhooks.
+
+    """
+
+    def __init__(
+        self,
+        secret=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_queue_size=DEFAULT_MAX_QUEUE_SIZE,
+        object_factory=immutable_data_factory,
+    ):
+        """Init a new WebhookReceiver.
+
+        Args:
+            secret(str): The secret of the webhooks.  If provided, deliveries
+                without a valid signature are rejected.
+            max_workers(int): The number of worker threads running the
+                handlers.
+            max_queue_size(int): The maximum number of events waiting to be
+                handled.
+            object_factory(callable): The factory function used to create
+                the WebhookEvent objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(secret, str, optional=True)
+        check_type(max_workers, int)
+        check_type(max_queue_size, int)
+
+        super(WebhookReceiver, self).__init__()
+
+        self.secret = secret
+        self.max_workers = max_workers
+        self._object_factory = object_factory
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._handlers = []
+        self._workers = []
+        self._lock = threading.Lock()
+
+        self._counts = dict.fromkeys(
+            [
+                "received",
+                "accepted",
+                "rejected",
+                "malformed",
+                "shed",
+                "handled",
+                "handler_errors",
+            ],
+            0,
+        )
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    def register(self, handler, resource=None, event=None):
+        """Register a handler for webhook events.
+
+        Args:
+            handler(callable): Called, on a worker thread, with each
+                matching WebhookEvent.
+            resource(str): Only dispatch events for this resource type.
+            event(str): Only dispatch events of this type ("created",
+                "updated", "deleted", etc.).
+
+        Returns:
+            callable: The handler.
+
+        """
+        check_type(resource, str, optional=True)
+        check_type(event, str, optional=True)
+
+        self._handlers.append((handler, resource, event))
+        return handler
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self._counts[name] += value
+
+    def verify(self, body, signature):
+        """Whether a delivery body matches its signature (bool).
+
+        Always True if the receiver has no secret.
+
+        """
+        if self.secret is None:
+            return True
+        if not signature:
+            return False
+        expected = compute_signature(self.secret, body).encode("ascii")
+        # Compare bytes; a forged signature may contain non-ASCII characters
+        signature = signature.strip().lower().encode("utf-8", "replace")
+        return hmac.compare_digest(expected, signature)
+
+    def start(self):
+        """Start the worker threads (if they are not already running)."""
+        with self._lock:
+            if self._workers:
+                return
+            for number in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._work,
+                    name="WebhookReceiver-{}".format(number),
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def stop(self, timeout=None):
+        """Stop the worker threads, after the queued events are handled."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join(timeout)
+
+    def _work(self):
+        while True:
+            webhook_event = self._queue.get()
+            try:
+                if webhook_event is None:
+                    return
+                self._dispatch(webhook_event)
+            finally:
+                self._queue.task_done()
+
+    def _dispatch(self, webhook_event):
+        started = time.monotonic()
+        for handler, resource, event in self._handlers:
+            if resource is not None and webhook_event.resource != resource:
+                continue
+            if event is not None and webhook_event.event != event:
+                continue
+            try:
+                handler(webhook_event)
+            except Exception:
+                self._count("handler_errors")
+                logger.exception(
+                    "Error handling webhook event {}.".format(webhook_event.id)
+                )
+        latency = time.monotonic() - started
+        with self._lock:
+            self._counts["handled"] += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+    def receive(self, body, signature=None):
+        """Verify, parse and queue a webhook delivery.
+
+        Args:
+            body(bytes): The raw body of the delivery.
+            signature(str): The value of the delivery's `X-Spark-Signature`
+                header.
+
+        Returns:
+            int: The HTTP status code to answer the delivery with: 200 (OK),
+            400 (malformed body), 401 (invalid signature) or 503 (shed).
+
+        """
+        self._count("received")
+
+        if not self.verify(body, signature):
+            self._count("rejected")
+            logger.warning("Rejected a webhook delivery; invalid signature.")
+            return 401
+
+        try:
+            json_data = json.loads(body.decode("utf-8"))
+            webhook_event = self._object_factory(
+                WEBHOOK_EVENT_OBJECT_TYPE, json_data
+            )
+        except (UnicodeDecodeError, ValueError, TypeError):
+            self._count("malformed")
+            return 400
+
+        self.start()
+        try:
+            self._queue.put_nowait(webhook_event)
+        except queue.Full:
+            self._count("shed")
+            logger.warning(
+                "Shed webhook event {}; the queue is full.".format(
+                    webhook_event.id
+                )
+            )
+            return 503
+
+        self._count("accepted")
+        return 200
+
+    def __call__(self, environ, start_response):
+        """WSGI application receiving webhook deliveries."""
+        if environ.get("REQUEST_METHOD") != "POST":
+            status = 405
+        else:
+            try:
+                length = int(environ.get("CONTENT_LENGTH") or 0)
+            except ValueError:
+                length = 0
+            body = environ["wsgi.input"].read(length) if length else b""
+            status = self.receive(body, environ.get("HTTP_X_SPARK_SIGNATURE"))
+
+        start_response(_status_line(status), [("Content-Length", "0")])
+        return [b""]
+
+    async def asgi(self, scope, receive, send):
+        """ASGI application receiving webhook deliveries."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] != "http":
+            return
+
+        if scope.get("method") != "POST":
+            status = 405
+        else:
+            chunks = []
+            while True:
+                message = await receive()
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+            signature = None
+            for name, value in scope.get("headers", []):
+                if name.lower() == SIGNATURE_HEADER.lower().encode("latin-1"):
+                    signature = value.decode("latin-1")
+            status = self.receive(b"".join(chunks), signature)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-length", b"0")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    @property
+    def metrics(self):
+        """Receiver metrics (dict).
+
+        Keys:
+            queue_depth: The number of events waiting to be handled.
+            received: The number of deliveries received.
+            accepted: The number of events queued.
+            rejected: Deliveries rejected because of an invalid signature.
+            malformed: Deliveries rejected because of a malformed body.
+            shed: Events shed because the queue was full.
+            handled: The number of events dispatched to the handlers.
+            handler_errors: The number of exceptions raised by handlers.
+            mean_handler_latency: The mean time, in seconds, taken to
+                dispatch an event to its handlers.
+            max_handler_latency: The maximum time, in seconds, taken to
+                dispatch an event to its handlers.
+
+        """
+        with self._lock:
+            metrics = dict(self._counts)
+            metrics["queue_depth"] = self._queue.qsize()
+            handled = self._counts["handled"]
+            metrics["mean_handler_latency"] = (
+                self._total_latency / handled if handled else 0.0
+            )
+            metrics["max_handler_latency"] = self._max_latency
+        return metrics
+
+
+_STATUS_LINES = {
+    200: "200 OK",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    405: "405 Method Not Allowed",
+    503: "503 Service Unavailable",
+}
+
+
+def _status_line(status):
+    return _STATUS_LINES[status]
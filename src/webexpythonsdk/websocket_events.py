@@ -0,0 +1,664 @@
+"""Receive Webex events over a WebSocket, without a public webhook URL.
+
+Classes:
+    WebSocket: A minimal (RFC 6455) WebSocket client, using only the standard
+        library.
+    WebSocketEventClient: Registers a device with Webex and delivers the
+        events streamed to it as WebhookEvent objects.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import ssl
+import struct
+import threading
+import time
+import urllib.parse
+import uuid
+
+from .models.immutable import immutable_data_factory
+from .utils import BoundedSet, check_type, WebexDateTime
+
+
+logger = logging.getLogger(__name__)
+
+
+DEVICES_URL = "https://wdm-a.wbx2.com/wdm/api/v1/devices"
+
+DEFAULT_DEVICE_NAME = "webexpythonsdk-websocket-client"
+
+DEFAULT_MIN_RECONNECT_DELAY = 1
+
+DEFAULT_MAX_RECONNECT_DELAY = 60
+
+DEFAULT_DEDUP_SIZE = 10000
+
+DEFAULT_PING_INTERVAL = 30
+
+DEFAULT_PING_TIMEOUT = 10
+
+# The cluster part of the public API IDs of the US data center
+DEFAULT_CLUSTER = "us"
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# WebSocket frame opcodes
+_CONTINUATION = 0x0
+_TEXT = 0x1
+_BINARY = 0x2
+_CLOSE = 0x8
+_PING = 0x9
+_PONG = 0xA
+
+
+class WebSocket(object):
+    """A minimal WebSocket client connection.
+
+    Supports `ws://` and `wss://` URLs, text and binary messages (including
+    fragmented messages), and answers pings and close frames.  Extensions
+    (such as compression) are not supported.
+
+    """
+
+    def __init__(self, url, headers=None, timeout=None):
+        """Open a new WebSocket connection.
+
+        Args:
+            url(str): The `ws://` or `wss://` URL of the WebSocket.
+            headers(dict): Additional headers for the opening handshake.
+            timeout(int, float): The socket timeout, in seconds.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If the URL is not a WebSocket URL.
+            ConnectionError: If the server rejects the opening handshake.
+
+        """
+        check_type(url, str)
+        check_type(headers, dict, optional=True)
+
+        super(WebSocket, self).__init__()
+
+        parsed = urllib.parse.urlparse(url)
+        if parsed.scheme not in ("ws", "wss"):
+            raise ValueError("Not a WebSocket URL: {}".format(url))
+        port = parsed.port or (443 if parsed.scheme == "wss" else 80)
+
+        self._socket = socket.create_connection(
+            (parsed.hostname, port), timeout
+        )
+        if parsed.scheme == "wss":
+            context = ssl.create_default_context()
+            self._socket = context.wrap_socket(
+                self._socket, server_hostname=parsed.hostname
+            )
+        self._buffer = b""
+        self._fragments = []
+        self._message_opcode = None
+        self._send_lock = threading.Lock()
+        self.closed = False
+        self.last_received = time.monotonic()
+
+        self._handshake(parsed, port, headers or {})
+
+    def _handshake(self, parsed, port, headers):
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        lines = [
+            "GET {} HTTP/1.1".format(path),
+            "Host: {}:{}".format(parsed.hostname, port),
+            "Upgrade: websocket",
+            "Connection: Upgrade",
+            "Sec-WebSocket-Key: {}".format(key),
+            "Sec-WebSocket-Version: 13",
+        ]
+        lines.extend("{}: {}".format(k, v) for k, v in headers.items())
+        request = "\r\n".join(lines) + "\r\n\r\n"
+        self._socket.sendall(request.encode("utf-8"))
+
+        while b"\r\n\r\n" not in self._buffer:
+            self._fill()
+        head, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        status_line, *header_lines = head.decode("iso-8859-1").split("\r\n")
+        response_headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        accept = base64.b64encode(
+            hashlib.sha1((key + _WEBSOCKET_GUID).encode("ascii")).digest()
+        ).decode("ascii")
+        if (
+            status_line.split()[1:2] != ["101"]
+            or response_headers.get("sec-websocket-accept") != accept
+        ):
+            self._socket.close()
+            raise ConnectionError(
+                "WebSocket handshake failed: {}".format(status_line)
+            )
+
+    def _fill(self):
+        data = self._socket.recv(65536)
+        if not data:
+            self.closed = True
+            raise ConnectionError("The WebSocket connection was closed.")
+        self._buffer += data
+        self.last_received = time.monotonic()
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        # Client frames are masked
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        with self._send_lock:
+            self._socket.sendall(header + mask + masked)
+
+    def _parse_frame(self):
+        """Parse the buffered frame; None if it is not complete yet."""
+        buffer = self._buffer
+        if len(buffer) < 2:
+            return None
+        first, second = buffer[0], buffer[1]
+        length, offset = second & 0x7F, 2
+        if length == 126:
+            if len(buffer) < 4:
+                return None
+            (length,) = struct.unpack_from("!H", buffer, 2)
+            offset = 4
+        elif length == 127:
+            if len(buffer) < 10:
+                return None
+            (length,) = struct.unpack_from("!Q", buffer, 2)
+            offset = 10
+        mask = None
+        if second & 0x80:
+            if len(buffer) < offset + 4:
+                return None
+            mask, offset = buffer[offset : offset + 4], offset + 4
+        if len(buffer) < offset + length:
+            return None
+        payload = buffer[offset : offset + length]
+        self._buffer = buffer[offset + length :]
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return bool(first & 0x80), first & 0x0F, payload
+
+    def _recv_frame(self):
+        # Frames are only consumed once complete, so a timeout never loses
+        # a partially received frame
+        frame = self._parse_frame()
+        while frame is None:
+            self._fill()
+            frame = self._parse_frame()
+        return frame
+
+    def send(self, message):
+        """Send a text (str) or binary (bytes) message."""
+        if isinstance(message, str):
+            self._send_frame(_TEXT, message.encode("utf-8"))
+        else:
+            self._send_frame(_BINARY, bytes(message))
+
+    def ping(self, payload=b""):
+        """Send a ping; the server answers with a pong."""
+        self._send_frame(_PING, payload)
+
+    def recv(self, timeout=None):
+        """Receive the next message.
+
+        Args:
+            timeout(int, float): The maximum time, in seconds, to wait for
+                data.  A timed out `recv()` may be called again; no data is
+                lost.
+
+        Returns:
+            str, bytes: The message; str for text messages.
+
+        Raises:
+            ConnectionError: If the connection is closed.
+            socket.timeout: If no data is received within `timeout`.
+
+        """
+        self._socket.settimeout(timeout)
+        while True:
+            fin, opcode, payload = self._recv_frame()
+            if opcode == _PING:
+                self._send_frame(_PONG, payload)
+            elif opcode == _PONG:
+                continue
+            elif opcode == _CLOSE:
+                (status_code,) = struct.unpack(
+                    "!H", payload[:2] or b"\x03\xe8"
+                )
+                self.close(status_code)
+                raise ConnectionError("The WebSocket connection was closed.")
+            else:
+                if opcode != _CONTINUATION:
+                    self._message_opcode = opcode
+                self._fragments.append(payload)
+                if fin:
+                    message = b"".join(self._fragments)
+                    self._fragments = []
+                    if self._message_opcode == _TEXT:
+                        return message.decode("utf-8")
+                    return message
+
+    def close(self, status_code=1000):
+        """Close the connection."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._send_frame(_CLOSE, struct.pack("!H", status_code))
+        except OSError:
+            pass
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+
+def _hydra_id(kind, uuid_string, cluster=DEFAULT_CLUSTER):
+    """Convert an internal (UUID) Webex ID to a public API ID."""
+    if not uuid_string:
+        return None
+    uri = "ciscospark://{}/{}/{}".format(cluster, kind, uuid_string)
+    return base64.b64encode(uri.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def hydra_cluster(public_id):
+    """The cluster (region) part of a public API ID.
+
+    For example, "us" for the IDs of the US data center, and
+    "urn:TEAM:eu-central-1_k" for the IDs of the EU (Frankfurt) one.
+
+    Args:
+        public_id(str): A public API ID; for example, a person ID.
+
+    Returns:
+        str: The cluster of the ID.
+
+    Raises:
+        ValueError: If `public_id` is not a public API ID.
+
+    """
+    check_type(public_id, str)
+    try:
+        padded = public_id + "=" * (-len(public_id) % 4)
+        uri = base64.b64decode(padded, altchars=b"-_").decode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Not a public API ID: {}".format(public_id)) from None
+    prefix, _, path = uri.partition("://")
+    cluster = path.rsplit("/", 2)[0]
+    if prefix != "ciscospark" or not cluster or cluster == path:
+        raise ValueError("Not a public API ID: {}".format(public_id))
+    return cluster
+
+
+def activity_event(activity, cluster=DEFAULT_CLUSTER):
+    """Convert a conversation activity to webhook event JSON data.
+
+    Args:
+        activity(dict): A conversation activity, streamed over the WebSocket.
+        cluster(str): The cluster (region) of the public API IDs; see
+            `hydra_cluster()`.
+
+    Returns:
+        dict: The JSON data of the equivalent webhook event; or None if the
+        activity has no webhook equivalent.
+
+    """
+
+    def hydra_id(kind, uuid_string):
+        return _hydra_id(kind, uuid_string, cluster)
+
+    verb = activity.get("verb")
+    actor = activity.get("actor") or {}
+    target = activity.get("target") or {}
+    obj = activity.get("object") or {}
+    roomId = hydra_id("ROOM", target.get("id"))
+    data = {"roomId": roomId, "created": activity.get("published")}
+
+    if verb in ("post", "share"):
+        resource, event = "messages", "created"
+        data.update(
+            id=hydra_id("MESSAGE", activity.get("id")),
+            personId=hydra_id("PEOPLE", actor.get("entryUUID")),
+            personEmail=actor.get("emailAddress"),
+        )
+    elif verb == "delete" and obj.get("objectType") == "activity":
+        resource, event = "messages", "deleted"
+        data.update(id=hydra_id("MESSAGE", obj.get("id")))
+    elif verb in ("add", "leave") and obj.get("objectType") == "person":
+        resource = "memberships"
+        event = "created" if verb == "add" else "deleted"
+        data.update(
+            personId=hydra_id("PEOPLE", obj.get("entryUUID") or obj.get("id")),
+            personEmail=obj.get("emailAddress"),
+        )
+    elif verb == "cardAction":
+        resource, event = "attachmentActions", "created"
+        data.update(
+            id=hydra_id("ATTACHMENT_ACTION", activity.get("id")),
+            messageId=hydra_id(
+                "MESSAGE", (activity.get("parent") or {}).get("id")
+            ),
+            personId=hydra_id("PEOPLE", actor.get("entryUUID")),
+        )
+    else:
+        return None
+
+    return {
+        "id": None,
+        "name": "websocket",
+        "resource": resource,
+        "event": event,
+        "actorId": hydra_id("PEOPLE", actor.get("entryUUID")),
+        "created": activity.get("published"),
+        "data": {k: v for k, v in data.items() if v is not None},
+    }
+
+
+class WebSocketEventClient(object):
+    """Receive Webex events over a persistent WebSocket connection.
+
+    For bots (and integrations) without a public URL to receive webhooks:
+    instead of polling, the client registers a device with Webex, opens the
+    device's WebSocket and delivers the message, membership and attachment
+    action events streamed to it, as WebhookEvent objects, to the registered
+    handlers; usually well under a second after they occur.  Note that, as
+    with webhooks, the events only carry the IDs of the resources involved.
+
+    The connection is pinged when it has been idle for `ping_interval`
+    seconds, and considered lost when nothing (not even the pong) is
+    received within `ping_timeout` seconds more; so a half-open connection
+    is detected too.  The connection is re-established, with exponential
+    backoff, when it drops; events redelivered after a reconnection are
+    dropped by ID.
+
+    The events carry public API IDs, whose cluster (region) is taken from
+    the ID of the authenticated user, when the device is registered.
+
+    """
+
+    def __init__(
+        self,
+        api,
+        device_name=DEFAULT_DEVICE_NAME,
+        websocket_url=None,
+        min_reconnect_delay=DEFAULT_MIN_RECONNECT_DELAY,
+        max_reconnect_delay=DEFAULT_MAX_RECONNECT_DELAY,
+        dedup_size=DEFAULT_DEDUP_SIZE,
+        ping_interval=DEFAULT_PING_INTERVAL,
+        ping_timeout=DEFAULT_PING_TIMEOUT,
+        cluster=None,
+        object_factory=immutable_data_factory,
+    ):
+        """Init a new WebSocketEventClient.
+
+        Args:
+            api(WebexAPI): The WebexAPI object whose access token, and
+                session, are used to register the device.
+            device_name(str): The name of the registered device.
+            websocket_url(str): Connect to this WebSocket URL instead of
+                registering a device (for example, a local test server).
+            min_reconnect_delay(int, float): The delay, in seconds, before
+                the first attempt to reconnect.
+            max_reconnect_delay(int, float): The maximum delay, in seconds,
+                between attempts to reconnect.
+            dedup_size(int): The number of recent event IDs remembered to
+                drop duplicates.
+            ping_interval(int, float): How long, in seconds, the connection
+                may be idle before it is pinged.
+            ping_timeout(int, float): How long, in seconds, to wait for the
+                pong before the connection is considered lost.
+            cluster(str): The cluster (region) of the public API IDs in the
+                events.  Defaults to the cluster of the authenticated user's
+                ID (or "us", when connecting to `websocket_url`).
+            object_factory(callable): The factory function used to create
+                the WebhookEvent objects.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(device_name, str)
+        check_type(websocket_url, str, optional=True)
+        check_type(min_reconnect_delay, (int, float))
+        check_type(max_reconnect_delay, (int, float))
+        check_type(dedup_size, int)
+        check_type(ping_interval, (int, float))
+        check_type(ping_timeout, (int, float))
+        check_type(cluster, str, optional=True)
+
+        super(WebSocketEventClient, self).__init__()
+
+        self._api = api
+        self.device_name = device_name
+        self.websocket_url = websocket_url
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.cluster = cluster
+        self._object_factory = object_factory
+
+        self.device_url = None
+        self._websocket = None
+        self._handlers = []
+        self._seen = BoundedSet(dedup_size)
+        self._stop = threading.Event()
+
+        self._connects = 0
+        self._received = 0
+        self._delivered = 0
+        self._duplicates = 0
+        self._last_latency = None
+
+    def register(self, handler, resource=None, event=None):
+        """Register a handler for events.
+
+        Args:
+            handler(callable): Called with each matching WebhookEvent.
+            resource(str): Only deliver events for this resource type.
+            event(str): Only deliver events of this type.
+
+        Returns:
+            callable: The handler.
+
+        """
+        check_type(resource, str, optional=True)
+        check_type(event, str, optional=True)
+
+        self._handlers.append((handler, resource, event))
+        return handler
+
+    def _register_device(self):
+        """Register the device, and return its WebSocket URL."""
+        if self.websocket_url:
+            return self.websocket_url
+        if self.cluster is None:
+            self.cluster = hydra_cluster(self._api.people.me().id)
+        device = self._api.session.post(
+            DEVICES_URL,
+            json={
+                "deviceName": self.device_name,
+                "deviceType": "DESKTOP",
+                "localizedModel": "python",
+                "model": "python",
+                "name": self.device_name,
+                "systemName": platform.system(),
+                "systemVersion": platform.release(),
+            },
+        )
+        self.device_url = device["url"]
+        self.websocket_url = device["webSocketUrl"]
+        return self.websocket_url
+
+    def connect(self):
+        """Open (and authorize) the WebSocket connection."""
+        websocket = WebSocket(
+            self._register_device(), timeout=self.ping_interval
+        )
+        websocket.send(
+            json.dumps(
+                {
+                    "id": str(uuid.uuid4()),
+                    "type": "authorization",
+                    "data": {"token": "Bearer " + self._api.access_token},
+                }
+            )
+        )
+        self._websocket = websocket
+        self._connects += 1
+        return websocket
+
+    def _handle(self, raw):
+        """Acknowledge a streamed message and deliver its event."""
+        message = json.loads(raw)
+        self._received += 1
+        if message.get("id"):
+            self._websocket.send(
+                json.dumps({"type": "ack", "messageId": message["id"]})
+            )
+
+        data = message.get("data") or {}
+        if data.get("eventType") != "conversation.activity":
+            return
+        activity = data.get("activity") or {}
+        json_data = activity_event(activity, self.cluster or DEFAULT_CLUSTER)
+        if json_data is None:
+            return
+        if not self._seen.add(activity.get("id")):
+            self._duplicates += 1
+            return
+
+        webhook_event = self._object_factory("webhook_event", json_data)
+        try:
+            published = WebexDateTime.strptime(activity["published"])
+        except (KeyError, TypeError, ValueError):
+            pass
+        else:
+            self._last_latency = (
+                WebexDateTime.now(published.tzinfo) - published
+            ).total_seconds()
+        for handler, resource, event in self._handlers:
+            if resource is not None and webhook_event.resource != resource:
+                continue
+            if event is not None and webhook_event.event != event:
+                continue
+            try:
+                handler(webhook_event)
+            except Exception:
+                logger.exception("Error handling a WebSocket event.")
+        self._delivered += 1
+
+    def _receive(self, websocket):
+        """Receive the next message, pinging the connection when idle."""
+        while True:
+            idle = time.monotonic() - websocket.last_received
+            deadline = self.ping_interval + self.ping_timeout
+            if idle >= deadline:
+                raise ConnectionError("The WebSocket connection timed out.")
+            if idle >= self.ping_interval:
+                websocket.ping()
+                timeout = deadline - idle
+            else:
+                timeout = self.ping_interval - idle
+            try:
+                return websocket.recv(timeout)
+            except socket.timeout:
+                continue
+
+    def run(self):
+        """Receive, and deliver, events until `stop()` is called."""
+        self._stop.clear()
+        delay = self.min_reconnect_delay
+        while not self._stop.is_set():
+            try:
+                websocket = self.connect()
+                delay = self.min_reconnect_delay
+                while not self._stop.is_set():
+                    self._handle(self._receive(websocket))
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(
+                    "WebSocket connection lost ({}); reconnecting in "
+                    "{:.1f} seconds.".format(e, delay)
+                )
+                self._stop.wait(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, self.max_reconnect_delay)
+            finally:
+                if self._websocket is not None:
+                    self._websocket.close()
+
+    def stop(self):
+        """Stop a running client, and close its connection."""
+        self._stop.set()
+        if self._websocket is not None:
+            self._websocket.close()
+
+    def close(self):
+        """Stop the client, and delete its registered device."""
+        self.stop()
+        if self.device_url:
+            self._api.session.delete(self.device_url)
+            self.device_url = None
+
+    @property
+    def metrics(self):
+        """Client metrics (dict).
+
+        Keys:
+            connects: The number of connections opened.
+            received: The number of messages received.
+            delivered: The number of events delivered.
+            duplicates: The number of duplicate events dropped.
+            last_latency: The delay, in seconds, between the creation and the
+                delivery of the latest event delivered.
+
+        """
+        return {
+            "connects": self._connects,
+            "received": self._received,
+            "delivered": self._delivered,
+            "duplicates": self._duplicates,
+            "last_latency": self._last_latency,
+        }
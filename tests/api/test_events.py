@@ -22,10 +22,12 @@ SOFTWARE.
 """
 
 import itertools
+from unittest.mock import Mock
 
 import pytest
 
 import webexpythonsdk
+from webexpythonsdk.api.events import EventsAPI
 
 
 # Helper Functions
@@ -110,3 +112,58 @@ def test_get_event_by_id(api, events):
     event_id = events[0].id
     event = api.events.get(event_id)
     assert is_valid_event(event)
+
+
+def test_stream_events_deduplicates_overlapping_polls():
+    def event(number):
+        return {
+            "id": "event{}".format(number),
+            "resource": "messages",
+            "type": "created",
+            "created": "2024-01-01T00:00:0{}.000Z".format(number),
+        }
+
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.get_items.side_effect = [
+        [event(2), event(1)],
+        [event(2), event(3)],
+        RuntimeError("unavailable"),
+        [],
+        [event(3), event(4)],
+    ]
+    events_api = EventsAPI(session, webexpythonsdk.immutable_data_factory)
+
+    stream = events_api.stream(
+        resource="messages",
+        start="2024-01-01T00:00:00.000Z",
+        overlap=5,
+        min_interval=0.001,
+        max_interval=0.01,
+    )
+    streamed = [e.id for e in itertools.islice(stream, 4)]
+    stream.close()
+
+    assert streamed == ["event1", "event2", "event3", "event4"]
+    params = [c.kwargs["params"] for c in session.get_items.call_args_list]
+    assert params[0] == {
+        "resource": "messages",
+        "from": "2023-12-31T23:59:55.000Z",
+    }
+    assert params[4]["from"] == "2023-12-31T23:59:58.000Z"
+
+
+def test_stream_events_drops_events_before_start():
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.get_items.return_value = [
+        {"id": "after", "created": "2030-01-01T00:00:31.000Z"},
+        {"id": "before", "created": "2030-01-01T00:00:00.000Z"},
+    ]
+    events_api = EventsAPI(session, webexpythonsdk.immutable_data_factory)
+
+    stream = events_api.stream(start="2030-01-01T00:00:30.000Z")
+    streamed = next(stream)
+    stream.close()
+
+    assert streamed.id == "after"
+    params = session.get_items.call_args_list[0].kwargs["params"]
+    assert params == {"from": "2029-12-31T23:59:30.000Z"}
@@ -0,0 +1,95 @@
+"""WebexAPI MeetingInvitees API fixtures and tests.
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.api.meeting_invitees import MeetingInviteesAPI
+from tests.utils import create_mock_api_error
+
+
+def bulk_insert_response(url, json):
+    if json["meetingId"] == "bad-meeting":
+        raise create_mock_api_error(400)
+    return {
+        "items": [
+            {"id": item["email"], "email": item["email"]}
+            for item in json["items"]
+        ]
+    }
+
+
+def invitees(count):
+    for i in range(count):
+        yield {"email": "user{}@example.com".format(i)}
+
+
+# Fixtures
+@pytest.fixture
+def session():
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.put.side_effect = bulk_insert_response
+    return session
+
+
+@pytest.fixture
+def meeting_invitees(session):
+    return MeetingInviteesAPI(session, webexpythonsdk.immutable_data_factory)
+
+
+# Tests
+def test_bulk_is_eager_and_chunked(meeting_invitees, session):
+    created = meeting_invitees.bulk("meeting1", items=invitees(250))
+
+    assert session.put.call_count == 3
+    assert len(created) == 250
+    assert [i.email for i in created[:2]] == [
+        "user0@example.com",
+        "user1@example.com",
+    ]
+
+
+def test_bulk_insert_reports_per_invitee_results(meeting_invitees):
+    results = meeting_invitees.bulk_insert(
+        {"meeting1": invitees(3), "bad-meeting": invitees(2)},
+        chunk_size=2,
+    )
+
+    assert [(r.meetingId, r.error is None) for r in results] == [
+        ("meeting1", True),
+        ("meeting1", True),
+        ("meeting1", True),
+        ("bad-meeting", False),
+        ("bad-meeting", False),
+    ]
+    assert results[2].invitee.email == "user2@example.com"
+
+
+def test_bulk_raises_on_rejected_chunk(meeting_invitees):
+    with pytest.raises(webexpythonsdk.ApiError):
+        meeting_invitees.bulk("bad-meeting", items=list(invitees(1)))
+
+    with pytest.raises(ValueError):
+        meeting_invitees.bulk("meeting1", items=[], chunk_size=101)
@@ -21,12 +21,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import csv
 import pytest
 import datetime
+from unittest.mock import Mock
 
 import webexpythonsdk
 
-from tests.utils import create_string
+from tests.utils import create_mock_api_error, create_string
 
 # Helper Functions
 
@@ -49,6 +51,24 @@ def get_start_end_time():
     return {"start": start, "end": end}
 
 
+def registrant_records(count):
+    for i in range(count):
+        yield {
+            "firstName": "First{}".format(i),
+            "lastName": "Last{}".format(i),
+            "email": "user{}@example.com".format(i),
+            "jobTitle": "",
+        }
+
+
+def mock_registrants_api(post):
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.post.side_effect = post
+    return webexpythonsdk.api.meeting_registrants.MeetingRegistrantsAPI(
+        session, webexpythonsdk.immutable_data_factory
+    ), session
+
+
 # Fixtures
 
 
@@ -142,3 +162,65 @@ def test_list_registrants(api, webinar, registrant):
 
 def test_unregister(api, webinar, registrant):
     api.meeting_registrants.delete(webinar.id, registrant.id)
+
+
+def test_bulk_import_batches_and_resumes(tmp_path):
+    def post(url, json):
+        if json["items"][0]["email"] == "user2@example.com":
+            raise create_mock_api_error(400)
+        return {"items": [{"id": r["email"]} for r in json["items"]]}
+
+    registrants, session = mock_registrants_api(post)
+    journal = str(tmp_path / "import.journal")
+    results_path = str(tmp_path / "results.csv")
+
+    results = registrants.bulk_import(
+        "webinar1",
+        registrant_records(5),
+        journal_path=journal,
+        results_path=results_path,
+        chunk_size=2,
+    )
+
+    assert session.post.call_count == 3
+    assert "jobTitle" not in session.post.call_args[1]["json"]["items"][0]
+    assert [r.registrantId for r in results] == [
+        "user0@example.com",
+        "user1@example.com",
+        None,
+        None,
+        "user4@example.com",
+    ]
+    with open(results_path) as results_file:
+        rows = list(csv.DictReader(results_file))
+    assert rows[4]["registrantId"] == "user4@example.com"
+
+    # Resuming only retries the failed records
+    session.post.reset_mock()
+    session.post.side_effect = lambda url, json: {
+        "items": [{"id": r["email"]} for r in json["items"]]
+    }
+    results = registrants.bulk_import(
+        "webinar1", registrant_records(5), journal_path=journal
+    )
+    assert session.post.call_count == 1
+    assert all(r.registrantId for r in results)
+
+
+def test_bulk_import_falls_back_to_single_registrations():
+    def post(url, json):
+        if url.endswith("/bulkInsert"):
+            raise create_mock_api_error(404)
+        return {"id": json["email"]}
+
+    registrants, session = mock_registrants_api(post)
+
+    results = registrants.bulk_import(
+        "webinar1", registrant_records(3), rate=1000
+    )
+
+    assert [r.registrantId for r in results] == [
+        "user0@example.com",
+        "user1@example.com",
+        "user2@example.com",
+    ]
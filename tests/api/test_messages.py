@@ -24,12 +24,17 @@ SOFTWARE.
 import itertools
 import json
 import os
+import tempfile
+from unittest.mock import Mock, patch
 
 import pytest
+import requests
 
 import webexpythonsdk
+from webexpythonsdk.api.messages import MessagesAPI
+from webexpythonsdk.restsession import FileInfo
 from tests.environment import WEBEX_TEST_FILE_URL
-from tests.utils import create_string
+from tests.utils import create_session, create_string
 
 
 # Module Variables
@@ -384,3 +389,109 @@ def test_update_message(api, group_room):
     message = api.messages.create(group_room.id, text=text)
     text = create_string("Message Updated")
     assert text == api.messages.edit(message.id, group_room.id, text).text
+
+
+def test_download_files_concurrently_with_unique_names(tmp_path):
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.file_info.side_effect = lambda url: {
+        "u1": FileInfo("report.pdf", 3, "application/pdf", True),
+        "u2": FileInfo("report.pdf", 3, "application/pdf", True),
+        "u3": FileInfo(None, None, None, False),
+    }[url]
+    session.download.side_effect = lambda url, path, **kwargs: path
+    messages = MessagesAPI(session, webexpythonsdk.immutable_data_factory)
+    message = webexpythonsdk.Message({"files": ["u1", "u2", "u3"]})
+
+    results = messages.download_files(message, directory=str(tmp_path))
+
+    assert [os.path.basename(r.path) for r in results] == [
+        "report.pdf",
+        "report (1).pdf",
+        "u3",
+    ]
+    info = session.download.call_args_list[0].kwargs["info"]
+    assert info.name == "report.pdf"
+
+    session.file_info.side_effect = webexpythonsdk.MalformedResponse("x")
+    [failed] = messages.download_files(["u4"])
+    assert failed.path is None and failed.error is not None
+
+
+def test_create_uploads_data_with_progress():
+    def post(url, json=None, data=None, headers=None):
+        if data is not None:
+            body = b"".join(iter(lambda: data.read(1024), b""))
+            assert b"report data" in body
+            assert headers["Content-type"].startswith("multipart/form-data")
+        return {"id": "m1", "roomId": (json or {}).get("roomId")}
+
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.post.side_effect = post
+    messages = MessagesAPI(session, webexpythonsdk.immutable_data_factory)
+    progress = []
+
+    report = b"report data" * 1000
+    messages.create(
+        "room1",
+        files=[("report.txt", memoryview(report))],
+        progress=lambda sent, total: progress.append((sent, total)),
+    )
+    assert progress[-1][0] == progress[-1][1] > len(report)
+
+    results = messages.create_many(
+        [
+            {"roomId": "room{}".format(n), "files": [("r.txt", report)]}
+            for n in range(5)
+        ]
+        + [{"roomId": "room5", "files": [object()]}],
+        max_workers=3,
+    )
+    assert [r.error is None for r in results] == [True] * 5 + [False]
+    assert session.post.call_count == 6
+
+    # Files passed by the caller stay open, with or without a file name
+    with tempfile.TemporaryFile() as file:
+        file.write(report)
+        for caller_file in (file, ("report.txt", file)):
+            file.seek(0)
+            messages.create("room1", files=[caller_file])
+            assert not file.closed
+
+
+def test_create_sends_the_file_again_after_a_rate_limit():
+    def response(status_code, text=""):
+        response = Mock(spec=requests.Response)
+        response.status_code = status_code
+        response.reason = "Error"
+        response.headers = {"Retry-After": "1"}
+        response.json.return_value = {}
+        response.request = Mock(spec=requests.PreparedRequest)
+        response.text = text
+        return response
+
+    bodies, responses = [], []
+
+    def request(method, url, data=None, headers=None, **kwargs):
+        bodies.append(b"".join(iter(lambda: data.read(1024), b"")))
+        return responses.pop(0)
+
+    session = create_session()
+    session.wait_on_rate_limit = True
+    messages = MessagesAPI(session, webexpythonsdk.immutable_data_factory)
+    report = b"report data" * 1000
+
+    with tempfile.TemporaryFile() as file, patch.object(
+        session._req_session, "request", side_effect=request
+    ), patch("webexpythonsdk.restsession.time.sleep"):
+        for data in (report, file):
+            file.write(report)
+            file.seek(0)
+            bodies.clear()
+            responses[:] = [response(429), response(200, '{"id": "m1"}')]
+            with pytest.warns(webexpythonsdk.RateLimitWarning):
+                message = messages.create("room1", files=[("r.txt", data)])
+
+            assert message.id == "m1"
+            assert len(bodies) == 2
+            assert bodies[0] == bodies[1]
+            assert report in bodies[1]
@@ -22,6 +22,7 @@ SOFTWARE.
 """
 
 import itertools
+from unittest.mock import Mock
 
 import pytest
 
@@ -227,6 +228,39 @@ def test_get_person_details(api, test_people):
     assert is_valid_person(person)
 
 
+def test_get_many_people(api, test_people, me):
+    ids = [test_people["not_a_member"].id, me.id, me.id]
+    people = api.people.get_many(ids)
+    assert set(people) == set(ids)
+    assert are_valid_people(list(people.values()))
+
+
+def test_get_many_people_in_chunks_of_85_ids():
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.get_items.side_effect = lambda url, params, fields: [
+        {"id": personId}
+        for personId in params["id"].split(",")
+        if personId != "unknown"
+    ]
+    people_api = webexpythonsdk.api.people.PeopleAPI(
+        session, webexpythonsdk.immutable_data_factory
+    )
+    cache = webexpythonsdk.TTLCache()
+    cache.set("cached", webexpythonsdk.Person({"id": "cached"}))
+    ids = [str(i) for i in range(200)] + ["0", "cached", "unknown"]
+
+    people = people_api.get_many(ids, cache=cache)
+
+    assert session.get_items.call_count == 3
+    assert len(people) == 202
+    assert people["unknown"] is None
+    assert people["cached"].id == "cached"
+    assert "199" in cache
+
+    with pytest.raises(TypeError):
+        people_api.get_many("person-id")
+
+
 def test_get_my_details(me):
     assert is_valid_person(me)
 
@@ -22,12 +22,20 @@ SOFTWARE.
 """
 
 import itertools
+import json
 import os
-from datetime import timedelta, timezone
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
 
 import pytest
+import requests
 
 import webexpythonsdk
+from webexpythonsdk.api.recordings import RecordingsAPI
+from webexpythonsdk.cache import TTLCache
+from webexpythonsdk.restsession import FileInfo
+from tests.utils import create_mock_api_error, create_session
 
 to_datetime = webexpythonsdk.WebexDateTime.now(tz=timezone.utc)
 from_datetime = to_datetime - timedelta(days=364)
@@ -42,6 +50,45 @@ def are_valid_recording(iterable):
     return all([is_valid_recording(obj) for obj in iterable])
 
 
+def mock_recordings_session(recordings, expired=lambda url: False):
+    """A mock session serving recordings, and their (fake) media."""
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    lock = threading.Lock()
+    gets = itertools.count()
+
+    def get_items(url, params=None, fields=None):
+        return [
+            dict(r)
+            for r in recordings
+            if r.get("siteUrl") in (params.get("siteUrl"), None)
+        ]
+
+    def get(url, params=None):
+        recording_id = url.split("/")[-1]
+        [recording] = [r for r in recordings if r["id"] == recording_id]
+        with lock:
+            link = "https://media/{}/{}".format(recording_id, next(gets))
+        links = {"recordingDownloadLink": link}
+        return dict(recording, temporaryDirectDownloadLinks=links)
+
+    def file_info(url, **kwargs):
+        assert kwargs["headers"] == {"Authorization": None}
+        if expired(url):
+            raise create_mock_api_error(403)
+        return FileInfo(None, None, None, True)
+
+    def download(url, path, chunk_size, info, **kwargs):
+        with open(path, "wb") as file:
+            file.write(b"x" * info.size)
+        return path
+
+    session.get_items.side_effect = get_items
+    session.get.side_effect = get
+    session.file_info.side_effect = file_info
+    session.download.side_effect = download
+    return session
+
+
 # Fixtures
 @pytest.fixture(scope="session")
 def list_recordings(api):
@@ -76,3 +123,128 @@ def test_recording_detail(recording_id):
 @pytest.mark.manual
 def test_delete_recording(api, recording_id):
     api.recordings.delete(recording_id)
+
+
+def test_list_sharded_splits_time_range_and_sites():
+    session = Mock(spec=webexpythonsdk.restsession.RestSession)
+    session.get_items.side_effect = lambda url, params, fields: [
+        {"id": "r1"},
+        {"id": params["siteUrl"] + params["from"][:10]},
+    ]
+    recordings = RecordingsAPI(session, webexpythonsdk.immutable_data_factory)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    listed = recordings.list_sharded(
+        start, start + timedelta(days=45), siteUrls=["a", "b"]
+    )
+
+    assert [r.id for r in listed] == [
+        "r1",
+        "a2024-01-01",
+        "a2024-01-31",
+        "b2024-01-01",
+        "b2024-01-31",
+    ]
+    windows = sorted(
+        (c.kwargs["params"]["from"], c.kwargs["params"]["to"])
+        for c in session.get_items.call_args_list
+        if c.kwargs["params"]["siteUrl"] == "a"
+    )
+    assert windows == [
+        ("2024-01-01T00:00:00.000Z", "2024-01-31T00:00:00.000Z"),
+        ("2024-01-31T00:00:00.000Z", "2024-02-15T00:00:00.000Z"),
+    ]
+    with pytest.raises(ValueError):
+        recordings.list_sharded(start, start, window=timedelta(days=31))
+    with pytest.raises(ValueError):
+        recordings.list_sharded(datetime(2024, 1, 1), start)
+
+
+def test_archive_refreshes_expired_links_and_resumes(tmp_path):
+    data = [
+        {"id": "r1", "topic": "Weekly sync", "format": "MP4", "sizeBytes": 3},
+        {"id": "r2", "topic": "a/b", "format": "ARF", "sizeBytes": 5},
+        {"id": "r3", "format": "MP4", "sizeBytes": 1},
+    ]
+    # The first link of r1 has expired, and r3's media is gone
+    session = mock_recordings_session(
+        data, expired=lambda url: url.endswith("/r1/0") or "/r3/" in url
+    )
+    recordings = RecordingsAPI(session, webexpythonsdk.immutable_data_factory)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    directory = str(tmp_path / "archive")
+
+    results = recordings.archive(
+        directory, start, start + timedelta(days=1), max_workers=1
+    )
+
+    assert [r.status for r in results] == [
+        "downloaded",
+        "downloaded",
+        "failed",
+    ]
+    assert os.path.basename(results[0].path) == "Weekly_sync_r1.mp4"
+    assert os.path.basename(results[1].path) == "a_b_r2.arf"
+    assert results[1].size == 5
+    assert session.get.call_count == 2 + 1 + 3
+    assert "403" in results[2].error
+
+    manifest = os.path.join(directory, "manifest.jsonl")
+    with open(manifest) as manifest_file:
+        lines = [json.loads(line) for line in manifest_file if line.strip()]
+    assert len(lines) == 3
+
+    # A re-run skips the complete files and retries the rest
+    os.remove(results[1].path)
+    session.get.reset_mock()
+    results = recordings.archive(directory, start, start + timedelta(days=1))
+
+    assert [r.status for r in results] == ["skipped", "downloaded", "failed"]
+    assert {c.args[0] for c in session.get.call_args_list} == {
+        "recordings/r2",
+        "recordings/r3",
+    }
+
+
+def test_archive_refreshes_expired_links_past_the_response_cache(tmp_path):
+    recording = {"id": "r1", "format": "MP4", "sizeBytes": 1}
+    links = itertools.count()
+
+    def request(method, url, erc, **kwargs):
+        link = "https://media/r1/{}".format(next(links))
+        response = Mock(spec=requests.Response)
+        response.text = json.dumps(
+            dict(
+                recording,
+                temporaryDirectDownloadLinks={"recordingDownloadLink": link},
+            )
+        )
+        return response
+
+    def file_info(url, **kwargs):
+        # The first two links have expired
+        if not url.endswith("/2"):
+            raise create_mock_api_error(403)
+        return FileInfo(None, None, None, True)
+
+    def download(url, path, **kwargs):
+        with open(path, "wb") as file:
+            file.write(b"x")
+        return path
+
+    session = create_session()
+    session.cache = TTLCache()
+    session.request = Mock(side_effect=request)
+    session.get_items = Mock(return_value=[recording])
+    session.file_info = Mock(side_effect=file_info)
+    session.download = Mock(side_effect=download)
+    recordings = RecordingsAPI(session, webexpythonsdk.immutable_data_factory)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    [result] = recordings.archive(
+        str(tmp_path), start, start + timedelta(days=1)
+    )
+
+    assert result.status == "downloaded"
+    assert session.request.call_count == 3
+    assert session.download.call_args.args[0] == "https://media/r1/2"
@@ -0,0 +1,200 @@
+"""webexpythonsdk/broadcast.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+import webexpythonsdk
+from webexpythonsdk.broadcast import Broadcast
+from webexpythonsdk.utils import TokenBucket
+from tests.utils import create_mock_api_error
+
+
+class FakeClock(object):
+    """A clock advanced by the (fake) sleep function."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeMessages(object):
+    """Record the messages created, failing for some recipients."""
+
+    def __init__(self, fail_for=()):
+        self.created = []
+        self.fail_for = set(fail_for)
+        self._lock = threading.Lock()
+
+    def create(self, **message):
+        recipient = message.get("roomId") or message.get("toPersonEmail")
+        if recipient in self.fail_for:
+            raise ValueError("Cannot post to {}".format(recipient))
+        with self._lock:
+            self.created.append(message)
+            return webexpythonsdk.Message(
+                {"id": "message-{}".format(len(self.created))}
+            )
+
+
+# Fixtures
+@pytest.fixture
+def mock_api():
+    api = Mock()
+    api.messages = FakeMessages(fail_for=["room3"])
+    return api
+
+
+# Tests
+def test_token_bucket_paces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(2, capacity=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(6):
+        bucket.acquire()
+    # Two requests in the initial burst, then two per second
+    assert clock.now == pytest.approx(2.0)
+
+    bucket.pause(5)
+    bucket.acquire()
+    assert clock.now == pytest.approx(7.5)
+
+
+def test_broadcast_reports_per_recipient_results(mock_api):
+    broadcast = Broadcast(
+        mock_api,
+        markdown="Hello",
+        render=lambda r: {"markdown": "Hello {}".format(r["name"])},
+        rate=1000,
+    )
+
+    results = broadcast.send(
+        [
+            {"roomId": "room1", "name": "one"},
+            {"roomId": "room2", "name": "two"},
+            {"roomId": "room3", "name": "three"},
+        ]
+    )
+
+    assert [r.status for r in results] == ["sent", "sent", "failed"]
+    assert "room3" in results[2].error
+    assert sorted(m["markdown"] for m in mock_api.messages.created) == [
+        "Hello one",
+        "Hello two",
+    ]
+
+
+def test_broadcast_resumes_without_double_sending(mock_api, tmp_path):
+    checkpoint = tmp_path / "broadcast.journal"
+    with open(str(checkpoint), "w") as journal:
+        journal.write(
+            json.dumps({"recipient": "a@x.com", "status": "sending"})
+        )
+        journal.write("\n")
+        journal.write(
+            json.dumps(
+                {"recipient": "b@x.com", "status": "sent", "messageId": "m"}
+            )
+        )
+        journal.write('\n{"recipient": "c@x.c')
+
+    broadcast = Broadcast(
+        mock_api,
+        text="Hi",
+        recipient_type="toPersonEmail",
+        checkpoint_path=str(checkpoint),
+        rate=1000,
+    )
+    recipients = ["a@x.com", "b@x.com", "c@x.com"]
+    results = broadcast.send(recipients)
+
+    assert [r.status for r in results] == ["unknown", "skipped", "sent"]
+    assert [m["toPersonEmail"] for m in mock_api.messages.created] == [
+        "c@x.com"
+    ]
+
+    # Running the broadcast again sends nothing
+    results = broadcast.send(recipients)
+    assert [r.status for r in results] == ["unknown", "skipped", "skipped"]
+    assert len(mock_api.messages.created) == 1
+
+
+def test_broadcast_does_not_resend_after_ambiguous_errors(tmp_path):
+    errors = {
+        "room1": requests.ReadTimeout("Read timed out"),
+        "room2": create_mock_api_error(502),
+        "room3": create_mock_api_error(400),
+    }
+    created = []
+
+    def create(**message):
+        error = errors.pop(message["roomId"], None)
+        if error is not None:
+            raise error
+        created.append(message["roomId"])
+        return webexpythonsdk.Message({"id": "m"})
+
+    api = Mock()
+    api.messages.create.side_effect = create
+    broadcast = Broadcast(
+        api,
+        text="Hi",
+        checkpoint_path=str(tmp_path / "broadcast.journal"),
+        rate=1000,
+    )
+    recipients = ["room1", "room2", "room3"]
+
+    results = broadcast.send(recipients)
+    assert [r.status for r in results] == ["unknown", "unknown", "failed"]
+
+    # Resuming only re-sends the message Webex rejected
+    results = broadcast.send(recipients)
+    assert [r.status for r in results] == ["unknown", "unknown", "sent"]
+    assert created == ["room3"]
+
+
+def test_broadcast_pauses_and_retries_when_rate_limited(mock_api):
+    mock_api.messages.create = Mock(
+        side_effect=[
+            create_mock_api_error(
+                429, webexpythonsdk.RateLimitError, retry_after=2
+            ),
+            webexpythonsdk.Message({"id": "m"}),
+        ]
+    )
+    broadcast = Broadcast(mock_api, text="Hi", rate=1000)
+    broadcast.rate_limiter.pause = Mock()
+
+    results = broadcast.send(["room1"])
+
+    assert results[0].status == "sent"
+    broadcast.rate_limiter.pause.assert_called_once_with(2)
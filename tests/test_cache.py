@@ -0,0 +1,282 @@
+"""webexpythonsdk/cache.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import multiprocessing
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.cache import EntityCache, SQLiteCache, TTLCache
+
+
+class FakeClock(object):
+    """A manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+# Fixtures
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def mock_api():
+    api = Mock()
+    api.people.get.side_effect = lambda personId: webexpythonsdk.Person(
+        {"id": personId}
+    )
+    api.rooms.get.side_effect = lambda roomId: webexpythonsdk.Room(
+        {"id": roomId}
+    )
+    api.memberships.list.side_effect = lambda **params: [
+        webexpythonsdk.Membership(
+            {"id": "m1", "roomId": params["roomId"], "personId": "p1"}
+        )
+    ]
+    return api
+
+
+# Tests
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+
+    clock.now += 30
+    assert cache.get("a") == 1
+    assert "a" in cache
+
+    clock.now += 31
+    assert cache.get("a") is None
+
+    stats = cache.stats
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["max_hit_age"] == 30
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats["evictions"] == 1
+
+
+def test_entity_cache_serves_repeat_gets(mock_api):
+    cache = EntityCache(mock_api)
+
+    assert cache.get_person("p1").id == "p1"
+    assert cache.get_person("p1").id == "p1"
+    assert mock_api.people.get.call_count == 1
+    assert cache.stats["people"]["hit_rate"] == 0.5
+
+
+def test_entity_cache_invalidates_on_webhook_events(mock_api):
+    cache = EntityCache(mock_api)
+    cache.get_room("r1")
+    cache.get_room("r2")
+    cache.list_memberships(roomId="r1")
+    cache.list_memberships(roomId="r2")
+
+    membership_deleted = webexpythonsdk.WebhookEvent(
+        {
+            "resource": "memberships",
+            "event": "deleted",
+            "data": {"roomId": "r1", "personId": "p2"},
+        }
+    )
+    assert cache.invalidate(membership_deleted) == 1
+    assert (None, None, None) not in cache.memberships
+    assert ("r2", None, None) in cache.memberships
+
+    room_updated = webexpythonsdk.WebhookEvent(
+        {"resource": "rooms", "event": "updated", "data": {"id": "r2"}}
+    )
+    assert cache.invalidate(room_updated) == 1
+    assert "r2" not in cache.rooms
+    assert "r1" in cache.rooms
+
+    cache.get_room("r2")
+    assert mock_api.rooms.get.call_count == 3
+
+
+def test_entity_cache_drops_data_invalidated_while_retrieved(mock_api):
+    cache = EntityCache(mock_api)
+    person_updated = webexpythonsdk.WebhookEvent(
+        {"resource": "people", "event": "updated", "data": {"id": "p1"}}
+    )
+    membership_created = webexpythonsdk.WebhookEvent(
+        {
+            "resource": "memberships",
+            "event": "created",
+            "data": {"roomId": "r1", "personId": "p2"},
+        }
+    )
+
+    def get_person(personId):
+        # The person is updated while their details are being retrieved
+        cache.invalidate(person_updated)
+        return webexpythonsdk.Person({"id": personId})
+
+    def list_memberships(**params):
+        cache.invalidate(membership_created)
+        return []
+
+    mock_api.people.get.side_effect = get_person
+    mock_api.memberships.list.side_effect = list_memberships
+
+    assert cache.get_person("p1").id == "p1"
+    assert "p1" not in cache.people
+    assert cache.list_memberships(roomId="r1") == []
+    assert ("r1", None, None) not in cache.memberships
+
+    # Data retrieved without interference is cached
+    mock_api.people.get.side_effect = None
+    mock_api.people.get.return_value = webexpythonsdk.Person({"id": "p1"})
+    cache.get_person("p1")
+    assert "p1" in cache.people
+
+
+def test_entity_cache_evicts_deleted_rooms_and_teams(mock_api):
+    mock_api.rooms.get.side_effect = lambda roomId: webexpythonsdk.Room(
+        {"id": roomId, "teamId": "t1" if roomId == "r2" else None}
+    )
+    mock_api.memberships.list.side_effect = lambda **params: [
+        webexpythonsdk.Membership({"id": "m1", "roomId": "r1"}),
+        webexpythonsdk.Membership({"id": "m2", "roomId": "r2"}),
+    ]
+    cache = EntityCache(mock_api)
+    cache.get_room("r1")
+    cache.get_room("r2")
+    cache.list_memberships(personId="p1")
+    cache.list_memberships(personEmail="p1@example.com")
+
+    room_deleted = webexpythonsdk.WebhookEvent(
+        {"resource": "rooms", "event": "deleted", "data": {"id": "r1"}}
+    )
+    assert cache.invalidate(room_deleted) == 3
+    assert "r1" not in cache.rooms
+    assert len(cache.memberships) == 0
+
+    cache.list_memberships(personId="p1")
+    team_deleted = webexpythonsdk.WebhookEvent(
+        {"resource": "teams", "event": "deleted", "data": {"id": "t1"}}
+    )
+    assert cache.invalidate(team_deleted) == 2
+    assert "r2" not in cache.rooms
+    assert len(cache.memberships) == 0
+
+
+def test_entity_cache_ignores_unrelated_events(mock_api):
+    cache = EntityCache(mock_api)
+    cache.get_room("r1")
+
+    message_created = webexpythonsdk.WebhookEvent(
+        {"resource": "messages", "event": "created", "data": {"id": "x"}}
+    )
+    assert cache.invalidate(message_created) == 0
+    assert "r1" in cache.rooms
+
+
+def write_to_shared_cache(path, worker):
+    cache = SQLiteCache(path)
+    for i in range(50):
+        cache.set("{}-{}".format(worker, i), {"worker": worker, "i": i})
+
+
+def test_sqlite_cache_get_set_delete(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    cache.set("key", {"id": "1"})
+    cache.set("expired", "value", ttl=-1)
+
+    assert cache.get("key") == {"id": "1"}
+    assert cache.get("expired") is None
+    assert "key" in cache
+
+    assert cache.delete("key")
+    assert not cache.delete("key")
+    assert cache.stats["hit_rate"] == 0.5
+
+
+def test_sqlite_cache_evicts_to_max_bytes(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_bytes=1000)
+    for i in range(20):
+        cache.set(str(i), "x" * 100, ttl=100 + i)
+
+    assert cache.stats["bytes"] <= 1000
+    assert cache.get("19") is not None
+    assert cache.get("0") is None
+    assert cache.stats["evictions"] > 0
+
+
+def test_sqlite_cache_shared_by_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteCache(path)
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=write_to_shared_cache, args=(path, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    cache = SQLiteCache(path)
+    assert len(cache) == 200
+    assert cache.get("3-49") == {"worker": 3, "i": 49}
+    assert cache.stats["bytes"] == sum(
+        len(json.dumps({"worker": w, "i": i}, separators=(",", ":")))
+        for w in range(4)
+        for i in range(50)
+    )
+
+
+def test_sqlite_cache_tracks_size_and_deletes_by_prefix(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    cache.set("a", "xx")
+    cache.set("a", "xxxx")
+    cache.set("a?b=1", "x")
+    cache.set("ab", "x")
+    assert cache.stats["bytes"] == 6 + 3 + 3
+
+    assert cache.delete_prefix("a?") == 1
+    assert cache.get("ab") is not None
+    cache.clear()
+    assert cache.stats["bytes"] == 0
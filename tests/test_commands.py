@@ -0,0 +1,141 @@
+"""webexpythonsdk/commands.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.commands import CommandRouter
+
+
+def message(text, html=None):
+    return webexpythonsdk.Message({"id": "m1", "text": text, "html": html})
+
+
+# Fixtures
+@pytest.fixture
+def router():
+    router = CommandRouter(names=["HelperBot"], default=lambda m, c: "?")
+
+    @router.command("status")
+    def status(message, match):
+        return ("status", match.args)
+
+    router.command("status all", lambda m, c: ("status all", c.args))
+    router.command(
+        r"deploy (?P<service>\w+) to (?P<env>\w+)",
+        lambda m, c: ("deploy", c.groups),
+        regex=True,
+    )
+    router.command(
+        r"(?P<service>\w+) version", lambda m, c: c.groups, regex=True
+    )
+    return router
+
+
+# Tests
+def test_prefix_commands_route_to_longest_match(router):
+    assert router.route(message("status")) == ("status", [])
+    assert router.route(message('STATUS db "eu west"')) == (
+        "status",
+        ["db", "eu west"],
+    )
+    assert router.route(message("status all --verbose")) == (
+        "status all",
+        ["--verbose"],
+    )
+    assert router.route(message("statuses")) == "?"
+
+
+def test_regex_commands(router):
+    assert router.route(message("deploy api to prod")) == (
+        "deploy",
+        {"service": "api", "env": "prod"},
+    )
+    assert router.route(message("api version")) == {"service": "api"}
+    assert router.route(message("deploy api")) == "?"
+
+
+def test_mentions_are_stripped(router):
+    html = (
+        '<p><spark-mention data-object-type="person" data-object-id="x">'
+        "Helper</spark-mention> status db</p>"
+    )
+    assert router.route(message("Helper status db", html)) == (
+        "status",
+        ["db"],
+    )
+    assert router.route(message("HelperBot, status")) == ("status", [])
+
+
+def test_routes_webhook_events():
+    api = Mock()
+    api.messages.get.return_value = message("ping")
+    router = CommandRouter(api=api)
+    router.command("ping", lambda m, c: "pong")
+
+    event = webexpythonsdk.WebhookEvent(
+        {"resource": "messages", "event": "created", "data": {"id": "m1"}}
+    )
+    assert router.route(event) == "pong"
+    api.messages.get.assert_called_once_with("m1")
+    assert router.route(message("unknown")) is None
+
+
+def test_regex_commands_must_be_combinable(router):
+    with pytest.raises(ValueError):
+        router.command(r"(\w+) and \1", lambda m, c: None, regex=True)
+    with pytest.raises(ValueError):
+        router.command(r"(?i)help", lambda m, c: None, regex=True)
+
+    router.command(
+        r"(?P<word>\w+) again (?P=word)(?(word)!|)",
+        lambda m, c: c.groups,
+        regex=True,
+    )
+    assert router.route(message("hello again hello!")) == {"word": "hello"}
+    assert router.route(message("api version")) == {"service": "api"}
+
+
+def test_events_without_a_message_are_not_routed(router):
+    membership_event = webexpythonsdk.WebhookEvent(
+        {"resource": "memberships", "event": "created", "data": {}}
+    )
+    enriched = webexpythonsdk.EnrichedEvent(
+        membership_event, None, None, None, None
+    )
+    assert router.route(enriched) is None
+    assert router.route(membership_event) is None
+    assert router.stats == {}
+
+
+def test_dispatch_timing_is_recorded(router):
+    router.route(message("status"))
+    router.route(message("status x"))
+    router.route(message("nothing"))
+
+    stats = router.stats
+    assert stats["status"]["calls"] == 2
+    assert stats["status"]["max_time"] >= stats["status"]["mean_time"]
+    assert stats[None]["calls"] == 1
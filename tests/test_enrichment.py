@@ -0,0 +1,127 @@
+"""webexpythonsdk/enrichment.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.cache import EntityCache
+from webexpythonsdk.enrichment import WebhookEnricher
+
+
+def webhook_event(resource="messages", event="created", **data):
+    data.setdefault("id", "message1")
+    data.setdefault("created", "2024-01-01T00:00:00.000Z")
+    return webexpythonsdk.WebhookEvent(
+        {"id": "webhook1", "resource": resource, "event": event, "data": data}
+    )
+
+
+# Fixtures
+@pytest.fixture
+def mock_api():
+    api = Mock()
+    api.messages.get.side_effect = lambda id: webexpythonsdk.Message(
+        {"id": id, "text": "hello"}
+    )
+    api.attachment_actions.get.side_effect = (
+        lambda id: webexpythonsdk.AttachmentAction({"id": id})
+    )
+    api.people.get.side_effect = lambda id: webexpythonsdk.Person({"id": id})
+    api.rooms.get.side_effect = lambda id: webexpythonsdk.Room({"id": id})
+    return api
+
+
+@pytest.fixture
+def enricher(mock_api):
+    enricher = WebhookEnricher(mock_api)
+    yield enricher
+    enricher.close()
+
+
+# Tests
+def test_enrich_fetches_resources_concurrently(mock_api):
+    # Every fetch waits for the others; so they must run concurrently
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fetch(id):
+        barrier.wait()
+        return webexpythonsdk.Person({"id": id})
+
+    mock_api.messages.get.side_effect = fetch
+    mock_api.people.get.side_effect = fetch
+    mock_api.rooms.get.side_effect = fetch
+    enricher = WebhookEnricher(mock_api)
+
+    enriched = enricher.enrich(webhook_event(personId="p1", roomId="r1"))
+    enricher.close()
+
+    assert enriched.message.id == "message1"
+    assert enriched.person.id == "p1"
+    assert enriched.room.id == "r1"
+    assert enriched.attachment_action is None
+
+
+def test_duplicate_deliveries_are_dropped(enricher, mock_api):
+    handled = []
+    handler = enricher.handler(handled.append)
+
+    handler(webhook_event(personId="p1"))
+    handler(webhook_event(personId="p1"))
+    handler(webhook_event(id="message2", personId="p1"))
+
+    assert [e.message.id for e in handled] == ["message1", "message2"]
+    assert enricher.duplicates == 1
+    assert mock_api.messages.get.call_count == 2
+    # The person was cached
+    assert mock_api.people.get.call_count == 1
+
+
+def test_shared_cache_and_resource_types(mock_api):
+    cache = EntityCache(mock_api)
+    cache.get_room("r1")
+    enricher = WebhookEnricher(mock_api, cache=cache)
+
+    action = enricher.enrich(
+        webhook_event("attachmentActions", id="a1", roomId="r1")
+    )
+    deleted = enricher.enrich(webhook_event(event="deleted", roomId="r1"))
+    enricher.close()
+
+    assert action.attachment_action.id == "a1"
+    assert deleted.message is None
+    assert deleted.room.id == "r1"
+    assert mock_api.rooms.get.call_count == 1
+
+
+def test_failed_enrichment_can_be_retried(enricher, mock_api):
+    mock_api.messages.get.side_effect = [
+        RuntimeError("unavailable"),
+        webexpythonsdk.Message({"id": "message1"}),
+    ]
+
+    with pytest.raises(RuntimeError):
+        enricher.enrich(webhook_event())
+    assert enricher.enrich(webhook_event()).message.id == "message1"
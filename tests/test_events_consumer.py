@@ -0,0 +1,217 @@
+"""webexpythonsdk/events_consumer.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.events_consumer import EventsConsumer
+from webexpythonsdk.utils import BoundedSet
+
+
+START = "2024-10-01T12:00:00.000Z"
+
+
+def event(number, resource="messages", event_type="created"):
+    return webexpythonsdk.Event(
+        {
+            "id": "event{}".format(number),
+            "resource": resource,
+            "type": event_type,
+            "created": "2024-10-01T12:00:{:02d}.000Z".format(number),
+            "data": {},
+        }
+    )
+
+
+# Fixtures
+@pytest.fixture
+def mock_api():
+    api = Mock()
+    api.events.list.return_value = []
+    return api
+
+
+@pytest.fixture
+def consumer(mock_api, tmp_path):
+    return EventsConsumer(
+        mock_api,
+        watermark_path=str(tmp_path / "watermark.json"),
+        start=START,
+        overlap=30,
+        min_interval=1,
+        max_interval=8,
+        batch_size=2,
+    )
+
+
+# Tests
+def test_bounded_set_forgets_oldest_items():
+    seen = BoundedSet(2)
+    assert seen.add("a")
+    assert not seen.add("a")
+    seen.add("b")
+    seen.add("c")
+    assert "a" not in seen
+    assert len(seen) == 2
+
+
+def test_poll_requests_overlapping_window(consumer, mock_api):
+    consumer.poll_once()
+    mock_api.events.list.assert_called_once_with(
+        resource=None, _from="2024-10-01T11:59:30.000Z"
+    )
+
+
+def test_first_poll_drops_events_before_start(consumer, mock_api):
+    delivered = []
+    consumer.register(delivered.extend)
+
+    before_start = webexpythonsdk.Event(
+        {
+            "id": "event0",
+            "resource": "messages",
+            "type": "created",
+            "created": "2024-10-01T11:59:45.000Z",
+            "data": {},
+        }
+    )
+    mock_api.events.list.return_value = [event(1), before_start]
+    assert consumer.poll_once() == 1
+    assert [e.id for e in delivered] == ["event1"]
+
+    # A restarted consumer resumes from its watermark; late events within
+    # the overlap window before the watermark are still delivered
+    restarted = EventsConsumer(
+        mock_api, watermark_path=consumer.watermark_path, overlap=30
+    )
+    late = event(0)
+    restarted.register(delivered.extend)
+    mock_api.events.list.return_value = [event(1), late]
+    assert restarted.poll_once() == 1
+    assert [e.id for e in delivered] == ["event1", "event0"]
+
+
+def test_poll_delivers_batches_and_drops_duplicates(consumer, mock_api):
+    batches = []
+    consumer.register(batches.append)
+
+    # Events are listed newest first
+    mock_api.events.list.return_value = [event(3), event(2), event(1)]
+    assert consumer.poll_once() == 3
+    assert [[e.id for e in batch] for batch in batches] == [
+        ["event1", "event2"],
+        ["event3"],
+    ]
+
+    # The overlapping window returns the delivered events again
+    mock_api.events.list.return_value = [event(4), event(3), event(2)]
+    assert consumer.poll_once() == 1
+    assert [e.id for e in batches[-1]] == ["event4"]
+
+    metrics = consumer.metrics
+    assert metrics["delivered"] == 4
+    assert metrics["duplicates"] == 2
+    assert metrics["watermark"] == "2024-10-01T12:00:04.000Z"
+    assert metrics["max_lag"] > 0
+
+
+def test_handlers_filter_by_resource_and_type(consumer, mock_api):
+    created, deleted = [], []
+    consumer.register(created.extend, resource="messages", type="created")
+    consumer.register(deleted.extend, type="deleted")
+
+    mock_api.events.list.return_value = [
+        event(1),
+        event(2, resource="memberships", event_type="deleted"),
+    ]
+    consumer.poll_once()
+
+    assert [e.id for e in created] == ["event1"]
+    assert [e.id for e in deleted] == ["event2"]
+
+
+def test_failed_batch_is_redelivered(consumer, mock_api):
+    handler = Mock(side_effect=[RuntimeError("boom"), None])
+    consumer.register(handler)
+    mock_api.events.list.return_value = [event(1)]
+
+    with pytest.raises(RuntimeError):
+        consumer.poll_once()
+    assert consumer.watermark == START
+
+    assert consumer.poll_once() == 1
+    assert handler.call_count == 2
+
+
+def test_watermark_is_persisted(consumer, mock_api):
+    mock_api.events.list.return_value = [event(5)]
+    consumer.poll_once()
+
+    restarted = EventsConsumer(
+        mock_api, watermark_path=consumer.watermark_path, start=START
+    )
+    assert restarted.watermark == "2024-10-01T12:00:05.000Z"
+
+
+def test_recent_event_ids_are_persisted(consumer, mock_api):
+    mock_api.events.list.return_value = [event(50), event(25), event(5)]
+    consumer.poll_once()
+
+    restarted = EventsConsumer(
+        mock_api,
+        watermark_path=consumer.watermark_path,
+        start=START,
+        overlap=30,
+    )
+    delivered = []
+    restarted.register(delivered.extend)
+
+    # The overlap window returns the events delivered before the restart;
+    # event5 is outside the window and is no longer remembered
+    mock_api.events.list.return_value = [event(51), event(50), event(25)]
+    assert restarted.poll_once() == 1
+    assert [e.id for e in delivered] == ["event51"]
+    with open(consumer.watermark_path) as watermark_file:
+        recent = json.load(watermark_file)["recent"]
+    assert [event_id for _, event_id in recent] == [
+        "event25",
+        "event50",
+        "event51",
+    ]
+
+
+def test_polling_interval_adapts_to_traffic(consumer, mock_api):
+    consumer.poll_once()
+    consumer.poll_once()
+    assert consumer.interval == 4
+
+    for _ in range(3):
+        consumer.poll_once()
+    assert consumer.interval == 8
+
+    mock_api.events.list.return_value = [event(1)]
+    consumer.poll_once()
+    assert consumer.interval == 1
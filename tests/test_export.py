@@ -0,0 +1,154 @@
+"""webexpythonsdk/export.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import gzip
+import io
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.export import NDJSONWriter
+from tests.utils import create_mock_page_response, create_session
+
+
+# Tests
+def test_export_items_writes_raw_items():
+    session = create_session()
+    pages = [
+        create_mock_page_response(
+            '{"items": [{"id": "1", "text": "café"}, {"id": "2"}]}',
+            next_url="https://webexapis.com/v1/messages?cursor=abc",
+        ),
+        create_mock_page_response(
+            '{\n  "items": [\n    {\n      "id": "3"\n    }\n  ]\n}'
+        ),
+    ]
+    sink = io.BytesIO()
+
+    with patch.object(session, "request", side_effect=pages):
+        count = session.export_items("messages", sink, params={"max": 2})
+
+    lines = sink.getvalue().decode("utf-8").splitlines()
+    assert count == 3
+    assert lines[0] == '{"id": "1", "text": "café"}'
+    assert [json.loads(line)["id"] for line in lines] == ["1", "2", "3"]
+
+
+def test_raw_items_are_scanned_without_decoding():
+    items = [
+        {"id": "1", "text": 'a "quoted" } ] { [ \\'},
+        {"id": "2", "list": [1, -2.5e3, True, None, {"x": []}]},
+        "plain",
+        42,
+    ]
+    page = create_mock_page_response(
+        '{"notItems": {"items": [0]}, "items": '
+        + json.dumps(items)
+        + ', "after": [1, {"a": "]"}]}'
+    )
+
+    decoder = webexpythonsdk.utils._json_decoder
+    with patch.object(
+        decoder, "raw_decode", wraps=decoder.raw_decode
+    ) as raw_decode:
+        raw_items = list(webexpythonsdk.utils.extract_raw_items(page))
+    # Only the keys of the top-level object are decoded
+    assert raw_decode.call_count == 2
+
+    assert [json.loads(raw_item) for raw_item in raw_items] == items
+    assert raw_items[0] == json.dumps(items[0])
+
+
+def test_export_closes_writer_on_error(tmp_path):
+    session = create_session()
+    page = create_mock_page_response('{"items": [{"id": "1"}, {')
+    path = str(tmp_path / "messages.ndjson")
+
+    with open(path, "wb") as sink, patch.object(
+        session, "request", return_value=page
+    ), patch.object(NDJSONWriter, "close") as close:
+        with pytest.raises(webexpythonsdk.MalformedResponse):
+            session.export_items("messages", sink)
+    close.assert_called_once()
+
+
+def test_export_items_malformed_response():
+    session = create_session()
+    page = create_mock_page_response('{"message": "no items here"}')
+
+    with patch.object(session, "request", return_value=page):
+        with pytest.raises(webexpythonsdk.MalformedResponse):
+            session.export_items("messages", io.BytesIO())
+
+
+def test_writer_rotates_compressed_files(tmp_path):
+    path = str(tmp_path / "messages.ndjson.gz")
+
+    with NDJSONWriter(path, compress=True, max_bytes=25) as writer:
+        for i in range(5):
+            writer.write_item({"id": str(i)})
+
+    assert writer.records == 5
+    assert len(writer.paths) == 3
+    assert os.path.basename(writer.paths[1]) == "messages.00001.ndjson.gz"
+
+    records = []
+    for part_path in writer.paths:
+        with gzip.open(part_path, "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    assert [record["id"] for record in records] == list("01234")
+
+
+def test_writer_checkpoint_makes_compressed_output_readable():
+    sink = io.BytesIO()
+    writer = NDJSONWriter(sink, compress=True, checkpoint_every=2)
+    writer.write('{"id":"1"}')
+    writer.write('{"id":"2"}')
+
+    # The gzip stream is incomplete, but the checkpointed data is readable
+    decompressor = gzip.zlib.decompressobj(16 + gzip.zlib.MAX_WBITS)
+    data = decompressor.decompress(sink.getvalue())
+    assert data == b'{"id":"1"}\n{"id":"2"}\n'
+
+    writer.close()
+    assert not sink.closed
+
+
+def test_writer_rotation_requires_path():
+    with pytest.raises(ValueError):
+        NDJSONWriter(io.BytesIO(), max_bytes=1024)
+
+
+def test_generator_container_export():
+    def items():
+        yield webexpythonsdk.Message({"id": "1", "roomId": "r"})
+        yield {"id": "2"}
+
+    container = webexpythonsdk.generator_containers.GeneratorContainer(items)
+    sink = io.BytesIO()
+
+    assert container.export(sink) == 2
+    assert sink.getvalue() == b'{"id":"1","roomId":"r"}\n{"id":"2"}\n'
@@ -0,0 +1,138 @@
+"""webexpythonsdk/membership_index.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.membership_index import MembershipIndex
+
+
+ROOM_MEMBERS = {
+    "room1": ["alice", "bob"],
+    "room2": ["bob", "carol"],
+}
+
+
+def membership_event(event_type, roomId, personId, created):
+    return webexpythonsdk.Event(
+        {
+            "resource": "memberships",
+            "type": event_type,
+            "created": created,
+            "data": {"roomId": roomId, "personId": personId},
+        }
+    )
+
+
+# Fixtures
+@pytest.fixture
+def mock_api():
+    api = Mock()
+    api.rooms.list.return_value = [
+        webexpythonsdk.Room({"id": roomId}) for roomId in ROOM_MEMBERS
+    ]
+    api.memberships.list.side_effect = lambda roomId: [
+        webexpythonsdk.Membership({"roomId": roomId, "personId": personId})
+        for personId in ROOM_MEMBERS[roomId]
+    ]
+    return api
+
+
+@pytest.fixture
+def index(mock_api):
+    index = MembershipIndex(mock_api)
+    index.build()
+    return index
+
+
+# Tests
+def test_build_indexes_both_directions(index, mock_api):
+    assert len(index) == 4
+    assert mock_api.memberships.list.call_count == 2
+    assert index.rooms_of("bob") == {"room1", "room2"}
+    assert index.members_of("room2") == {"bob", "carol"}
+    assert index.is_member("alice", "room1")
+    assert not index.is_member("alice", "room2")
+    assert index.last_event_time is not None
+
+
+def test_apply_events_in_chronological_order(index):
+    changed = index.apply_events(
+        [
+            membership_event(
+                "deleted", "room2", "dave", "2030-01-01T00:00:02.000Z"
+            ),
+            membership_event(
+                "created", "room2", "dave", "2030-01-01T00:00:01.000Z"
+            ),
+            membership_event(
+                "deleted", "room1", "bob", "2030-01-01T00:00:03.000Z"
+            ),
+        ]
+    )
+
+    assert changed == 3
+    assert index.rooms_of("dave") == frozenset()
+    assert index.rooms_of("bob") == {"room2"}
+    assert index.last_event_time == "2030-01-01T00:00:03.000Z"
+
+
+def test_room_deleted_event_drops_room(index):
+    assert index.apply(
+        {"resource": "rooms", "event": "deleted", "data": {"id": "room1"}}
+    )
+    assert index.members_of("room1") == frozenset()
+    assert index.rooms_of("alice") == frozenset()
+    assert index.rooms_of("bob") == {"room2"}
+
+
+def test_sync_requests_events_since_last_event(index, mock_api):
+    mock_api.events.list.return_value = [
+        membership_event("created", "room1", "carol", "2030-01-01T00:00:00Z")
+    ]
+    since = index.last_event_time
+
+    assert index.sync() == 1
+    mock_api.events.list.assert_called_once_with(
+        resource="memberships", _from=since
+    )
+    assert index.is_member("carol", "room1")
+
+
+def test_snapshot_restore(index, mock_api):
+    snapshot = io.StringIO()
+    index.snapshot(snapshot)
+    snapshot.seek(0)
+
+    restored = MembershipIndex(mock_api)
+    restored.restore(snapshot)
+
+    assert restored.rooms_of("bob") == index.rooms_of("bob")
+    assert restored.members_of("room2") == index.members_of("room2")
+    assert restored.last_event_time == index.last_event_time
+
+    with pytest.raises(ValueError):
+        restored.restore(io.StringIO('{"version": 0}'))
@@ -0,0 +1,136 @@
+"""webexpythonsdk/message_sync.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.message_sync import MessageSync, SQLiteWatermarkStore
+
+
+class FakeRoomMessages(object):
+    """Serve room messages newest first, counting the messages served."""
+
+    def __init__(self):
+        self.rooms = {}
+        self.served = 0
+        self.requests = []
+
+    def post(self, roomId, text):
+        messages = self.rooms.setdefault(roomId, [])
+        messages.append(
+            webexpythonsdk.Message(
+                {
+                    "id": "{}-{}".format(roomId, len(messages)),
+                    "roomId": roomId,
+                    "text": text,
+                    "created": "2024-10-01T12:00:{:02d}.000Z".format(
+                        len(messages)
+                    ),
+                }
+            )
+        )
+
+    def list(self, roomId, max=50):
+        self.requests.append((roomId, max))
+        for message in reversed(self.rooms.get(roomId, [])):
+            self.served += 1
+            yield message
+
+
+# Fixtures
+@pytest.fixture
+def room_messages():
+    room_messages = FakeRoomMessages()
+    for roomId in ("room1", "room2"):
+        for i in range(3):
+            room_messages.post(roomId, "old {}".format(i))
+    return room_messages
+
+
+@pytest.fixture
+def message_sync(room_messages):
+    api = Mock()
+    api.messages = room_messages
+    return MessageSync(api)
+
+
+# Tests
+def test_first_sync_records_watermark_only(message_sync):
+    assert list(message_sync.sync(["room1", "room2"])) == []
+    assert message_sync.store.get("room1") == (
+        "room1-2",
+        "2024-10-01T12:00:02.000Z",
+    )
+
+
+def test_sync_returns_only_new_messages_in_order(message_sync, room_messages):
+    list(message_sync.sync(["room1", "room2"]))
+    room_messages.post("room1", "new 1")
+    room_messages.post("room1", "new 2")
+
+    room_messages.served = 0
+    room_messages.requests = []
+    new = list(message_sync.sync(["room1", "room2"]))
+
+    assert [m.text for m in new] == ["new 1", "new 2"]
+    # Probes each room; pages only through room1, to its watermark
+    assert room_messages.served == 5
+    assert sorted(room_messages.requests) == [
+        ("room1", 1),
+        ("room1", 50),
+        ("room2", 1),
+    ]
+
+    assert list(message_sync.sync(["room1", "room2"])) == []
+
+
+def test_watermark_not_advanced_until_messages_consumed(
+    message_sync, room_messages
+):
+    list(message_sync.sync(["room1"]))
+    room_messages.post("room1", "new")
+
+    messages = message_sync.sync(["room1"])
+    assert next(messages).text == "new"
+    messages.close()
+
+    assert [m.text for m in message_sync.sync(["room1"])] == ["new"]
+
+
+def test_backfill_returns_history(room_messages, tmp_path):
+    api = Mock()
+    api.messages = room_messages
+    store = SQLiteWatermarkStore(str(tmp_path / "watermarks.db"))
+    message_sync = MessageSync(api, store=store, backfill=True)
+
+    assert [m.text for m in message_sync.sync(["room2"])] == [
+        "old 0",
+        "old 1",
+        "old 2",
+    ]
+    store.close()
+
+    reopened = SQLiteWatermarkStore(str(tmp_path / "watermarks.db"))
+    assert reopened.get("room2")[0] == "room2-2"
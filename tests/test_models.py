@@ -0,0 +1,111 @@
+"""webexpythonsdk/models Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import io
+import pickle
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.models.immutable import immutable_data_models
+from webexpythonsdk.models.serialization import (
+    pack_models,
+    read_models,
+    unpack_models,
+    write_models,
+)
+
+
+SAMPLE_JSON_DATA = {
+    "id": "Y2lzY29zcGFyazovL3VzL01FU1NBR0UvMTIzNDU2Nzg5MA",
+    "roomId": "Y2lzY29zcGFyazovL3VzL1JPT00vYWJjZGVm",
+    "text": "Héllo, wörld",
+    "data": {"id": "nested", "values": [1, 2.5, None, True]},
+    "created": "2024-10-01T12:00:00.000Z",
+}
+
+
+@pytest.mark.parametrize(
+    "model", sorted(set(immutable_data_models.values()), key=str)
+)
+def test_immutable_data_models_pickle(model):
+    obj = model(SAMPLE_JSON_DATA)
+    restored = pickle.loads(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+    assert type(restored) is model
+    assert restored == obj
+    assert restored.id == SAMPLE_JSON_DATA["id"]
+
+
+def test_immutable_data_missing_attribute_after_unpickle():
+    obj = webexpythonsdk.Message(SAMPLE_JSON_DATA)
+    restored = pickle.loads(pickle.dumps(obj))
+    assert not hasattr(restored, "no_such_attribute")
+
+
+def test_simple_data_model_pickle():
+    obj = webexpythonsdk.SimpleDataModel(SAMPLE_JSON_DATA)
+    restored = pickle.loads(pickle.dumps(obj))
+    assert vars(restored) == vars(obj)
+
+
+def test_pack_unpack_models_round_trip():
+    models = [
+        webexpythonsdk.Message(SAMPLE_JSON_DATA),
+        webexpythonsdk.Person({"id": "p1", "emails": ["a@example.com"]}),
+        webexpythonsdk.Message({"id": "m2"}),
+        webexpythonsdk.SimpleDataModel({"id": "s1"}),
+        {"id": "d1"},
+    ]
+
+    restored = unpack_models(pack_models(models))
+
+    assert [type(obj) for obj in restored[:4]] == [
+        type(obj) for obj in models[:4]
+    ]
+    assert restored[:3] == models[:3]
+    assert vars(restored[3]) == vars(models[3])
+    assert restored[4] == models[4]
+
+
+def test_pack_models_names_each_class_once():
+    models = [webexpythonsdk.Membership({"id": str(i)}) for i in range(100)]
+    assert pack_models(models).count(b"Membership") == 1
+
+
+def test_read_models_streams_from_file():
+    buffer = io.BytesIO()
+    write_models(
+        (webexpythonsdk.Room({"id": str(i)}) for i in range(3)), buffer
+    )
+    buffer.seek(0)
+
+    assert [room.id for room in read_models(buffer)] == ["0", "1", "2"]
+
+
+def test_unpack_models_rejects_bad_data():
+    with pytest.raises(ValueError):
+        unpack_models(b"not serialized models")
+
+    with pytest.raises(TypeError):
+        pack_models([object()])
@@ -0,0 +1,249 @@
+"""webexpythonsdk/outbound.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import random
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.outbound import (
+    MessageCoalescer,
+    OutboundQueue,
+    SQLiteOutboundStore,
+)
+from tests.utils import create_mock_api_error
+
+
+# Fixtures
+@pytest.fixture
+def mock_api():
+    api = Mock()
+    api.delivered = []
+    lock = threading.Lock()
+
+    def create(**params):
+        time.sleep(random.random() / 100)
+        with lock:
+            api.delivered.append((params["roomId"], params["text"]))
+
+    api.messages.create.side_effect = create
+    return api
+
+
+# Tests
+def test_changes_are_delivered_in_order_per_room(mock_api):
+    queue = OutboundQueue(mock_api, rate=1000, max_workers=8)
+
+    for number in range(20):
+        for room in ("room1", "room2", "room3"):
+            queue.create(roomId=room, text=str(number))
+    queue.stop()
+
+    for room in ("room1", "room2", "room3"):
+        texts = [text for r, text in mock_api.delivered if r == room]
+        assert texts == [str(number) for number in range(20)]
+
+    metrics = queue.metrics
+    assert metrics["delivered"] == 60
+    assert metrics["pending"] == 0
+    assert 0 < metrics["latency_p50"] <= metrics["latency_p99"]
+    assert queue.store.pending() == []
+
+
+def test_pending_jobs_survive_a_restart(mock_api, tmp_path):
+    path = str(tmp_path / "outbound.db")
+    store = SQLiteOutboundStore(path)
+    store.put("room1", "create", {"roomId": "room1", "text": "a"}, 0.0)
+    store.put("room1", "update", {"messageId": "m1", "roomId": "room1"}, 0.0)
+    store.close()
+
+    queue = OutboundQueue(mock_api, store=SQLiteOutboundStore(path))
+    assert queue.flush(timeout=5)
+    queue.stop()
+
+    assert mock_api.delivered == [("room1", "a")]
+    mock_api.messages.update.assert_called_once_with(
+        messageId="m1", roomId="room1"
+    )
+
+
+def test_card_attachments_are_persisted(mock_api, tmp_path):
+    path = str(tmp_path / "outbound.db")
+    card = webexpythonsdk.models.cards.AdaptiveCard(
+        body=[webexpythonsdk.models.cards.TextBlock("Hello")]
+    )
+    queue = OutboundQueue(mock_api, store=SQLiteOutboundStore(path), rate=1000)
+
+    queue.create(roomId="room1", text="card", attachments=[card])
+    queue.stop()
+
+    mock_api.messages.create.assert_called_once_with(
+        roomId="room1",
+        text="card",
+        attachments=[webexpythonsdk.utils.make_attachment(card)],
+    )
+    with open(path, "rb") as file, pytest.raises(TypeError):
+        queue.create(roomId="room1", files=[file])
+
+
+def test_retries_and_failures(mock_api):
+    errors = {
+        "retried": [
+            create_mock_api_error(
+                429, webexpythonsdk.RateLimitError, retry_after=0
+            ),
+            create_mock_api_error(503),
+        ],
+        "rejected": [create_mock_api_error(400)],
+    }
+
+    def create(**params):
+        if errors[params["text"]]:
+            raise errors[params["text"]].pop(0)
+
+    mock_api.messages.create.side_effect = create
+    queue = OutboundQueue(mock_api, rate=1000, retry_delay=0)
+
+    queue.create(roomId="room1", text="retried")
+    queue.create(toPersonEmail="person@example.com", text="rejected")
+    queue.delete("m1", roomId="room1")
+    queue.stop()
+
+    metrics = queue.metrics
+    assert metrics["delivered"] == 2
+    assert metrics["failed"] == 1
+    assert metrics["retries"] == 1
+    [failed] = queue.store.failed()
+    assert failed.params == {
+        "toPersonEmail": "person@example.com",
+        "text": "rejected",
+    }
+    mock_api.messages.delete.assert_called_once_with(messageId="m1")
+
+    with pytest.raises(ValueError):
+        queue.create(text="nowhere")
+
+
+def test_coalescer_merges_messages_per_room():
+    target = Mock()
+    coalescer = MessageCoalescer(target, window=60)
+
+    for number in range(5):
+        coalescer.create(roomId="room1", markdown="**{}**".format(number))
+    coalescer.create(toPersonEmail="person@example.com", text="a")
+    coalescer.create(toPersonEmail="person@example.com", text="b")
+    coalescer.create(roomId="room1", text="plain")
+    coalescer.create(roomId="room1", markdown="file", files=["f.png"])
+    coalescer.close()
+
+    assert [c.kwargs for c in target.create.call_args_list] == [
+        {
+            "roomId": "room1",
+            "markdown": "**0**\n\n**1**\n\n**2**\n\n**3**\n\n**4**",
+        },
+        {"roomId": "room1", "text": "plain"},
+        {"roomId": "room1", "markdown": "file", "files": ["f.png"]},
+        {"toPersonEmail": "person@example.com", "text": "a\nb"},
+    ]
+    assert coalescer.metrics["requests_saved"] == 5
+    with pytest.raises(ValueError):
+        coalescer.create(roomId="room1", text="closed")
+
+
+def test_coalescer_flushes_on_size_and_time():
+    target = Mock()
+    coalescer = MessageCoalescer(target, window=0.05, max_size=10)
+
+    coalescer.create(roomId="room1", text="12345")
+    coalescer.create(roomId="room1", text="6789")
+    coalescer.create(roomId="room1", text="overflow")
+    assert target.create.call_count == 1
+    assert target.create.call_args.kwargs["text"] == "12345\n6789"
+
+    deadline = time.monotonic() + 5
+    while target.create.call_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert target.create.call_args.kwargs["text"] == "overflow"
+    coalescer.close()
+    assert coalescer.metrics == {
+        "messages": 3,
+        "requests": 2,
+        "requests_saved": 1,
+        "buffered": 0,
+        "failed": 0,
+    }
+
+
+def test_coalescer_posts_without_blocking_other_rooms():
+    posting, release = threading.Event(), threading.Event()
+    target = Mock()
+
+    def create(**params):
+        if params.get("roomId") == "slow":
+            posting.set()
+            assert release.wait(5)
+
+    target.create.side_effect = create
+    coalescer = MessageCoalescer(target, window=60)
+    slow = threading.Thread(
+        target=coalescer.create, kwargs={"roomId": "slow", "files": ["f"]}
+    )
+    slow.start()
+    assert posting.wait(5)
+
+    # Another room is buffered and posted while the slow post is in flight
+    coalescer.create(roomId="fast", text="a")
+    coalescer.create(roomId="fast", text="b", files=["f"])
+    assert target.create.call_count == 3
+
+    release.set()
+    slow.join(5)
+    coalescer.close()
+
+
+def test_coalescer_retries_and_keeps_failed_messages():
+    target = Mock()
+    target.create.side_effect = [
+        create_mock_api_error(503),
+        create_mock_api_error(
+            429, webexpythonsdk.RateLimitError, retry_after=0
+        ),
+        None,
+        create_mock_api_error(400),
+    ]
+    coalescer = MessageCoalescer(target, window=60, retry_delay=0)
+
+    coalescer.create(roomId="room1", text="a")
+    coalescer.create(roomId="room1", text="b")
+    coalescer.flush()
+    coalescer.create(roomId="room1", text="c")
+    coalescer.close()
+
+    assert target.create.call_count == 4
+    [(message, error)] = coalescer.failed
+    assert message == {"roomId": "room1", "text": "c"}
+    assert error.status_code == 400
+    assert coalescer.metrics["failed"] == 1
@@ -0,0 +1,226 @@
+"""webexpythonsdk/reconcile.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+import webexpythonsdk
+from webexpythonsdk.reconcile import MembershipReconciler, WebhookReconciler
+from tests.utils import create_mock_api_error
+
+
+def membership(id, personId, personEmail, isModerator=False):
+    return webexpythonsdk.Membership(
+        {
+            "id": id,
+            "personId": personId,
+            "personEmail": personEmail,
+            "isModerator": isModerator,
+        }
+    )
+
+
+# Fixtures
+@pytest.fixture
+def mock_api():
+    api = Mock()
+    api.memberships.list.side_effect = lambda roomId: {
+        "room1": [
+            membership("m1", "p1", "Alice@example.com"),
+            membership("m2", "p2", "bob@example.com", isModerator=True),
+            membership("m3", "bot", "bot@webex.bot"),
+        ],
+        "room2": [],
+    }[roomId]
+    return api
+
+
+# Tests
+def test_plan_computes_minimal_changes(mock_api):
+    reconciler = MembershipReconciler(mock_api, protected=["bot"])
+
+    results = reconciler.reconcile(
+        {
+            "room1": {"alice@example.com": True, "carol@example.com": None},
+            "room2": ["p2"],
+        },
+        dry_run=True,
+    )
+
+    planned = sorted(
+        (r.operation.action, r.operation.targetId, r.operation.member)
+        for r in results
+    )
+    assert planned == [
+        ("add", "room1", "carol@example.com"),
+        ("add", "room2", "p2"),
+        ("remove", "room1", "bob@example.com"),
+        ("update", "room1", "alice@example.com"),
+    ]
+    assert {r.status for r in results} == {"planned"}
+    mock_api.memberships.create.assert_not_called()
+
+
+def test_plain_roster_leaves_moderator_flags(mock_api):
+    reconciler = MembershipReconciler(mock_api)
+    operations = reconciler.plan({"room1": ["p1", "p2", "bot"]})
+    assert operations == []
+
+
+def test_apply_counts_conflicts_as_success(mock_api):
+    mock_api.memberships.create.side_effect = [
+        create_mock_api_error(409),
+        None,
+    ]
+    mock_api.memberships.delete.side_effect = create_mock_api_error(403)
+    reconciler = MembershipReconciler(mock_api)
+
+    results = reconciler.reconcile(
+        {"room1": ["p1", "p2", "bot"], "room2": ["p3", "p4@example.com"]}
+    )
+    results += reconciler.reconcile({"room1": ["p1", "p2"]})
+
+    assert sorted(r.status for r in results) == [
+        "applied",
+        "conflict",
+        "failed",
+    ]
+    mock_api.memberships.create.assert_any_call(
+        roomId="room2", personEmail="p4@example.com"
+    )
+
+
+def test_team_memberships(mock_api):
+    mock_api.team_memberships.list.return_value = []
+    reconciler = MembershipReconciler(mock_api, teams=True)
+
+    reconciler.reconcile({"team1": {"p1": True}})
+
+    mock_api.team_memberships.create.assert_called_once_with(
+        teamId="team1", personId="p1", isModerator=True
+    )
+
+
+def webhook(id, name, targetUrl, status="active", **kwargs):
+    json_data = {
+        "id": id,
+        "name": name,
+        "targetUrl": targetUrl,
+        "resource": "messages",
+        "event": "created",
+        "status": status,
+    }
+    json_data.update(kwargs)
+    return webexpythonsdk.Webhook(json_data)
+
+
+def webhook_spec(name, targetUrl="https://bot.example.com/hook", **kwargs):
+    spec = {
+        "name": name,
+        "targetUrl": targetUrl,
+        "resource": "messages",
+        "event": "created",
+    }
+    spec.update(kwargs)
+    return spec
+
+
+def test_webhook_reconciler_plans_per_account():
+    tenant1, tenant2 = Mock(), Mock()
+    url = "https://bot.example.com/hook"
+    tenant1.webhooks.list.return_value = [
+        webhook("w1", "ok", url),
+        webhook("w2", "moved", "https://old.example.com/hook"),
+        webhook("w3", "disabled", url, status="inactive"),
+        webhook("w4", "refiltered", url, filter="roomId=r1"),
+        webhook("w5", "stale", url),
+        webhook("w6", "ok", url),
+    ]
+    tenant2.webhooks.list.return_value = []
+    reconciler = WebhookReconciler({"tenant1": tenant1, "tenant2": tenant2})
+
+    specs = [
+        webhook_spec("ok"),
+        webhook_spec("moved", secret="s3cr3t"),
+        webhook_spec("disabled"),
+        webhook_spec("refiltered", filter="roomId=r2"),
+    ]
+    results = reconciler.reconcile(
+        {"tenant1": specs, "tenant2": specs[:1]}, dry_run=True
+    )
+
+    planned = sorted(
+        (r.operation.targetId, r.operation.action, r.operation.member)
+        for r in results
+    )
+    assert planned == [
+        ("tenant1", "add", "refiltered"),
+        ("tenant1", "remove", "ok"),
+        ("tenant1", "remove", "refiltered"),
+        ("tenant1", "remove", "stale"),
+        ("tenant1", "update", "disabled"),
+        ("tenant1", "update", "moved"),
+        ("tenant2", "add", "ok"),
+    ]
+    update = next(
+        r.operation for r in results if r.operation.member == "moved"
+    )
+    assert update.data == {
+        "name": "moved",
+        "targetUrl": url,
+        "status": "active",
+        "secret": "s3cr3t",
+    }
+
+
+def test_webhook_reconciler_applies_changes():
+    tenant = Mock()
+    tenant.webhooks.list.return_value = [
+        webhook("w1", "disabled", "https://bot.example.com/hook", "inactive"),
+        webhook("w2", "stale", "https://bot.example.com/hook"),
+    ]
+    tenant.webhooks.delete.side_effect = create_mock_api_error(404)
+    reconciler = WebhookReconciler({"tenant": tenant}, prune=True)
+
+    results = reconciler.reconcile(
+        {"tenant": [webhook_spec("disabled"), webhook_spec("new")]}
+    )
+
+    assert sorted((r.operation.action, r.status) for r in results) == [
+        ("add", "applied"),
+        ("remove", "failed"),
+        ("update", "applied"),
+    ]
+    tenant.webhooks.update.assert_called_once_with(
+        "w1",
+        name="disabled",
+        targetUrl="https://bot.example.com/hook",
+        status="active",
+    )
+    tenant.webhooks.create.assert_called_once_with(**webhook_spec("new"))
+
+    # Without pruning, unspecified webhooks are left alone
+    reconciler = WebhookReconciler({"tenant": tenant}, prune=False)
+    operations = reconciler.plan({"tenant": [webhook_spec("disabled")]})
+    assert [op.action for op in operations] == ["update"]
@@ -29,6 +29,7 @@ import requests
 from unittest.mock import Mock, patch
 
 import webexpythonsdk
+from tests.utils import create_mock_page_response, create_session
 
 
 logging.captureWarnings(True)
@@ -292,3 +293,110 @@ def test_rate_limit_error_response_attributes():
     assert "Too Many Requests" in error.error_message
     assert "Rate limit exceeded" in error.error_message
     assert "test-tracking-id-12345" in error.error_message
+
+
+def test_get_items_with_fields_projection():
+    """Test that get_items drops all but the requested item fields."""
+    session = create_session()
+    page = create_mock_page_response(
+        '{"items": ['
+        '{"id": "1", "roomId": "r1", "personId": "p1", "text": "hello"},'
+        '{"id": "2", "roomId": "r1", "markdown": "**hi**"}'
+        "]}"
+    )
+
+    with patch.object(session, "request", return_value=page):
+        items = list(session.get_items("messages", fields=["id", "personId"]))
+
+    assert items == [{"id": "1", "personId": "p1"}, {"id": "2"}]
+
+
+def test_get_served_from_cache_until_object_changes():
+    """Test that cached GET responses are evicted by PUT and DELETE."""
+    session = create_session()
+    session.cache = webexpythonsdk.TTLCache()
+    response = create_mock_page_response('{"id": "p1", "displayName": "A"}')
+
+    with patch.object(session, "request", return_value=response) as request:
+        assert session.get("people/p1")["displayName"] == "A"
+        assert session.get("people/p1")["displayName"] == "A"
+        assert request.call_count == 1
+
+        session.put("people/p1", json={"displayName": "A"})
+        session.get("people/p1")
+        assert request.call_count == 3
+
+        session.delete("people/p1")
+        session.get("people/p1")
+        assert request.call_count == 5
+
+        # Responses cached with query parameters are evicted too
+        session.get("people/p1", params={"callingData": "true"})
+        session.put("people/p1", json={"displayName": "A"})
+        session.get("people/p1", params={"callingData": "true"})
+        assert request.call_count == 8
+
+    with pytest.raises(TypeError):
+        session.cache = {}
+
+
+def test_cache_keys_are_scoped_to_access_token():
+    """Test that sessions with different tokens do not share responses."""
+    cache = webexpythonsdk.TTLCache()
+    session = create_session()
+    other_session = webexpythonsdk.restsession.RestSession(
+        access_token="other-access-token",
+        base_url="https://webexapis.com/v1/",
+        cache=cache,
+    )
+    session.cache = cache
+
+    assert session._cache_key("people/me") != other_session._cache_key(
+        "people/me"
+    )
+
+
+def create_mock_file_response(status_code=200, content=b"", headers=None):
+    """Create a mock response object for a file download."""
+    mock_response = Mock(spec=requests.Response)
+    mock_response.status_code = status_code
+    mock_response.headers = headers or {}
+    mock_response.iter_content.side_effect = lambda size: (
+        content[i : i + size] for i in range(0, len(content), size)
+    )
+    return mock_response
+
+
+def test_download_streams_and_resumes(tmp_path):
+    """Test that downloads are streamed in chunks and resumed."""
+    session = create_session()
+    head = create_mock_file_response(
+        headers={
+            "Content-Length": "10",
+            "Content-Type": "text/plain",
+            "Content-Disposition": 'attachment; filename="../notes.txt"',
+            "Accept-Ranges": "bytes",
+        }
+    )
+    (tmp_path / "notes.txt.part").write_bytes(b"0123")
+    rest = create_mock_file_response(206, b"456789")
+
+    with patch.object(session, "request", side_effect=[head, rest]) as req:
+        path = session.download(
+            "https://webexapis.com/v1/contents/c1/0",
+            directory=str(tmp_path),
+            chunk_size=4,
+        )
+
+    assert path == str(tmp_path / "notes.txt")
+    assert (tmp_path / "notes.txt").read_bytes() == b"0123456789"
+    assert not (tmp_path / "notes.txt.part").exists()
+    assert req.call_args.kwargs["headers"] == {"Range": "bytes=4-"}
+    assert req.call_args.kwargs["stream"] is True
+    rest.close.assert_called_once()
+
+    info = webexpythonsdk.restsession.FileInfo("f", 10, None, False)
+    short = create_mock_file_response(200, b"01234")
+    with patch.object(session, "request", return_value=short):
+        with pytest.raises(IOError):
+            session.download("contents/c2/0", str(tmp_path / "f"), info=info)
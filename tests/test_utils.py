@@ -0,0 +1,174 @@
+"""webexpythonsdk/utils.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import base64
+import gc
+import io
+import json
+import mmap
+import tracemalloc
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from webexpythonsdk.utils import (
+    extract_and_parse_json,
+    InternPool,
+    open_file_data,
+)
+
+
+# Helper Functions
+def webex_id(kind, number):
+    """Create a synthetic, Webex-style, base64 encoded identifier."""
+    uri = "ciscospark://us/{}/{:08d}-8a4b-11ef-b864-0242ac120002".format(
+        kind, number
+    )
+    return base64.b64encode(uri.encode()).decode().rstrip("=")
+
+
+def synthetic_membership_pages(count, page_size=1000, rooms=500, people=5000):
+    """Yield mock responses with pages of synthetic membership data."""
+    org_id = webex_id("ORGANIZATION", 1)
+    items = []
+    for i in range(count):
+        room_number = i % rooms
+        person_number = (i * 7) % people
+        items.append(
+            {
+                "id": webex_id("MEMBERSHIP", i),
+                "roomId": webex_id("ROOM", room_number),
+                "roomType": "group",
+                "personId": webex_id("PEOPLE", person_number),
+                "personEmail": "user{}@example.com".format(person_number),
+                "personDisplayName": "User {}".format(person_number),
+                "personOrgId": org_id,
+                "isModerator": False,
+                "isMonitor": False,
+                "created": "2024-10-01T12:00:00.000Z",
+            }
+        )
+        if len(items) == page_size:
+            yield Mock(
+                spec=requests.Response, text=json.dumps({"items": items})
+            )
+            items = []
+    if items:
+        yield Mock(spec=requests.Response, text=json.dumps({"items": items}))
+
+
+def measure_retained_items(count, intern_pool=None):
+    """Measure the memory retained by the parsed items of a listing."""
+    pages = list(synthetic_membership_pages(count))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        items = []
+        for page in pages:
+            items.extend(
+                extract_and_parse_json(page, intern_pool=intern_pool)["items"]
+            )
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(items) == count
+    return retained
+
+
+# Tests
+def test_intern_pool_deduplicates_identifier_values():
+    pool = InternPool()
+    first = json.loads(
+        '{"id": "a", "roomId": "' + "r" * 40 + '", "text": "hello"}',
+        object_pairs_hook=pool.object_pairs_hook,
+    )
+    second = json.loads(
+        '{"id": "b", "roomId": "' + "r" * 40 + '", "text": "hello"}',
+        object_pairs_hook=pool.object_pairs_hook,
+    )
+
+    assert first["roomId"] is second["roomId"]
+    assert list(first)[0] is list(second)[0]
+    # Non-identifier values are left alone
+    assert first["text"] == second["text"]
+    assert first["text"] not in pool._strings
+
+    pool.clear()
+    assert len(pool) == 0
+
+
+def test_intern_pool_custom_fields():
+    pool = InternPool(fields=["emails"])
+    data = json.loads(
+        '{"id": "a", "emails": ["x@example.com"]}',
+        object_pairs_hook=pool.object_pairs_hook,
+    )
+    assert data["emails"][0] is pool.intern("x@example.com")
+    assert "a" not in pool._strings
+
+
+def test_intern_pool_reduces_memory():
+    plain = measure_retained_items(20000)
+    interned = measure_retained_items(20000, intern_pool=InternPool())
+    assert interned < plain * 0.8
+
+
+@pytest.mark.slow
+def test_intern_pool_memory_benchmark_500k_memberships():
+    """Benchmark: memory retained by 500k parsed memberships."""
+    plain = measure_retained_items(500000)
+    interned = measure_retained_items(500000, intern_pool=InternPool())
+
+    print(
+        "\n500k memberships retained: {:.1f} MiB plain, {:.1f} MiB interned "
+        "({:.0%} reduction)".format(
+            plain / 2**20, interned / 2**20, 1 - interned / plain
+        )
+    )
+    assert interned < plain * 0.8
+
+
+def test_open_file_data_reads_buffers_in_place():
+    buffer = mmap.mmap(-1, 10)
+    buffer.write(b"0123456789")
+    encodable = open_file_data(("report.csv", buffer))
+    assert encodable.file_name == "report.csv"
+    assert encodable.content_type == "text/csv"
+    assert encodable.file_object.len == 10
+    assert encodable.file_object.read(4) == b"0123"
+    assert encodable.file_object.len == 6
+    assert encodable.file_object.read() == b"456789"
+    encodable.file_object.close()
+
+    stream = io.BytesIO(b"header,data")
+    stream.seek(7)
+    encodable = open_file_data(("data.bin", stream, "application/x-test"))
+    assert encodable.content_type == "application/x-test"
+    assert encodable.file_object.read() == b"data"
+    encodable.file_object.close()
+
+    assert open_file_data(b"abc").file_name == "file"
+    with pytest.raises(ValueError):
+        open_file_data(42)
@@ -0,0 +1,165 @@
+"""webexpythonsdk/webhook_receiver.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import io
+import json
+import threading
+
+import pytest
+
+from webexpythonsdk.webhook_receiver import (
+    WebhookReceiver,
+    compute_signature,
+)
+
+
+SECRET = "s3cr3t"
+
+
+def delivery(id="event1", resource="messages", event="created"):
+    return json.dumps(
+        {
+            "id": id,
+            "resource": resource,
+            "event": event,
+            "data": {"id": "message1"},
+        }
+    ).encode("utf-8")
+
+
+def wsgi_post(receiver, body, signature=None):
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+    }
+    if signature is not None:
+        environ["HTTP_X_SPARK_SIGNATURE"] = signature
+    statuses = []
+    receiver(environ, lambda status, headers: statuses.append(status))
+    return statuses[0]
+
+
+# Fixtures
+@pytest.fixture
+def receiver():
+    receiver = WebhookReceiver(secret=SECRET, max_workers=2)
+    yield receiver
+    receiver.stop()
+
+
+# Tests
+def test_wsgi_verifies_signature_and_dispatches(receiver):
+    handled = []
+    receiver.register(handled.append, resource="messages")
+    receiver.register(handled.append, event="deleted")
+    body = delivery()
+
+    assert wsgi_post(receiver, body, compute_signature(SECRET, body)) == (
+        "200 OK"
+    )
+    assert wsgi_post(receiver, body, "0" * 40) == "401 Unauthorized"
+    assert wsgi_post(receiver, body) == "401 Unauthorized"
+    receiver.stop()
+
+    assert [e.id for e in handled] == ["event1"]
+    assert handled[0].data.id == "message1"
+    metrics = receiver.metrics
+    assert metrics["accepted"] == 1
+    assert metrics["rejected"] == 2
+    assert metrics["handled"] == 1
+
+
+def test_non_ascii_signature_is_rejected(receiver):
+    body = delivery()
+    assert wsgi_post(receiver, body, "\u00e9" * 40) == "401 Unauthorized"
+    assert receiver.receive(body, "\udcff") == 401
+    assert receiver.metrics["rejected"] == 2
+
+
+def test_malformed_body_is_rejected():
+    receiver = WebhookReceiver()
+    assert receiver.receive(b"not json") == 400
+    assert receiver.metrics["malformed"] == 1
+
+
+def test_full_queue_sheds_load():
+    started, release = threading.Event(), threading.Event()
+    receiver = WebhookReceiver(max_workers=1, max_queue_size=1)
+    receiver.register(lambda event: started.set() or release.wait(5))
+
+    assert receiver.receive(delivery()) == 200
+    assert started.wait(5)
+    statuses = [receiver.receive(delivery()) for _ in range(4)]
+    # One event is being handled and one is queued; the rest are shed
+    assert statuses == [200, 503, 503, 503]
+    assert receiver.metrics["queue_depth"] == 1
+
+    release.set()
+    receiver.stop()
+    metrics = receiver.metrics
+    assert metrics["shed"] == 3
+    assert metrics["handled"] == 2
+    assert metrics["max_handler_latency"] > 0
+
+
+def test_handler_errors_are_counted(receiver):
+    def handler(event):
+        raise RuntimeError("boom")
+
+    receiver.register(handler)
+    body = delivery()
+    receiver.receive(body, compute_signature(SECRET, body))
+    receiver.stop()
+    assert receiver.metrics["handler_errors"] == 1
+
+
+def test_asgi(receiver):
+    handled = []
+    receiver.register(handled.append)
+    body = delivery()
+    chunks = [
+        {"type": "http.request", "body": body[:10], "more_body": True},
+        {"type": "http.request", "body": body[10:]},
+    ]
+    sent = []
+
+    async def receive():
+        return chunks.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"x-spark-signature", compute_signature(SECRET, body).encode())
+        ],
+    }
+    asyncio.run(receiver.asgi(scope, receive, send))
+    receiver.stop()
+
+    assert sent[0]["status"] == 200
+    assert [e.id for e in handled] == ["event1"]
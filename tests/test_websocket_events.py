@@ -0,0 +1,307 @@
+"""webexpythonsdk/websocket_events.py Fixtures & Tests
+
+Copyright (c) 2016-2024 Cisco and/or its affiliates.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from webexpythonsdk.websocket_events import (
+    activity_event,
+    hydra_cluster,
+    WebSocket,
+    WebSocketEventClient,
+)
+
+
+ROOM_UUID = "8b4a1d40-0000-11ee-0000-000000000000"
+
+
+def activity(id, verb="post", **kwargs):
+    json_data = {
+        "id": id,
+        "verb": verb,
+        "published": "2024-01-01T00:00:00.000Z",
+        "actor": {"entryUUID": "actor", "emailAddress": "a@example.com"},
+        "target": {"id": ROOM_UUID},
+        "object": {"objectType": "comment"},
+    }
+    json_data.update(kwargs)
+    return json_data
+
+
+class WebSocketServer(object):
+    """A local WebSocket server standing in for the Webex event stream.
+
+    Each connection is served by `script`, called with the connection.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen()
+        self.url = "ws://127.0.0.1:{}/stream".format(
+            self.listener.getsockname()[1]
+        )
+        self.connections = []
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                connection, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += connection.recv(4096)
+            key = [
+                line.split(b":", 1)[1].strip()
+                for line in request.split(b"\r\n")
+                if line.lower().startswith(b"sec-websocket-key")
+            ][0]
+            accept = base64.b64encode(
+                hashlib.sha1(
+                    key + b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+                ).digest()
+            )
+            connection.sendall(
+                b"HTTP/1.1 101 Switching Protocols\r\n"
+                b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+            )
+            try:
+                self.script(self, connection)
+            except OSError:
+                pass
+
+    @staticmethod
+    def send(connection, payload, opcode=0x1, fin=True):
+        if isinstance(payload, dict):
+            payload = json.dumps(payload).encode("utf-8")
+        header = bytes([(0x80 if fin else 0) | opcode])
+        if len(payload) < 126:
+            header += bytes([len(payload)])
+        else:
+            header += bytes([126]) + struct.pack("!H", len(payload))
+        connection.sendall(header + payload)
+
+    @staticmethod
+    def recv(connection):
+        def read(size):
+            data = b""
+            while len(data) < size:
+                data += connection.recv(size - len(data))
+            return data
+
+        first, second = read(2)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", read(2))
+        mask = read(4)
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(read(length)))
+        return first & 0x0F, payload
+
+    def close(self):
+        self.listener.close()
+        for connection in self.connections:
+            connection.close()
+
+
+def stream_message(id, activity):
+    return {
+        "id": id,
+        "data": {"eventType": "conversation.activity", "activity": activity},
+    }
+
+
+# Tests
+def test_websocket_messages_pings_and_fragments():
+    received = []
+    done = threading.Event()
+
+    def script(server, connection):
+        received.append(server.recv(connection))
+        server.send(connection, b"ping", opcode=0x9)
+        server.send(connection, b"hel", fin=False)
+        server.send(connection, b"lo " * 100, opcode=0x0)
+        received.append(server.recv(connection))
+        done.set()
+
+    server = WebSocketServer(script)
+    websocket = WebSocket(server.url)
+    websocket.send("hi")
+    assert websocket.recv() == "hel" + "lo " * 100
+    assert done.wait(5)
+    websocket.close()
+    server.close()
+
+    assert received == [(0x1, b"hi"), (0xA, b"ping")]
+
+
+def test_client_delivers_events_and_reconnects():
+    acks = []
+    api = Mock()
+    api.access_token = "token"
+
+    def script(server, connection):
+        opcode, payload = server.recv(connection)
+        assert json.loads(payload)["data"]["token"] == "Bearer token"
+        first = len(server.connections) == 1
+        for id in ["a1", "a2"] if first else ["a2", "a3"]:
+            server.send(connection, stream_message(id + "-msg", activity(id)))
+            acks.append(json.loads(server.recv(connection)[1])["messageId"])
+        if first:
+            # Drop the connection; the client reconnects
+            connection.close()
+        else:
+            server.send(connection, {"id": "x", "data": {"eventType": "x"}})
+            server.recv(connection)
+            client.stop()
+
+    server = WebSocketServer(script)
+    client = WebSocketEventClient(
+        api, websocket_url=server.url, min_reconnect_delay=0.01
+    )
+    events = []
+    client.register(events.append, resource="messages")
+
+    runner = threading.Thread(target=client.run, daemon=True)
+    runner.start()
+    runner.join(10)
+    server.close()
+
+    assert not runner.is_alive()
+    assert acks == ["a1-msg", "a2-msg", "a2-msg", "a3-msg"]
+    assert [e.data.personEmail for e in events] == ["a@example.com"] * 3
+    assert events[0].event == "created"
+    metrics = client.metrics
+    assert metrics["connects"] == 2
+    assert metrics["delivered"] == 3
+    assert metrics["duplicates"] == 1
+    assert metrics["last_latency"] > 0
+
+
+@pytest.mark.parametrize(
+    "verb,extra,resource,event",
+    [
+        ("share", {}, "messages", "created"),
+        ("delete", {"object": {"objectType": "activity"}}, "messages", None),
+        ("add", {"object": {"objectType": "person"}}, "memberships", None),
+        ("leave", {"object": {"objectType": "person"}}, "memberships", None),
+        ("cardAction", {"parent": {"id": "m"}}, "attachmentActions", None),
+        ("acknowledge", {}, None, None),
+    ],
+)
+def test_activity_events(verb, extra, resource, event):
+    json_data = activity_event(activity("a1", verb=verb, **extra))
+    if resource is None:
+        assert json_data is None
+        return
+    assert json_data["resource"] == resource
+    if event is not None:
+        assert json_data["event"] == event
+    room_id = base64.b64decode(json_data["data"]["roomId"] + "==")
+    assert room_id == "ciscospark://us/ROOM/{}".format(ROOM_UUID).encode()
+
+
+def test_client_pings_idle_connections_and_reconnects_when_silent():
+    pings = []
+
+    def script(server, connection):
+        server.recv(connection)  # The authorization
+        first = len(server.connections) == 1
+        opcode, payload = server.recv(connection)
+        pings.append(opcode)
+        if first:
+            # Answer the ping, then go silent (a half-open connection)
+            server.send(connection, payload, opcode=0xA)
+            pings.append(server.recv(connection)[0])
+        else:
+            client.stop()
+
+    server = WebSocketServer(script)
+    client = WebSocketEventClient(
+        Mock(access_token="token"),
+        websocket_url=server.url,
+        min_reconnect_delay=0.01,
+        ping_interval=0.05,
+        ping_timeout=0.05,
+    )
+
+    runner = threading.Thread(target=client.run, daemon=True)
+    runner.start()
+    runner.join(10)
+    server.close()
+
+    assert not runner.is_alive()
+    assert pings == [0x9, 0x9, 0x9]
+    assert client.metrics["connects"] == 2
+
+
+def test_websocket_recv_timeout_keeps_partial_frames():
+    sent = threading.Event()
+
+    def script(server, connection):
+        frame = b"\x81\x05hello"
+        connection.sendall(frame[:4])
+        sent.wait(5)
+        connection.sendall(frame[4:])
+
+    server = WebSocketServer(script)
+    websocket = WebSocket(server.url)
+    with pytest.raises(socket.timeout):
+        websocket.recv(timeout=0.05)
+    sent.set()
+    assert websocket.recv(timeout=5) == "hello"
+    websocket.close()
+    server.close()
+
+
+def test_events_use_the_cluster_of_the_ids():
+    eu = "urn:TEAM:eu-central-1_k"
+    person_id = base64.b64encode(
+        "ciscospark://{}/PEOPLE/p1".format(eu).encode()
+    ).decode()
+    assert hydra_cluster(person_id.rstrip("=")) == eu
+    with pytest.raises(ValueError):
+        hydra_cluster("not an id")
+
+    api = Mock()
+    api.people.me.return_value.id = person_id
+    api.session.post.return_value = {"url": "d", "webSocketUrl": "ws://x"}
+    client = WebSocketEventClient(api)
+    assert client._register_device() == "ws://x"
+    assert client.cluster == eu
+
+    json_data = activity_event(activity("a1"), cluster=eu)
+    room_id = base64.b64decode(json_data["data"]["roomId"] + "==")
+    assert room_id == "ciscospark://{}/ROOM/{}".format(eu, ROOM_UUID).encode()
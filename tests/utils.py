@@ -23,9 +23,11 @@ SOFTWARE.
 
 import datetime
 import os
+from unittest.mock import Mock
 
 import requests
 
+import webexpythonsdk
 from tests.environment import (
     WEBEX_TEST_STRING_PREFIX,
     WEBEX_TEST_STRING_TEMPLATE,
@@ -58,3 +60,35 @@ def download_file(url, local_directory, local_filename=None):
             if chunk:
                 f.write(chunk)
     return local_path
+
+
+def create_mock_page_response(text, next_url=None):
+    """Create a mock response object for a page of items."""
+    mock_response = Mock(spec=requests.Response)
+    mock_response.status_code = 200
+    mock_response.text = text
+    mock_response.links = {"next": {"url": next_url}} if next_url else {}
+    return mock_response
+
+
+def create_session():
+    """Create a RestSession for offline (mocked) tests."""
+    return webexpythonsdk.restsession.RestSession(
+        access_token="test-access-token",
+        base_url="https://webexapis.com/v1/",
+    )
+
+
+def create_mock_api_error(
+    status_code, error_class=webexpythonsdk.ApiError, retry_after=None
+):
+    """Create an ApiError (or subclass) for a mock error response."""
+    response = Mock(spec=requests.Response)
+    response.status_code = status_code
+    response.reason = "Error"
+    response.headers = {}
+    if retry_after is not None:
+        response.headers["Retry-After"] = str(retry_after)
+    response.json.return_value = {}
+    response.request = Mock(spec=requests.PreparedRequest)
+    return error_class(response)